@@ -0,0 +1,228 @@
+"""
+
+    :Acl:
+    ==========
+
+    :
+    This benchmarks the compiled access list against a scan of the
+    rules in order, both decide the two endpoints of random packets
+    against random rules of networks, port ranges, protocols and
+    directions. The verdicts of both are checked to be the same.
+
+        python -m NetworkMonitor.Benchmarks.Acl [rules] [packets]
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import random
+import sys
+import timeit
+
+from netaddr import IPAddress, IPNetwork
+from NetworkMonitor.Storage.AccessList \
+    import AccessList, AclRule, ACL_ACTIONS, ACL_DIRECTIONS, ACL_IN, \
+    ACL_OUT, ACL_ANY, ACL_ALLOW, ACL_DENY
+from NetworkMonitor.Benchmarks.Timer \
+    import measure, report
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The default number of rules
+BENCHMARK_RULES     = 10000
+
+# The default number of packets
+BENCHMARK_PACKETS   = 20000
+
+# The packets decided by the rule scan, it is slow
+BENCHMARK_SCANNED   = 200
+
+# The prefix lengths of the rules
+BENCHMARK_LENGTHS   = [8, 16, 20, 24, 28, 32]
+
+# The protocols of the rules and packets
+BENCHMARK_PROTOCOLS = ['tcp', 'udp']
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def build_rules(count, seed=1):
+    """
+    Builds random rules in 10.0.0.0/8.
+
+    :param count:           The number of rules
+    :param seed:            The random seed
+    :return:
+    """
+
+    generator = random.Random(seed)
+
+    # Results
+    rules = []
+
+    for index in range(count):
+        length = generator.choice(BENCHMARK_LENGTHS)
+        address = IPAddress((10 << 24) | generator.getrandbits(24))
+        first = generator.randrange(0, 65536)
+        last = min(first + generator.choice([0, 0, 10, 1000]), 65535)
+        rules.append(
+            AclRule(
+                generator.choice(ACL_ACTIONS),
+                [str(IPNetwork("%s/%d" %(address, length)).cidr)],
+                None if generator.random() < 0.1 else [(first, last)],
+                None if generator.random() < 0.3 else
+                [generator.choice(BENCHMARK_PROTOCOLS)],
+                generator.choice(ACL_DIRECTIONS)
+            )
+        )
+    return rules
+
+def build_packets(rules, count, seed=2):
+    """
+    Builds random packets, half of the endpoints are taken in the
+    networks and ports of the rules.
+
+    :param rules:           The rules
+    :param count:           The number of packets
+    :param seed:            The random seed
+    :return:
+    """
+
+    generator = random.Random(seed)
+
+    def endpoint():
+        if generator.random() < 0.5:
+            return (
+                str(IPAddress((10 << 24) | generator.getrandbits(24))),
+                generator.randrange(0, 65536)
+            )
+        rule = generator.choice(rules)
+        network = IPNetwork(rule.networks[0])
+        first, last = (rule.ports or [(0, 65535)])[0]
+        return (
+            str(network[generator.randrange(0, network.size)]),
+            generator.randint(first, last)
+        )
+
+    return [
+        endpoint() + endpoint() + (generator.choice(BENCHMARK_PROTOCOLS),)
+        for _ in range(count)
+    ]
+
+def scan(rules, packet, default=ACL_DENY):
+    """
+    Decides the endpoints of a packet by scanning the rules in
+    order, the reference of the access list.
+
+    :param rules:           The rules, with their parsed networks
+    :param packet:          The src, sport, dst, dport and protocol
+    :return:
+    """
+
+    src, sport, dst, dport, protocol = packet
+    src, dst = IPAddress(src), IPAddress(dst)
+
+    # Results
+    verdicts = []
+
+    for address, port, direction in ((src, sport, ACL_OUT),
+                                     (dst, dport, ACL_IN)):
+        verdict = default == ACL_ALLOW
+        for rule, networks in rules:
+            if rule.direction not in (direction, ACL_ANY):
+                continue
+            if rule.protocols is not None and \
+                    protocol not in rule.protocols:
+                continue
+            if rule.ports is not None and not any(
+                    first <= port <= last for first, last in rule.ports):
+                continue
+            if not any(address in network for network in networks):
+                continue
+            verdict = rule.action == ACL_ALLOW
+            break
+        verdicts.append(verdict)
+    return tuple(verdicts)
+
+def main(count=BENCHMARK_RULES, packets=BENCHMARK_PACKETS):
+    """
+    Runs the benchmark.
+
+    :param count:           The number of rules
+    :param packets:         The number of packets
+    :return:
+    """
+
+    rules = build_rules(count)
+    items = build_packets(rules, packets)
+
+    start = timeit.default_timer()
+    acl = AccessList(rules)
+    acl.compile()
+    compiled = timeit.default_timer() - start
+
+    parsed = [
+        (rule, [IPNetwork(network) for network in rule.networks])
+        for rule in rules
+    ]
+    scanned = items[:BENCHMARK_SCANNED]
+    for item in scanned:
+        if acl.evaluate(*item) != scan(parsed, item):
+            raise AssertionError("Verdicts differ for %s" %(item,))
+
+    cached = AccessList(rules, cache=packets)
+    cached.compile()
+    for item in items:
+        cached.evaluate(*item)
+
+    results = [
+        measure(
+            "rule scan",
+            lambda item : scan(parsed, item),
+            scanned,
+            repeat = 1
+        ),
+        measure(
+            "compiled access list",
+            lambda item : acl.evaluate(*item),
+            items
+        ),
+        measure(
+            "compiled, cached verdicts",
+            lambda item : cached.evaluate(*item),
+            items
+        )
+    ]
+
+    report(
+        "Access list (%d rules, compiled in %.2f s)" %(count, compiled),
+        results
+    )
+    print(acl.get_statistics())
+    return
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
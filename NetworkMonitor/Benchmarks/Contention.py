@@ -0,0 +1,180 @@
+"""
+
+    :Contention:
+    ==========
+
+    :
+    This benchmarks the lock striped tables of the ProbeDb under
+    concurrent threads. Each thread counts packets in the
+    conversations of its own hosts and reads the table statistics,
+    like a correlator next to the reports. The tables are run with
+    one stripe, i.e. one table lock, and with more stripes.
+
+        python -m NetworkMonitor.Benchmarks.Contention [count] [threads]
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import sys
+import threading
+import timeit
+
+from NetworkMonitor.Storage.ProbeDb \
+    import ProbeDb
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The default number of packets of each thread
+BENCHMARK_PACKETS   = 50000
+
+# The default number of threads
+BENCHMARK_THREADS   = 4
+
+# The stripes compared
+BENCHMARK_STRIPES   = [1, 4, 16]
+
+# The conversations of each thread
+BENCHMARK_HOSTS     = 1000
+
+# The packets between two statistics reads
+BENCHMARK_READS     = 1000
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def build_packets(thread, count):
+    """
+    Builds the conversation keys and times of a thread.
+
+    :param thread:          The thread number
+    :param count:           The number of packets
+    :return:
+    """
+    return [
+        (
+            ('10.%d.%d.%d' %(thread, index % 250, index % 97),
+             '10.255.0.%d' %(index % 200)),
+            float(index)
+        )
+        for index in (
+            (packet * 7919) % BENCHMARK_HOSTS for packet in range(count)
+        )
+    ]
+
+def correlate(table, packets):
+    """
+    Counts the packets in the table, like a correlator.
+
+    :param table:           The conversation table
+    :param packets:         The keys and times
+    :return:
+    """
+
+    for index, (key, time) in enumerate(packets):
+        table.add(key, lambda : {'src_ip' : key[0]}, time, 64)
+        if index % BENCHMARK_READS == 0:
+            table.get_statistics()
+    return
+
+def contend(stripes, packets):
+    """
+    Runs the threads on a table with the stripes, the best run of
+    three is kept.
+
+    :param stripes:         The lock stripes
+    :param packets:         The packets of each thread
+    :return:                The results
+    """
+
+    # Container
+    best = None
+
+    for run in range(3):
+        database = ProbeDb('Benchmark', 'record', stripes)
+        database.setup_aggregates(['IP'], {'IP' : (0, 0)})
+        table = database.get_table('IP')
+        threads = [
+            threading.Thread(target=correlate, args=(table, items))
+            for items in packets
+        ]
+
+        start = timeit.default_timer()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = timeit.default_timer() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, table.get_statistics()['contended'])
+
+    count = sum(len(items) for items in packets)
+    return {
+        'name'      : "%d stripes" %stripes,
+        'count'     : count,
+        'seconds'   : best[0],
+        'rate'      : count / best[0] if best[0] else 0.0,
+        'usec'      : best[0] * 1e6 / count if count else 0.0,
+        'contended' : best[1]
+    }
+
+def main(count=BENCHMARK_PACKETS, threads=BENCHMARK_THREADS):
+    """
+    Runs the benchmark.
+
+    :param count:           The number of packets of each thread
+    :param threads:         The number of threads
+    :return:
+    """
+
+    packets = [build_packets(thread, count) for thread in range(threads)]
+    results = [contend(stripes, packets) for stripes in BENCHMARK_STRIPES]
+
+    title = "Table contention (%d threads, %d packets each)" %(
+        threads,
+        count
+    )
+    print(title)
+    print("=" * len(title))
+
+    reference = results[0]['usec']
+    for result in results:
+        print(
+            "%-16s %10d items %12.0f /sec %9.2f usec %7.1fx "
+            "%9d waits" %(
+                result['name'],
+                result['count'],
+                result['rate'],
+                result['usec'],
+                reference / result['usec'] if result['usec'] else 0.0,
+                result['contended']
+            )
+        )
+    print("")
+    return
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,154 @@
+"""
+
+    :Decoder:
+    ==========
+
+    :
+    This benchmarks the raw header decoder against the scapy
+    dissection, both paths read the header fields used by the
+    IpProbe / TcpProbe / ArpProbe correlators.
+
+        python -m NetworkMonitor.Benchmarks.Decoder [count]
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import sys
+
+from scapy.all import Ether, IP, IPv6, TCP, UDP, ARP, raw
+from NetworkMonitor.Probe.Capture.Decoder \
+    import decode
+from NetworkMonitor.Probe.Capture.Batch \
+    import decode_batch, is_available
+from NetworkMonitor.Benchmarks.Timer \
+    import measure, report
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The default number of frames
+BENCHMARK_FRAMES    = 20000
+
+# The frames in a batch
+BENCHMARK_BATCH     = 512
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def build_frames(count):
+    """
+    Builds a mix of TCP, UDP, ARP and IPv6 frames.
+
+    :param count:           The number of frames
+    :return:
+    """
+
+    ether = Ether(src='28:80:23:02:53:55', dst='00:11:22:33:44:55')
+    templates = [
+        ether / IP(src='10.0.1.1', dst='10.0.1.2') /
+        TCP(sport=40000, dport=80) / ('x' * 512),
+        ether / IP(src='10.0.1.3', dst='10.0.1.1') /
+        UDP(sport=5353, dport=53) / ('x' * 64),
+        ether / ARP(psrc='10.0.1.1', pdst='10.0.1.2'),
+        ether / IPv6(src='fe80::1', dst='fe80::2') /
+        TCP(sport=443, dport=40001),
+    ]
+    frames = [raw(template) for template in templates]
+    return [frames[index % len(frames)] for index in range(count)]
+
+def read_fields(packet):
+    """
+    Reads the header fields like the correlators do, it works
+    on both a scapy packet and a header record.
+
+    :param packet:          The packet or the header record
+    :return:
+    """
+
+    ether = packet[Ether]
+    fields = [ether.src, ether.dst, ether.type]
+
+    if packet.haslayer(IP):
+        ip = packet[IP]
+        fields.extend(
+            [ip.src, ip.dst, ip.len, ip.chksum, ip.id, ip.ttl]
+        )
+    if packet.haslayer(TCP):
+        fields.extend([packet[TCP].sport, packet[TCP].dport])
+    elif packet.haslayer(UDP):
+        fields.extend([packet[UDP].sport, packet[UDP].dport])
+    elif packet.haslayer(ARP):
+        arp = packet[ARP]
+        fields.extend([arp.hwsrc, arp.psrc, arp.hwdst, arp.pdst])
+    return fields
+
+def main(count=BENCHMARK_FRAMES):
+    """
+    Runs the benchmark.
+
+    :param count:           The number of frames
+    :return:
+    """
+
+    frames = build_frames(count)
+    results = [
+        measure(
+            "scapy dissection",
+            lambda frame : read_fields(Ether(frame)),
+            frames
+        ),
+        measure(
+            "raw header decoder",
+            lambda frame : read_fields(decode(frame)),
+            frames
+        )
+    ]
+
+    # The batches hold the columns read by the correlators
+    if is_available():
+        times = [0.0] * BENCHMARK_BATCH
+        batches = [
+            frames[index:index + BENCHMARK_BATCH]
+            for index in range(0, count - BENCHMARK_BATCH + 1,
+                               BENCHMARK_BATCH)
+        ]
+        results.append(
+            measure(
+                "batched decoder (%d)" %BENCHMARK_BATCH,
+                lambda batch : decode_batch(batch, times),
+                batches,
+                size = BENCHMARK_BATCH
+            )
+        )
+
+    report(
+        "Header decoding (%d frames)" %count,
+        results
+    )
+    return
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
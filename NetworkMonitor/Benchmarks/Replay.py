@@ -0,0 +1,136 @@
+"""
+
+    :Replay:
+    ==========
+
+    :
+    This is the replay benchmark. It replays a pcap or pcapng file
+    through a set of passive network probes, the correlators and
+    their databases included, without root or live traffic. It is
+    used to size a node before it is deployed, i.e.
+        python -m NetworkMonitor.Benchmarks.Replay capture.pcap fast
+            IpProbe TcpProbe
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import sys
+
+try:
+    from Queue import Queue
+except ImportError:
+    from queue import Queue
+
+from NetworkMonitor.Probe.Capture.Engine \
+    import CaptureEngine
+from NetworkMonitor.Probe.Capture.Replay \
+    import REPLAY_FAST
+from NetworkMonitor.Probe.Probes.Passive.Network \
+    import PASSIVE_NETWORK_PROBES
+from NetworkMonitor.Benchmarks.Timer \
+    import report
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The probes replayed by default
+BENCHMARK_PROBES    = [
+    'IpProbe',
+    'TcpProbe',
+    'UdpProbe',
+    'MacProbe',
+    'ArpProbe'
+]
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def build_configs(path, mode):
+    """
+    Builds the app configs of a probe replaying a file, nothing
+    is known thus every address is correlated.
+
+    :param path:            The capture file
+    :param mode:            The replay mode [fast/timed]
+    :return:
+    """
+    return {
+        'iface'         : 'replay',
+        'pcap'          : path,
+        'replay'        : mode,
+        'decode'        : 'raw',
+        'known'         : [],
+        'known_ip'      : [],
+        'known_port'    : [],
+        'known_mac'     : []
+    }
+
+def main(path, mode=REPLAY_FAST, *names):
+    """
+    Runs the benchmark.
+
+    :param path:            The capture file
+    :param mode:            The replay mode [fast/timed]
+    :param names:           The probes to replay through
+    :return:
+    """
+
+    queue = Queue()
+    probes = [
+        PASSIVE_NETWORK_PROBES[name](queue, build_configs(path, mode))
+        for name in names or BENCHMARK_PROBES
+    ]
+
+    # The probes share the engine of the file
+    for probe in probes:
+        probe.setup()
+        probe.start()
+    for probe in probes:
+        probe.join()
+
+    replay = CaptureEngine.get_engine(path).get_replay()
+    report(
+        "Replay of %s (%s)" %(path, mode),
+        [
+            {
+                'name'      : 'replay',
+                'count'     : replay['packets'],
+                'seconds'   : replay['seconds'],
+                'rate'      : replay['rate'],
+                'usec'      : replay['usec']
+            }
+        ]
+    )
+    for probe in probes:
+        statistics = CaptureEngine.get_engine(path).get_statistics(probe)
+        print(
+            "%-32s %10d matched" %(probe.name, statistics['matched'])
+        )
+    print("Peak RSS: %s KB" %replay['peak_rss'])
+    return
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
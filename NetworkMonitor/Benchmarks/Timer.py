@@ -0,0 +1,101 @@
+"""
+
+    :Timer:
+    ==========
+
+    :
+    This is the timing helper shared by the benchmarks.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import timeit
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def measure(name, function, items, repeat=3, size=1):
+    """
+    Measures a function applied to every item, the best run of
+    the repeats is kept.
+
+    :param name:            The benchmark name
+    :param function:        The function to apply
+    :param items:           The items to apply the function to
+    :param repeat:          The number of runs
+    :param size:            The units of work in an item
+    :return:                The results
+    """
+
+    # Container
+    best = None
+
+    for run in range(repeat):
+        start = timeit.default_timer()
+        for item in items:
+            function(item)
+        elapsed = timeit.default_timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    count = len(items) * size
+    return {
+        'name'      : name,
+        'count'     : count,
+        'seconds'   : best,
+        'rate'      : count / best if best else 0.0,
+        'usec'      : best * 1e6 / count if count else 0.0
+    }
+
+def report(title, results):
+    """
+    Prints the results of the benchmarks, the first result is
+    the reference for the speedups.
+
+    :param title:           The benchmark title
+    :param results:         The results of measure()
+    :return:
+    """
+
+    print(title)
+    print("=" * len(title))
+
+    reference = results[0]['usec'] if results else 0.0
+    for result in results:
+        print(
+            "%-32s %10d items %12.0f /sec %9.2f usec %7.1fx" %(
+                result['name'],
+                result['count'],
+                result['rate'],
+                result['usec'],
+                reference / result['usec'] if result['usec'] else 0.0
+            )
+        )
+    print("")
+    return
@@ -0,0 +1,29 @@
+"""
+
+    :__init__.py:
+    ==========
+
+    :
+    Contains the benchmarks of the hot paths of the monitor.
+    Each benchmark is a runnable module, i.e.
+        python -m NetworkMonitor.Benchmarks.Decoder
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
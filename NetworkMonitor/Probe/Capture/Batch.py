@@ -0,0 +1,583 @@
+"""
+
+    :Batch:
+    ==========
+
+    :
+    This is the batched header decoder. The capture engine collects
+    the frames of a burst and their fixed offset header fields are
+    decoded in one pass into a NumPy structured array. The probes
+    then work on whole columns (addresses, ports, lengths, ttl)
+    instead of one Python call per packet.
+
+    NumPy is optional, the batch mode is disabled without it.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The bytes of a frame decoded in batch mode.
+# Ether + 802.1Q + the largest IPv4 header + the ports.
+BATCH_HEADER_BYTES  = 96
+
+# The layer flags of a batch row
+LAYER_FLAGS         = {
+    'Ether'     : 0x01,
+    'Dot1Q'     : 0x02,
+    'IP'        : 0x04,
+    'IPv6'      : 0x08,
+    'TCP'       : 0x10,
+    'UDP'       : 0x20,
+    'ARP'       : 0x40,
+}
+
+# The columns of a batch
+BATCH_COLUMNS       = [
+    ('time',        'f8'),
+    ('wirelen',     'u4'),
+    ('layers',      'u1'),
+    ('ether_type',  'u2'),
+    ('src_mac',     'u8'),
+    ('dst_mac',     'u8'),
+    ('version',     'u1'),
+    ('src_ip',      'u4'),
+    ('dst_ip',      'u4'),
+    ('ip_len',      'u2'),
+    ('ip_id',       'u2'),
+    ('ttl',         'u1'),
+    ('proto',       'u1'),
+    ('chksum',      'u2'),
+    ('sport',       'u2'),
+    ('dport',       'u2'),
+]
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def is_available():
+    """
+    Returns true if the batch mode can be used.
+
+    :return:
+    """
+    return numpy is not None
+
+def get_layer_mask(layers):
+    """
+    Returns the layer flags a batch row must hold for the
+    layers of a probe.
+
+    :param layers:          The layer classes or names
+    :return:                The mask, None if not batchable
+    """
+
+    # Container
+    mask = 0
+
+    for layer in layers:
+        name = getattr(layer, '__name__', layer)
+        if name not in LAYER_FLAGS.keys():
+            return None
+        mask |= LAYER_FLAGS[name]
+    return mask
+
+def parse_ipv4(address):
+    """
+    Packs a dotted IPv4 address into an integer.
+
+    :param address:         The address
+    :return:
+    """
+
+    value = 0
+    for part in str(address).split('.'):
+        value = (value << 8) | int(part)
+    return value
+
+def format_ipv4(value):
+    """
+    Formats a packed IPv4 address.
+
+    :param value:           The packed address
+    :return:
+    """
+
+    value = int(value)
+    return "%d.%d.%d.%d" %(
+        (value >> 24) & 0xff,
+        (value >> 16) & 0xff,
+        (value >> 8) & 0xff,
+        value & 0xff
+    )
+
+def format_mac(value):
+    """
+    Formats a packed MAC address.
+
+    :param value:           The packed address
+    :return:
+    """
+
+    value = int(value)
+    return ":".join(
+        "%02x" %((value >> shift) & 0xff)
+        for shift in (40, 32, 24, 16, 8, 0)
+    )
+
+def build_networks(addresses):
+    """
+    Builds the packed networks of a list of IPv4 addresses or
+    CIDR networks, used to test a whole column at once.
+
+    :param addresses:       The addresses or networks
+    :return:                The networks and their masks
+    """
+
+    networks = []
+    masks = []
+
+    for address in addresses:
+        address = str(address).strip()
+        if '/' in address:
+            address, prefix = address.split('/')
+            prefix = int(prefix)
+        else:
+            prefix = 32
+
+        # Only the IPv4 addresses are packed in a batch
+        if ':' in address:
+            continue
+
+        mask = (0xffffffff << (32 - prefix)) & 0xffffffff
+        networks.append(parse_ipv4(address) & mask)
+        masks.append(mask)
+
+    return (
+        numpy.array(networks, dtype='u4'),
+        numpy.array(masks, dtype='u4')
+    )
+
+def match_networks(column, networks):
+    """
+    Returns the rows of an address column that are in the
+    networks. The host addresses are matched with one set
+    membership test, the networks are matched one at a time.
+
+    :param column:          The packed address column
+    :param networks:        The result of build_networks()
+    :return:                The boolean mask
+    """
+
+    addresses, masks = networks
+    hosts = masks == 0xffffffff
+    matched = numpy.isin(column, addresses[hosts])
+
+    for network, mask in zip(addresses[~hosts], masks[~hosts]):
+        matched |= (column & mask) == network
+    return matched
+
+def build_values(values, dtype='u2'):
+    """
+    Builds a packed array of values, i.e. the known ports.
+
+    :param values:          The values
+    :param dtype:           The column type
+    :return:
+    """
+    return numpy.array([int(value) for value in values], dtype=dtype)
+
+def match_values(column, values):
+    """
+    Returns the rows of a column that hold one of the values.
+
+    :param column:          The column
+    :param values:          The result of build_values()
+    :return:                The boolean mask
+    """
+    return numpy.isin(column, values)
+
+def unique_values(column):
+    """
+    Returns the distinct values of a column as Python values.
+
+    :param column:          The column
+    :return:
+    """
+    return numpy.unique(column).tolist()
+
+def map_rows(batch, keys, function):
+    """
+    Applies a function to each distinct key of a batch and spreads
+    its results over the rows holding the key.
+
+    :param batch:           The frame batch
+    :param keys:            The key column names
+    :param function:        Returns the result of a key row
+    :return:                The results by row
+    """
+
+    unique, inverse = numpy.unique(
+        batch.columns[keys], return_inverse=True
+    )
+    results = numpy.array([function(row) for row in unique])
+    return results[inverse.reshape(-1)]
+
+def aggregate(batch, keys, length='ip_len'):
+    """
+    Aggregates the rows of a batch on key columns. The bytes are
+    the IP total lengths by default, like the packets count them.
+
+    :param batch:           The frame batch
+    :param keys:            The key column names
+    :param length:          The length column of the bytes
+    :return:                The unique keys, packets, bytes,
+                            first seen and last seen
+    """
+
+    columns = batch.columns
+    unique, inverse = numpy.unique(
+        columns[keys], return_inverse=True
+    )
+    inverse = inverse.reshape(-1)
+
+    packets = numpy.bincount(
+        inverse, minlength=len(unique)
+    )
+    totals = numpy.bincount(
+        inverse, weights=columns[length], minlength=len(unique)
+    )
+    first = numpy.full(len(unique), numpy.inf)
+    last = numpy.zeros(len(unique))
+    numpy.minimum.at(first, inverse, columns['time'])
+    numpy.maximum.at(last, inverse, columns['time'])
+    return unique, packets, totals, first, last
+
+def first_rows(batch, keys):
+    """
+    Returns the index of the first row holding each distinct key,
+    in the order of the keys returned by aggregate().
+
+    :param batch:           The frame batch
+    :param keys:            The key column names
+    :return:                The row indexes
+    """
+
+    unique, index = numpy.unique(
+        batch.columns[keys], return_index=True
+    )
+    return index
+
+def _be16(buffer, rows, offsets):
+    """
+    Reads a big endian 16 bit field at a per row offset.
+
+    :return:
+    """
+
+    return (buffer[rows, offsets].astype('u2') << 8) | \
+        buffer[rows, offsets + 1]
+
+def _be32(buffer, rows, offsets):
+    """
+    Reads a big endian 32 bit field at a per row offset.
+
+    :return:
+    """
+
+    return (_be16(buffer, rows, offsets).astype('u4') << 16) | \
+        _be16(buffer, rows, offsets + 2)
+
+def _be48(buffer, rows, offsets):
+    """
+    Reads a big endian 48 bit field at a per row offset.
+
+    :return:
+    """
+
+    return (_be16(buffer, rows, offsets).astype('u8') << 32) | \
+        _be32(buffer, rows, offsets + 2)
+
+def decode_batch(frames, times, caplens=None, wirelens=None):
+    """
+    Decodes the fixed offset header fields of a burst of frames
+    into a structured array. Only the first bytes of each frame
+    are copied, the fields are then read column wise.
+
+    :param frames:          The frame bytes, or their first bytes
+    :param times:           The capture times
+    :param caplens:         The captured lengths, if frames are cut
+    :param wirelens:        The lengths on the wire, if snapped
+    :return:                The frame batch
+    """
+
+    count = len(frames)
+    size = BATCH_HEADER_BYTES
+    columns = numpy.zeros(count, dtype=BATCH_COLUMNS)
+    if count == 0:
+        return FrameBatch(columns)
+
+    # Copy the headers of the frames into one array
+    buffer = numpy.frombuffer(
+        b''.join(
+            bytes(frame[:size]).ljust(size, b'\x00')
+            for frame in frames
+        ),
+        dtype='u1'
+    ).reshape(count, size)
+    if caplens is None:
+        caplens = [len(frame) for frame in frames]
+    caplen = numpy.array(caplens, dtype='i4')
+    rows = numpy.arange(count)
+    zero = numpy.zeros(count, dtype='i4')
+
+    columns['time'] = times
+    columns['wirelen'] = caplen if wirelens is None else wirelens
+
+    # Ethernet
+    ether = caplen >= 14
+    flags = numpy.where(ether, LAYER_FLAGS['Ether'], 0)
+    columns['dst_mac'] = _be48(buffer, rows, zero)
+    columns['src_mac'] = _be48(buffer, rows, zero + 6)
+    ether_type = _be16(buffer, rows, zero + 12)
+
+    # One VLAN tag
+    vlan = ether & ((ether_type == 0x8100) | (ether_type == 0x88a8))
+    flags |= numpy.where(vlan, LAYER_FLAGS['Dot1Q'], 0)
+    base = numpy.where(vlan, 18, 14).astype('i4')
+    ether_type = numpy.where(
+        vlan, _be16(buffer, rows, zero + 16), ether_type
+    )
+    columns['ether_type'] = ether_type
+
+    # IPv4
+    ip = ether & (ether_type == 0x0800) & (caplen >= base + 20)
+    first = buffer[rows, base]
+    ihl = (first & 0x0f).astype('i4')
+    frag = _be16(buffer, rows, base + 6) & 0x1fff
+    flags |= numpy.where(ip, LAYER_FLAGS['IP'], 0)
+    columns['version'] = numpy.where(ip, first >> 4, 0)
+    columns['ip_len'] = numpy.where(ip, _be16(buffer, rows, base + 2), 0)
+    columns['ip_id'] = numpy.where(ip, _be16(buffer, rows, base + 4), 0)
+    columns['ttl'] = numpy.where(ip, buffer[rows, base + 8], 0)
+    columns['proto'] = numpy.where(ip, buffer[rows, base + 9], 0)
+    columns['chksum'] = numpy.where(ip, _be16(buffer, rows, base + 10), 0)
+    columns['src_ip'] = numpy.where(ip, _be32(buffer, rows, base + 12), 0)
+    columns['dst_ip'] = numpy.where(ip, _be32(buffer, rows, base + 16), 0)
+
+    # IPv6 and ARP are only flagged
+    flags |= numpy.where(
+        ether & (ether_type == 0x86dd), LAYER_FLAGS['IPv6'], 0
+    )
+    flags |= numpy.where(
+        ether & (ether_type == 0x0806), LAYER_FLAGS['ARP'], 0
+    )
+
+    # Transport, only in the first fragment
+    transport = base + ihl * 4
+    ports = ip & (frag == 0) & (ihl >= 5) & \
+        (caplen >= transport + 4) & (transport + 4 <= size)
+    transport = numpy.where(ports, transport, 0)
+    tcp = ports & (columns['proto'] == 6)
+    udp = ports & (columns['proto'] == 17)
+    flags |= numpy.where(tcp, LAYER_FLAGS['TCP'], 0)
+    flags |= numpy.where(udp, LAYER_FLAGS['UDP'], 0)
+    columns['sport'] = numpy.where(ports, _be16(buffer, rows, transport), 0)
+    columns['dport'] = numpy.where(
+        ports, _be16(buffer, rows, transport + 2), 0
+    )
+
+    columns['layers'] = flags
+    return FrameBatch(columns)
+
+class FrameBatch(object):
+    """
+    This is a batch of decoded frames. The columns are reached by
+    name, i.e. batch['src_ip'], and a batch can be narrowed down to
+    the rows holding the layers of a probe.
+    """
+
+    # The structured array
+    columns         = None
+
+    # The number of rows
+    count           = 0
+
+    def __init__(self, columns):
+        """
+        This is the constructor for the class.
+
+        :param columns:     The structured array
+        :return:
+        """
+
+        self.columns = columns
+        self.count = len(columns)
+        return
+
+    def __len__(self):
+        """
+        Returns the number of rows.
+
+        :return:
+        """
+        return self.count
+
+    def __getitem__(self, name):
+        """
+        Returns a column.
+
+        :param name:        The column name
+        :return:
+        """
+        return self.columns[name]
+
+    def select(self, mask):
+        """
+        Returns the rows holding all the layer flags of a mask.
+
+        :param mask:        The layer mask, see get_layer_mask()
+        :return:
+        """
+
+        if mask == 0:
+            return self
+        return FrameBatch(
+            self.columns[(self.columns['layers'] & mask) == mask]
+        )
+
+class BatchCollector(object):
+    """
+    This collects the frames of a burst. A batch is released when
+    it holds the maximum number of frames or when its first frame
+    is older than the interval. Only the first bytes of the frames
+    are kept, thus the frames can be read in place from a ring.
+    """
+
+    # The maximum number of frames
+    _size           = 0
+
+    # The maximum age of a batch (seconds)
+    _interval       = 0
+
+    def __init__(self, size, interval):
+        """
+        This is the constructor for the class.
+
+        :param size:        The maximum number of frames
+        :param interval:    The maximum age of a batch (ms)
+        :return:
+        """
+
+        self._size = size
+        self._interval = interval / 1000.0
+        self._frames = []
+        self._times = []
+        self._caplens = []
+        self._wirelens = []
+        self._started = None
+        return
+
+    def get_size(self):
+        """
+        Returns the maximum number of frames.
+
+        :return:
+        """
+        return self._size
+
+    def get_interval(self):
+        """
+        Returns the maximum age of a batch (ms).
+
+        :return:
+        """
+        return self._interval * 1000.0
+
+    def add(self, data, timestamp, length=None):
+        """
+        Adds a frame to the batch.
+
+        :param data:        The frame bytes
+        :param timestamp:   The capture time
+        :param length:      The length on the wire, if snapped
+        :return:            The batch if released, else None
+        """
+
+        if self._started is None:
+            self._started = time.time()
+
+        self._frames.append(bytes(data[:BATCH_HEADER_BYTES]))
+        self._times.append(timestamp)
+        self._caplens.append(len(data))
+        self._wirelens.append(len(data) if length is None else length)
+
+        if len(self._frames) >= self._size:
+            return self.flush()
+        return self.poll()
+
+    def poll(self):
+        """
+        Releases the batch if it is older than the interval.
+
+        :return:            The batch if released, else None
+        """
+
+        if self._started is None or \
+                time.time() - self._started < self._interval:
+            return None
+        return self.flush()
+
+    def flush(self):
+        """
+        Releases the batch.
+
+        :return:            The batch, None if empty
+        """
+
+        if len(self._frames) == 0:
+            return None
+
+        batch = decode_batch(
+            self._frames,
+            self._times,
+            self._caplens,
+            self._wirelens
+        )
+        self._frames = []
+        self._times = []
+        self._caplens = []
+        self._wirelens = []
+        self._started = None
+        return batch
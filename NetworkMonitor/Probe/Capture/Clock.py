@@ -0,0 +1,102 @@
+"""
+
+    :Clock:
+    ==========
+
+    :
+    This is the time formatting of the probe records. The records
+    hold the capture time of their packet as an epoch, the kernel
+    timestamp of the frame, and the time is only formatted when the
+    tables are reported. The formatted strings are memoized per
+    second, a report formats each second once.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import time
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The seconds memoized before the memo is cleared
+CLOCK_MEMO_SIZE     = 4096
+
+# The record fields that hold a capture time, the conversations
+# are first and last seen at a capture time
+CLOCK_FIELDS        = (
+    'time',
+    'first',
+    'last'
+)
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+# The formatted seconds
+_memo               = {}
+
+def format_time(epoch):
+    """
+    Formats a capture time like time.asctime, the string of a
+    second is only built once.
+
+    :param epoch:           The capture time (seconds)
+    :return:
+    """
+
+    second = int(epoch)
+    text = _memo.get(second)
+    if text is None:
+        if len(_memo) >= CLOCK_MEMO_SIZE:
+            _memo.clear()
+        text = _memo[second] = time.asctime(
+            time.localtime(second)
+        )
+    return text
+
+def format_tables(tables):
+    """
+    Formats the capture times of the rows of the tables, the rows
+    are copied and the database is left untouched.
+
+    :param tables:          The rows by table name
+    :return:
+    """
+
+    # Container
+    results = {}
+
+    for name, rows in tables.items():
+        formatted = []
+        for row in rows:
+            row = dict(row)
+            for field in CLOCK_FIELDS:
+                value = row.get(field)
+                if isinstance(value, (int, float)):
+                    row[field] = format_time(value)
+            formatted.append(row)
+        results[name] = formatted
+    return results
@@ -0,0 +1,391 @@
+"""
+
+    :Decoder:
+    ==========
+
+    :
+    This is the raw header decoder. It reads the fixed header fields
+    of the Ethernet, IPv4, IPv6, TCP, UDP and ARP layers straight from
+    the captured bytes, without building a scapy packet. The decoded
+    record answers to record[IP].src like a scapy packet does, so the
+    probe correlators can consume either one.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import socket
+import struct
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The decode modes
+DECODE_SCAPY        = 'scapy'
+DECODE_RAW          = 'raw'
+DECODE_MODES        = [
+    DECODE_SCAPY,
+    DECODE_RAW
+]
+
+# The layers the raw decoder knows about
+RAW_LAYERS          = frozenset(
+    [
+        'Ether',
+        'Dot1Q',
+        'IP',
+        'IPv6',
+        'TCP',
+        'UDP',
+        'ARP'
+    ]
+)
+
+# Ether types
+ETH_P_IP            = 0x0800
+ETH_P_ARP           = 0x0806
+ETH_P_IPV6          = 0x86dd
+ETH_P_8021Q         = 0x8100
+ETH_P_8021AD        = 0x88a8
+
+# IP protocols
+IPPROTO_TCP         = 6
+IPPROTO_UDP         = 17
+
+# The header layouts
+_ETHER              = struct.Struct('!6B6BH')
+_DOT1Q              = struct.Struct('!HH')
+_IPV4               = struct.Struct('!BBHHHBBH4B4B')
+_IPV6               = struct.Struct('!IHBB16s16s')
+_TCP                = struct.Struct('!HHIIBBHHH')
+_UDP                = struct.Struct('!HHHH')
+_ARP                = struct.Struct('!HHBBH6B4B6B4B')
+
+_MAC_FORMAT         = '%02x:%02x:%02x:%02x:%02x:%02x'
+_IPV4_FORMAT        = '%d.%d.%d.%d'
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+class EtherHeader(object):
+    """
+    The Ethernet header, named after the scapy fields.
+    """
+
+    __slots__       = ('dst', 'src', 'type')
+
+class Dot1QHeader(object):
+    """
+    The 802.1Q header, named after the scapy fields.
+    """
+
+    __slots__       = ('vlan', 'type')
+
+class IPHeader(object):
+    """
+    The IPv4 header, named after the scapy fields.
+    """
+
+    __slots__       = (
+        'version', 'ihl', 'tos', 'len', 'id', 'flags',
+        'frag', 'ttl', 'proto', 'chksum', 'src', 'dst'
+    )
+
+class IPv6Header(object):
+    """
+    The IPv6 header, named after the scapy fields.
+    """
+
+    __slots__       = (
+        'version', 'tc', 'fl', 'plen', 'nh', 'hlim', 'src', 'dst'
+    )
+
+class TCPHeader(object):
+    """
+    The TCP header, named after the scapy fields.
+    """
+
+    __slots__       = (
+        'sport', 'dport', 'seq', 'ack', 'dataofs',
+        'flags', 'window', 'chksum', 'urgptr'
+    )
+
+class UDPHeader(object):
+    """
+    The UDP header, named after the scapy fields.
+    """
+
+    __slots__       = ('sport', 'dport', 'len', 'chksum')
+
+class ARPHeader(object):
+    """
+    The ARP header, named after the scapy fields.
+    """
+
+    __slots__       = (
+        'hwtype', 'ptype', 'hwlen', 'plen', 'op',
+        'hwsrc', 'psrc', 'hwdst', 'pdst'
+    )
+
+class HeaderRecord(object):
+    """
+    This is the lightweight record of a decoded frame. It holds the
+    capture time, the frame bytes as a memoryview (no copy is made)
+    and the decoded headers. The headers are reached with the layer
+    class or the layer name, the same way as in a scapy packet.
+    """
+
+    __slots__       = ('time', 'wirelen', 'data', 'layers', 'headers')
+
+    def __init__(self, data, time, length=None):
+        """
+        This is the constructor for the class.
+
+        :param data:        The frame bytes
+        :param time:        The capture time
+        :param length:      The length on the wire, if snapped
+        :return:
+        """
+
+        self.time = time
+        self.data = memoryview(data)
+        self.wirelen = len(self.data) if length is None else length
+        self.layers = ()
+        self.headers = {}
+        return
+
+    def __getitem__(self, layer):
+        """
+        Returns the header of a layer.
+
+        :param layer:       The layer class or name
+        :return:
+        """
+        return self.headers[getattr(layer, '__name__', layer)]
+
+    def __contains__(self, layer):
+        """
+        Returns true if the layer was decoded.
+
+        :param layer:       The layer class or name
+        :return:
+        """
+        return self.haslayer(layer)
+
+    def haslayer(self, layer):
+        """
+        Returns true if the layer was decoded.
+
+        :param layer:       The layer class or name
+        :return:
+        """
+        return getattr(layer, '__name__', layer) in self.headers
+
+def decode(data, time=None, length=None):
+    """
+    Decodes the headers of an Ethernet frame. The decoding stops at
+    the first layer that is truncated or unknown, the layers decoded
+    up to there are kept.
+
+    :param data:            The frame bytes
+    :param time:            The capture time
+    :param length:          The length on the wire, if snapped
+    :return:                The header record
+    """
+
+    record = HeaderRecord(data, time, length)
+    buffer = record.data
+    size = len(buffer)
+    headers = record.headers
+    layers = []
+
+    # Ethernet
+    if size < _ETHER.size:
+        return record
+    fields = _ETHER.unpack_from(buffer, 0)
+    header = EtherHeader()
+    header.dst = _MAC_FORMAT %fields[0:6]
+    header.src = _MAC_FORMAT %fields[6:12]
+    header.type = ether_type = fields[12]
+    headers['Ether'] = header
+    layers.append('Ether')
+    offset = _ETHER.size
+
+    # VLAN tags
+    while ether_type in (ETH_P_8021Q, ETH_P_8021AD):
+        if size < offset + _DOT1Q.size:
+            record.layers = tuple(layers)
+            return record
+        tci, ether_type = _DOT1Q.unpack_from(buffer, offset)
+        header = Dot1QHeader()
+        header.vlan = tci & 0x0fff
+        header.type = ether_type
+        headers['Dot1Q'] = header
+        layers.append('Dot1Q')
+        offset += _DOT1Q.size
+
+    # Network layer
+    protocol = None
+    if ether_type == ETH_P_IP:
+        offset, protocol = _decode_ipv4(buffer, offset, size, headers, layers)
+    elif ether_type == ETH_P_IPV6:
+        offset, protocol = _decode_ipv6(buffer, offset, size, headers, layers)
+    elif ether_type == ETH_P_ARP:
+        _decode_arp(buffer, offset, size, headers, layers)
+
+    # Transport layer
+    if protocol == IPPROTO_TCP:
+        _decode_tcp(buffer, offset, size, headers, layers)
+    elif protocol == IPPROTO_UDP:
+        _decode_udp(buffer, offset, size, headers, layers)
+
+    record.layers = tuple(layers)
+    return record
+
+def _decode_ipv4(buffer, offset, size, headers, layers):
+    """
+    Decodes the IPv4 header.
+
+    :return:                The payload offset, the protocol
+    """
+
+    if size < offset + _IPV4.size:
+        return offset, None
+
+    fields = _IPV4.unpack_from(buffer, offset)
+    header = IPHeader()
+    header.version = fields[0] >> 4
+    header.ihl = fields[0] & 0x0f
+    header.tos = fields[1]
+    header.len = fields[2]
+    header.id = fields[3]
+    header.flags = fields[4] >> 13
+    header.frag = fields[4] & 0x1fff
+    header.ttl = fields[5]
+    header.proto = fields[6]
+    header.chksum = fields[7]
+    header.src = _IPV4_FORMAT %fields[8:12]
+    header.dst = _IPV4_FORMAT %fields[12:16]
+    headers['IP'] = header
+    layers.append('IP')
+
+    # Only the first fragment holds the transport header
+    if header.frag != 0 or header.ihl < 5:
+        return offset, None
+    return offset + header.ihl * 4, header.proto
+
+def _decode_ipv6(buffer, offset, size, headers, layers):
+    """
+    Decodes the IPv6 header, extension headers are not walked.
+
+    :return:                The payload offset, the next header
+    """
+
+    if size < offset + _IPV6.size:
+        return offset, None
+
+    fields = _IPV6.unpack_from(buffer, offset)
+    header = IPv6Header()
+    header.version = fields[0] >> 28
+    header.tc = (fields[0] >> 20) & 0xff
+    header.fl = fields[0] & 0xfffff
+    header.plen = fields[1]
+    header.nh = fields[2]
+    header.hlim = fields[3]
+    header.src = socket.inet_ntop(socket.AF_INET6, fields[4])
+    header.dst = socket.inet_ntop(socket.AF_INET6, fields[5])
+    headers['IPv6'] = header
+    layers.append('IPv6')
+    return offset + _IPV6.size, header.nh
+
+def _decode_arp(buffer, offset, size, headers, layers):
+    """
+    Decodes the ARP header of Ethernet / IPv4 bindings.
+
+    :return:
+    """
+
+    if size < offset + _ARP.size:
+        return
+
+    fields = _ARP.unpack_from(buffer, offset)
+    header = ARPHeader()
+    header.hwtype = fields[0]
+    header.ptype = fields[1]
+    header.hwlen = fields[2]
+    header.plen = fields[3]
+    header.op = fields[4]
+    header.hwsrc = _MAC_FORMAT %fields[5:11]
+    header.psrc = _IPV4_FORMAT %fields[11:15]
+    header.hwdst = _MAC_FORMAT %fields[15:21]
+    header.pdst = _IPV4_FORMAT %fields[21:25]
+    headers['ARP'] = header
+    layers.append('ARP')
+    return
+
+def _decode_tcp(buffer, offset, size, headers, layers):
+    """
+    Decodes the TCP header.
+
+    :return:
+    """
+
+    if size < offset + _TCP.size:
+        return
+
+    fields = _TCP.unpack_from(buffer, offset)
+    header = TCPHeader()
+    header.sport = fields[0]
+    header.dport = fields[1]
+    header.seq = fields[2]
+    header.ack = fields[3]
+    header.dataofs = fields[4] >> 4
+    header.flags = ((fields[4] & 0x01) << 8) | fields[5]
+    header.window = fields[6]
+    header.chksum = fields[7]
+    header.urgptr = fields[8]
+    headers['TCP'] = header
+    layers.append('TCP')
+    return
+
+def _decode_udp(buffer, offset, size, headers, layers):
+    """
+    Decodes the UDP header.
+
+    :return:
+    """
+
+    if size < offset + _UDP.size:
+        return
+
+    fields = _UDP.unpack_from(buffer, offset)
+    header = UDPHeader()
+    header.sport = fields[0]
+    header.dport = fields[1]
+    header.len = fields[2]
+    header.chksum = fields[3]
+    headers['UDP'] = header
+    layers.append('UDP')
+    return
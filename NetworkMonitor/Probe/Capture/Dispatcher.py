@@ -0,0 +1,155 @@
+"""
+
+    :Dispatcher:
+    ==========
+
+    :
+    This is the layer indexed dispatch table of the capture
+    engine. The layer stack of a packet is used as a key into a
+    table that holds the probes interested in that stack, thus a
+    packet costs one lookup no matter how many probes are loaded.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The maximum number of layer stacks indexed
+DISPATCH_INDEX_MAX  = 1024
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def get_layer_names(layers):
+    """
+    Returns the names of the layers declared by a probe.
+
+    :param layers:          The layer classes or names
+    :return:
+    """
+    return frozenset(
+        getattr(layer, '__name__', layer) for layer in layers
+    )
+
+def get_packet_layers(packet):
+    """
+    Returns the layer stack of a dissected packet as a tuple
+    of layer names.
+
+    :param packet:          The dissected packet
+    :return:
+    """
+
+    # Container
+    names = []
+
+    # The payload of the last layer is falsy
+    layer = packet
+    while layer:
+        names.append(layer.__class__.__name__)
+        layer = layer.payload
+    return tuple(names)
+
+class Dispatcher(object):
+    """
+    This is the dispatch table. The records registered are the
+    engine records, they must hold the probe and its layer names.
+    The table is indexed by the layer stack of the packets, a
+    stack is resolved once against the registered records and
+    then cached until the records change.
+    """
+
+    # The registered records
+    _records        = None
+
+    # The layer stack index
+    _index          = None
+
+    # The record key holding the layer names
+    _key            = 'layers'
+
+    def __init__(self, records=None, key='layers'):
+        """
+        This is the constructor for the class.
+
+        :param records:     The engine records to dispatch to
+        :param key:         The record key holding the layer names
+        :return:
+        """
+
+        self._key = key
+        self.build(records or [])
+        return
+
+    def build(self, records):
+        """
+        Rebuilds the table, it is called when the probes
+        registered on the engine change.
+
+        :param records:     The engine records to dispatch to
+        :return:
+        """
+
+        self._records = list(records)
+        self._index = {}
+        return
+
+    def lookup(self, stack):
+        """
+        Returns the records interested in a layer stack.
+
+        :param stack:       The layer names of the packet
+        :return:
+        """
+
+        records = self._index.get(stack)
+        if records is None:
+            records = self.__resolve(stack)
+        return records
+
+    def __resolve(self, stack):
+        """
+        Resolves a layer stack against the registered records
+        and caches the result.
+
+        :param stack:       The layer names of the packet
+        :return:
+        """
+
+        present = frozenset(stack)
+        records = tuple(
+            record for record in self._records
+            if record[self._key] <= present
+        )
+
+        # Malformed traffic can grow the stacks without bounds
+        index = self._index
+        if len(index) >= DISPATCH_INDEX_MAX:
+            index = {}
+        index[stack] = records
+        self._index = index
+        return records
@@ -0,0 +1,1197 @@
+"""
+
+    :Engine:
+    ==========
+
+    :
+    This is the shared capture engine. There is only one engine
+    per interface, it sniffs the interface once, dissects each
+    frame once and hands the dissected packet to every probe
+    that is registered on the interface.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import time
+import select
+import logging
+import threading
+
+from timeit import default_timer
+
+from scapy.all import sniff, conf, Ether, Scapy_Exception
+from NetworkMonitor.Probe.Capture.Filter \
+    import compile_layers, combine_filters, read_iface_packets, \
+    compile_program, attach_program, SNAPLEN_MAX
+from NetworkMonitor.Probe.Capture.Dispatcher \
+    import Dispatcher, get_layer_names, get_packet_layers
+from NetworkMonitor.Probe.Capture.Decoder \
+    import decode, DECODE_RAW, DECODE_SCAPY, DECODE_MODES, RAW_LAYERS
+from NetworkMonitor.Probe.Capture.Batch \
+    import BatchCollector, get_layer_mask, \
+    is_available as batch_available
+from NetworkMonitor.Probe.Capture.MmapRing \
+    import MmapRing, CAPTURE_SOCKET, CAPTURE_MMAP, CAPTURE_BACKENDS, \
+    join_fanout, recv_frame, is_available as ring_available
+from NetworkMonitor.Probe.Capture.Replay \
+    import PcapReplay, REPLAY_MODES
+from NetworkMonitor.Probe.Capture.Sampler \
+    import Sampler, SAMPLE_FIXED, SAMPLE_ADAPTIVE, SAMPLE_MODES
+from NetworkMonitor.Probe.Capture.Ring \
+    import BoundedRing, RingWorker
+from NetworkMonitor.Probe.Capture.Scheduler \
+    import ReportScheduler
+from NetworkMonitor.config \
+    import CAPTURE_RING_BLOCK_SIZE, CAPTURE_RING_BLOCKS, \
+    CAPTURE_RING_FRAME_SIZE, CAPTURE_RING_TIMEOUT, \
+    REPORT_INTERVAL, REPORT_RECORDS
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The raw capture socket poll timeout (seconds)
+CAPTURE_POLL_TIMEOUT    = 1
+
+# The quiet time before a replay starts, for the probes that
+# are still registering (seconds)
+CAPTURE_REPLAY_SETTLE   = 1
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+class CaptureEngine(object):
+    """
+    This is the capture engine for one interface. The passive
+    network probes do not sniff on their own anymore, they register
+    themselves to the engine of their interface and the engine
+    dispatches the packets to them.
+
+    The first probe that runs the engine owns the capture loop,
+    the other probes simply wait for the capture to end.
+    """
+
+    # The engines per interface
+    __engines       = {}
+
+    # The engines lock
+    __engines_lock  = threading.Lock()
+
+    # The interface
+    _iface          = None
+
+    # The registered probes
+    _probes         = None
+
+    # The number of packets captured
+    _packet_count   = 0
+
+    # The logger
+    logger          = None
+
+    # The registration records per probe
+    _registry       = None
+
+    # The socket filter expression
+    _filter         = None
+
+    # The bytes of a frame captured
+    _snaplen        = SNAPLEN_MAX
+
+    # The layer indexed dispatch table
+    _dispatcher     = None
+
+    # The decode mode
+    _decode         = DECODE_SCAPY
+
+    # The raw decoded dispatch table
+    _raw_dispatcher = None
+
+    # The table of the probes that need a scapy packet in raw mode
+    _deep_gate      = None
+
+    # The batch collector, None if not batching
+    _collector      = None
+
+    # The records of the probes fed with batches
+    _batch_records  = ()
+
+    # True if some probes want the frames one at a time
+    _per_frame      = True
+
+    # The capture backend
+    _backend        = CAPTURE_SOCKET
+
+    # The kernel counters of the ring backend
+    _kernel         = None
+
+    # The replay mode of a capture file, None if live
+    _replay         = None
+
+    # The replay report
+    _replay_report  = None
+
+    # The replay in progress
+    _source         = None
+
+    # The time of the last registration
+    _registered     = 0
+
+    # The fanout group of the capture socket, None if alone
+    _fanout         = None
+
+    # The packet sampler, None if every frame is dispatched
+    _sampler        = None
+
+    # The slots of the probe rings, 0 to correlate in the capture thread
+    _queue_size     = 0
+
+    # The report scheduler
+    _scheduler      = None
+
+    # The report limits asked for by the probes, None if not set
+    _report_limits  = None
+
+    def __init__(self, iface):
+        """
+        This is the constructor for the class.
+        Use get_engine() to get the shared engine of an iface.
+
+        :param iface:       The interface to capture on
+        :return:
+        """
+
+        self._iface = iface
+        self._probes = []
+        self._registry = {}
+        self._filter = None
+        self._snaplen = SNAPLEN_MAX
+        self._dispatcher = Dispatcher()
+        self._raw_dispatcher = Dispatcher()
+        self._deep_gate = Dispatcher(key='coarse')
+        self._decode = DECODE_SCAPY
+        self._collector = None
+        self._batch_records = ()
+        self._per_frame = True
+        self._backend = CAPTURE_SOCKET
+        self._kernel = {
+            'packets'   : 0,
+            'drops'     : 0,
+            'freezes'   : 0
+        }
+        self._replay = None
+        self._replay_report = None
+        self._source = None
+        self._fanout = None
+        self._sampler = None
+        self._queue_size = 0
+        self._scheduler = ReportScheduler(REPORT_INTERVAL, REPORT_RECORDS)
+        self._report_limits = None
+        self._registered = time.time()
+        self._restart = False
+        self._packet_count = 0
+        self._lock = threading.Lock()
+        self._running = threading.Event()
+        self._stopped = threading.Event()
+        self.logger = logging.getLogger(
+            "CaptureEngine - %s" %iface
+        )
+        return
+
+    @classmethod
+    def get_engine(cls, iface):
+        """
+        Returns the shared engine for the interface, it is
+        created on the first call.
+
+        :param iface:       The interface or capture file
+        :return:
+        """
+
+        with cls.__engines_lock:
+            if iface not in cls.__engines.keys():
+                cls.__engines[iface] = cls(iface)
+            return cls.__engines[iface]
+
+    def register(self, probe):
+        """
+        Registers a probe to the engine. The probe will receive
+        every packet captured on the interface.
+
+        :param probe:       The network probe
+        :return:
+        """
+
+        with self._lock:
+
+            # Copy on write, the capture loop never takes the lock
+            if probe not in self._probes:
+                self._registry[probe] = {
+                    'probe'     : probe,
+                    'layers'    : get_layer_names(probe.layers),
+                    'coarse'    : get_layer_names(probe.layers) & RAW_LAYERS,
+                    'decoder'   : getattr(probe, 'decoder', DECODE_SCAPY),
+                    'batched'   : getattr(probe, 'batched', False),
+                    'mask'      : get_layer_mask(probe.layers),
+                    'filter'    : compile_layers(probe.layers),
+                    'snaplen'   : getattr(probe, 'snaplen', None) or \
+                                  SNAPLEN_MAX,
+                    'seen'      : read_iface_packets(self._iface),
+                    'captured'  : self._packet_count,
+                    'matched'   : 0,
+                    'reported'  : 0,
+                    'report'    : probe.report,
+                    'process'   : probe.process,
+                    'process_batch' : getattr(probe, 'process_batch', None),
+                    'ring'      : None
+                }
+                if self._queue_size > 0:
+                    self.__start_worker(self._registry[probe])
+                self._probes = self._probes + [probe]
+                self._registered = time.time()
+                self.__update_dispatcher()
+                self.__update_filter()
+        self.logger.info(
+            "[+] Registered probe: %s" %probe.name
+        )
+        return
+
+    def unregister(self, probe):
+        """
+        Removes a probe from the engine. The capture is stopped
+        when the last probe leaves.
+
+        :param probe:       The network probe
+        :return:
+        """
+
+        with self._lock:
+            self._probes = [
+                registered for registered in self._probes
+                if registered is not probe
+            ]
+            record = self._registry.pop(probe, None)
+            if record is not None and record['ring'] is not None:
+                record['ring'].close()
+            self.__update_dispatcher()
+            self.__update_filter()
+            empty = len(self._probes) == 0
+
+        self.logger.info(
+            "[-] Unregistered probe: %s" %probe.name
+        )
+        if empty:
+            self.stop()
+        return
+
+    def get_probes(self):
+        """
+        Returns the registered probes.
+
+        :return:
+        """
+        return list(self._probes)
+
+    def get_packet_count(self):
+        """
+        Returns the number of packets captured on the iface.
+
+        :return:
+        """
+        return self._packet_count
+
+    def set_decode(self, mode):
+        """
+        Sets the decode mode of the engine. In raw mode the headers
+        are decoded from the captured bytes and only the probes that
+        cannot consume a header record get a scapy packet. Once a
+        probe asks for the raw mode the engine stays in raw mode.
+
+        :param mode:        The decode mode [scapy/raw]
+        :return:
+        """
+
+        if mode not in DECODE_MODES:
+            self.logger.info(
+                "[-] Unknown decode mode: %s" %mode
+            )
+            return
+
+        with self._lock:
+            if mode == self._decode or mode == DECODE_SCAPY:
+                return
+            self._decode = mode
+            self.__update_dispatcher()
+
+        self.logger.info(
+            "[+] Decode mode: %s" %mode
+        )
+        if self._running.is_set():
+            self.restart()
+        return
+
+    def set_batch(self, size, interval):
+        """
+        Sets the batch mode of the engine. The frames are collected
+        until the batch holds size frames or is older than interval
+        and the batch capable probes get the whole batch. The batch
+        mode needs NumPy and the raw decode mode. The largest size
+        and the shortest interval asked for are kept.
+
+        :param size:        The frames in a batch, 0 to not batch
+        :param interval:    The maximum age of a batch (ms)
+        :return:
+        """
+
+        if size <= 0:
+            return
+        if not batch_available():
+            self.logger.info(
+                "[-] NumPy is not available, batch mode disabled."
+            )
+            return
+
+        with self._lock:
+            if self._collector is not None:
+                size = max(size, self._collector.get_size())
+                interval = min(interval, self._collector.get_interval())
+            self._collector = BatchCollector(size, interval)
+            self.__update_dispatcher()
+
+        self.logger.info(
+            "[+] Batch mode: %d frames / %d ms" %(size, interval)
+        )
+        self.set_decode(DECODE_RAW)
+        return
+
+    def set_capture(self, backend):
+        """
+        Sets the capture backend of the engine. The mmap backend reads
+        the frames from a TPACKET_V3 ring, it is Linux only and needs
+        the raw decode mode. Once a probe asks for the mmap backend
+        the engine stays on it.
+
+        :param backend:     The capture backend [socket/mmap]
+        :return:
+        """
+
+        if backend not in CAPTURE_BACKENDS:
+            self.logger.info(
+                "[-] Unknown capture backend: %s" %backend
+            )
+            return
+        if backend == CAPTURE_SOCKET or backend == self._backend:
+            return
+        if not ring_available():
+            self.logger.info(
+                "[-] Packet sockets are not available, mmap disabled."
+            )
+            return
+
+        self._backend = backend
+        self.logger.info(
+            "[+] Capture backend: %s" %backend
+        )
+        self.set_decode(DECODE_RAW)
+        if self._running.is_set():
+            self.restart()
+        return
+
+    def set_replay(self, mode):
+        """
+        Replays the engine source as a pcap or pcapng file instead
+        of capturing on an interface. The engine of a file is shared
+        by the probes pointed at it, the capture ends at the end of
+        the file.
+
+        :param mode:        The replay mode [fast/timed]
+        :return:
+        """
+
+        if mode not in REPLAY_MODES:
+            self.logger.info(
+                "[-] Unknown replay mode: %s" %mode
+            )
+            return
+        if mode == self._replay:
+            return
+
+        self._replay = mode
+        self.logger.info(
+            "[+] Replay mode: %s" %mode
+        )
+        return
+
+    def get_replay(self):
+        """
+        Returns the replay report, None until a replay has ended.
+
+        :return:
+        """
+        return self._replay_report
+
+    def set_fanout(self, group):
+        """
+        Joins the capture socket to a flow hashed fanout group. The
+        engines of the group, one per capture process, share the
+        frames of the interface and each flow goes to one engine.
+
+        :param group:       The fanout group id
+        :return:
+        """
+
+        if group == self._fanout:
+            return
+        if not ring_available():
+            self.logger.info(
+                "[-] Packet sockets are not available, fanout disabled."
+            )
+            return
+
+        self._fanout = group
+        self.logger.info(
+            "[+] Fanout group: %d" %group
+        )
+        if self._running.is_set():
+            self.restart()
+        return
+
+    def set_sampling(self, rate, mode=SAMPLE_FIXED, budget=0.8):
+        """
+        Sets the packet sampling of the engine, one frame in rate is
+        dispatched to the probes. In the adaptive mode the rate is
+        raised when the probes use more than the budget of the
+        capture thread and lowered when the load drops. The engine
+        keeps one sampler, the largest rate, the adaptive mode and
+        the smallest budget asked for are kept in it.
+
+        :param rate:        The sampling rate, 1 in rate frames
+        :param mode:        The sampling mode [fixed/adaptive]
+        :param budget:      The busy fraction allowed (adaptive)
+        :return:
+        """
+
+        if mode not in SAMPLE_MODES:
+            self.logger.info(
+                "[-] Unknown sampling mode: %s" %mode
+            )
+            return
+        if rate <= 1 and mode == SAMPLE_FIXED:
+            return
+
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = Sampler(rate, mode, budget)
+            else:
+                self._sampler.configure(rate, mode, budget)
+            sampler = self._sampler
+
+        self.logger.info(
+            "[+] Sampling: 1 in %d (%s)"
+            %(sampler.get_rate(), sampler.get_mode())
+        )
+        return
+
+    def set_queue(self, size):
+        """
+        Moves the correlation out of the capture thread. Each probe
+        gets a bounded ring and a worker thread, the capture thread
+        puts the frames of the probe in its ring and the worker
+        correlates them. A full ring drops the frames. The largest
+        size asked for is kept.
+
+        :param size:        The slots of a ring, 0 to not queue
+        :return:
+        """
+
+        if size <= self._queue_size:
+            return
+
+        with self._lock:
+            self._queue_size = size
+            for record in self._registry.values():
+                if record['ring'] is None:
+                    self.__start_worker(record)
+
+        self.logger.info(
+            "[+] Correlation queues: %d slots" %size
+        )
+        return
+
+    def set_report(self, interval, records):
+        """
+        Sets the report scheduler of the engine, a report round is
+        fired every interval or once records frames have been
+        dispatched, whichever comes first. The shortest interval
+        and the smallest threshold asked for are kept.
+
+        :param interval:    The time between two rounds (seconds)
+        :param records:     The frames that trigger a round
+        :return:
+        """
+
+        with self._lock:
+            if self._report_limits is not None:
+                interval = min(interval, self._report_limits[0])
+                records = min(records, self._report_limits[1])
+            self._report_limits = (interval, records)
+            self._scheduler = ReportScheduler(interval, records)
+
+        self.logger.info(
+            "[+] Reports: every %s sec or %d frames" %(interval, records)
+        )
+        return
+
+    def get_capture(self):
+        """
+        Returns the capture backend of the engine.
+
+        :return:
+        """
+        return self._backend
+
+    def get_decode(self):
+        """
+        Returns the decode mode of the engine.
+
+        :return:
+        """
+        return self._decode
+
+    def get_filter(self):
+        """
+        Returns the filter installed on the capture socket.
+
+        :return:
+        """
+        return self._filter
+
+    def get_snaplen(self):
+        """
+        Returns the bytes of a frame captured.
+
+        :return:
+        """
+        return self._snaplen
+
+    def get_statistics(self, probe):
+        """
+        Returns the filtering report of a probe since it was
+        registered. The kernel counts the filtered frames per
+        socket, thus the kernel figure is shared by the probes of
+        the iface and the remainder was rejected by the probe. The
+        sampling is counted since the last report of the probe.
+
+        :param probe:       The network probe
+        :return:
+        """
+
+        record = self._registry.get(probe)
+        if record is None:
+            return None
+
+        captured = self._packet_count - record['captured']
+        seen = read_iface_packets(self._iface)
+        if seen is None or record['seen'] is None:
+            seen = kernel_filtered = filtered = None
+        else:
+            seen -= record['seen']
+            kernel_filtered = max(seen - captured, 0)
+            filtered = max(seen - record['matched'], 0)
+
+        return {
+            'filter'            : record['filter'],
+            'socket_filter'     : self._filter,
+            'snaplen'           : self._snaplen,
+            'seen'              : seen,
+            'captured'          : captured,
+            'matched'           : record['matched'],
+            'kernel_filtered'   : kernel_filtered,
+            'filtered'          : filtered,
+            'backend'           : self._backend,
+            'kernel'            : dict(self._kernel),
+            'replay'            : self._replay_report,
+            'fanout'            : self._fanout,
+            'sampling'          : self._sampler.get_statistics(probe)
+                                  if self._sampler is not None else None,
+            'queue'             : record['ring'].get_statistics()
+                                  if record['ring'] is not None else None,
+            'reports'           : self._scheduler.get_statistics()
+        }
+
+    def run(self):
+        """
+        Runs the capture loop. Only the first caller captures,
+        the other callers block until the capture has ended.
+
+        :return:
+        """
+
+        with self._lock:
+            owner = not self._running.is_set()
+            if owner:
+                self._stopped.clear()
+                self._running.set()
+
+        # Someone is already capturing on this iface
+        if not owner:
+            self._stopped.wait()
+            return
+
+        self.logger.info(
+            "[+] Starting the capture on: %s" %self._iface
+        )
+        try:
+            self._capture()
+        finally:
+            self._running.clear()
+            self._stopped.set()
+            self.logger.info(
+                "[-] Stopped the capture on: %s" %self._iface
+            )
+        return
+
+    def stop(self):
+        """
+        Stops the capture loop.
+
+        :return:
+        """
+        self._running.clear()
+        if self._source is not None:
+            self._source.stop()
+        return
+
+    def restart(self):
+        """
+        Restarts the capture loop, i.e. to install a new filter.
+
+        :return:
+        """
+        self._restart = True
+        return
+
+    def is_running(self):
+        """
+        Returns true if the capture loop is running.
+
+        :return:
+        """
+        return self._running.is_set()
+
+    def _capture(self):
+        """
+        This is the capture backend, packets are never stored
+        by the sniffer, they are only dispatched. The sniffer is
+        restarted when the socket filter changes.
+
+        :return:
+        """
+
+        if self._replay is not None:
+            self._capture_replay()
+            return
+
+        while self._running.is_set():
+            self._restart = False
+
+            if self._backend == CAPTURE_MMAP:
+                self._capture_mmap()
+                continue
+
+            if self._decode == DECODE_RAW:
+                self._capture_raw()
+                continue
+
+            # The sniffer returns on every timeout to check the flags
+            listener = self.__open_listener()
+            try:
+                while self._running.is_set() and not self._restart:
+                    sniff(
+                        opened_socket = listener,
+                        prn = self._dispatch,
+                        store = False,
+                        timeout = CAPTURE_POLL_TIMEOUT,
+                        stop_filter = lambda packet : self._restart or \
+                            not self._running.is_set()
+                    )
+                    self.__poll_report()
+            finally:
+                listener.close()
+        return
+
+    def _capture_raw(self):
+        """
+        This is the raw capture backend, the frames are read as
+        bytes from the capture socket and are not dissected.
+
+        :return:
+        """
+
+        listener = self.__open_listener()
+        try:
+            while self._running.is_set() and not self._restart:
+                ready, _, _ = select.select(
+                    [listener], [], [], CAPTURE_POLL_TIMEOUT
+                )
+                if not ready:
+                    self.__poll_batch(False)
+                    self.__poll_report()
+                    continue
+
+                data, timestamp, length = recv_frame(
+                    listener.ins, self._snaplen
+                )
+                self._dispatch_raw(data, timestamp, length)
+        finally:
+            listener.close()
+            self.__poll_batch(True)
+        return
+
+    def _capture_mmap(self):
+        """
+        This is the memory mapped capture backend, the frames are
+        read in place from the blocks of the ring.
+
+        :return:
+        """
+
+        ring = MmapRing(
+            self._iface,
+            CAPTURE_RING_BLOCK_SIZE,
+            CAPTURE_RING_BLOCKS,
+            CAPTURE_RING_FRAME_SIZE,
+            CAPTURE_RING_TIMEOUT,
+            program = self.__compile_program(),
+            fanout = self._fanout,
+            promisc = conf.sniff_promisc
+        )
+        try:
+            while self._running.is_set() and not self._restart:
+                read = False
+                for data, timestamp, length in ring.read(
+                        CAPTURE_POLL_TIMEOUT):
+                    read = True
+                    self._dispatch_raw(data, timestamp, length)
+                    del data
+
+                if not read:
+                    self.__poll_batch(False)
+                    self.__poll_report()
+                self.__update_kernel(ring)
+        finally:
+            self.__update_kernel(ring)
+            ring.close()
+            self.__poll_batch(True)
+        return
+
+    def _capture_replay(self):
+        """
+        This is the replay capture backend, the frames are read
+        from the capture file. The replay waits for the probes of
+        the file to be registered, then runs to the end of the file.
+
+        :return:
+        """
+
+        while self._running.is_set() and \
+                time.time() - self._registered < CAPTURE_REPLAY_SETTLE:
+            time.sleep(CAPTURE_REPLAY_SETTLE / 10.0)
+
+        replay = self._source = PcapReplay(self._iface, self._replay)
+        try:
+            for data, timestamp, length in replay.read():
+                if not self._running.is_set():
+                    break
+
+                if self._decode == DECODE_RAW:
+                    self._dispatch_raw(data, timestamp, length)
+                    continue
+
+                packet = Ether(data)
+                packet.time = timestamp
+                self._dispatch(packet)
+            self.__poll_batch(True)
+
+            # The probes report once their queues are correlated
+            for record in list(self._registry.values()):
+                if record['ring'] is not None:
+                    record['ring'].join()
+        finally:
+            self._replay_report = replay.get_statistics()
+            self._source = None
+
+        report = self._replay_report
+        self.logger.info(
+            "[+] Replayed %d packets in %.3f sec: %.0f packets/sec, "
+            "%.2f usec/packet, peak RSS %s KB" %(
+                report['packets'],
+                report['seconds'],
+                report['rate'],
+                report['usec'],
+                report['peak_rss']
+            )
+        )
+        return
+
+    def _dispatch(self, packet):
+        """
+        Hands the dissected packet to every probe interested in
+        its layers, if it is sampled.
+
+        :param packet:      The packet that was sniffed
+        :return:
+        """
+
+        self._packet_count += 1
+
+        sampler = self._sampler
+        if sampler is None:
+            self.__dispatch(packet)
+        elif sampler.admit():
+            start = default_timer()
+            self.__dispatch(packet)
+            sampler.account(start)
+
+        if self._scheduler.tick():
+            self.__report()
+        return
+
+    def __dispatch(self, packet):
+        """
+        Hands the dissected packet to every probe interested in
+        its layers. The probes are found with one table lookup.
+
+        :param packet:      The packet that was sniffed
+        :return:
+        """
+
+        for record in self._dispatcher.lookup(
+                get_packet_layers(packet)):
+            record['matched'] += 1
+            record['process'](packet)
+        return
+
+    def _dispatch_raw(self, data, timestamp, length=None):
+        """
+        Hands a captured frame to the probes, if it is sampled.
+
+        :param data:        The frame bytes
+        :param timestamp:   The capture time
+        :param length:      The length on the wire, if snapped
+        :return:
+        """
+
+        self._packet_count += 1
+
+        sampler = self._sampler
+        if sampler is None:
+            self.__dispatch_raw(data, timestamp, length)
+        elif sampler.admit():
+            start = default_timer()
+            self.__dispatch_raw(data, timestamp, length)
+            sampler.account(start)
+
+        if self._scheduler.tick():
+            self.__report()
+        return
+
+    def __dispatch_raw(self, data, timestamp, length=None):
+        """
+        Decodes the headers of a frame and hands the header record
+        to the probes interested in its layers. The frame is only
+        dissected by scapy if a deep parsing probe may want it.
+
+        :param data:        The frame bytes
+        :param timestamp:   The capture time
+        :param length:      The length on the wire, if snapped
+        :return:
+        """
+
+        # Collect the frame for the batch probes
+        if self._collector is not None and self._batch_records:
+            batch = self._collector.add(data, timestamp, length)
+            if batch is not None:
+                self._dispatch_batch(batch)
+
+        if not self._per_frame:
+            return
+
+        # The queued records outlive the blocks of the mmap ring
+        if self._queue_size > 0 and not isinstance(data, bytes):
+            data = bytes(data)
+
+        record = decode(data, timestamp, length)
+
+        for registered in self._raw_dispatcher.lookup(
+                record.layers):
+            registered['matched'] += 1
+            registered['process'](record)
+
+        # Fallback to scapy for the deep parsing probes
+        if not self._deep_gate.lookup(record.layers):
+            return
+
+        packet = Ether(bytes(data))
+        packet.time = timestamp
+        for registered in self._dispatcher.lookup(
+                get_packet_layers(packet)):
+            registered['matched'] += 1
+            registered['process'](packet)
+        return
+
+    def _dispatch_batch(self, batch):
+        """
+        Hands the rows of a batch to the batch probes, each probe
+        gets the rows that hold its layers.
+
+        :param batch:       The frame batch
+        :return:
+        """
+
+        for registered in self._batch_records:
+            rows = batch.select(registered['mask'])
+            if rows.count == 0:
+                continue
+            registered['matched'] += rows.count
+            registered['process_batch'](rows)
+        return
+
+    def __start_worker(self, record):
+        """
+        Puts a ring between the capture thread and a probe, the
+        deliveries of the probe go to its ring and its worker
+        correlates them. The frames a full ring drops are a load
+        signal of the adaptive sampling.
+
+        :param record:      The probe record
+        :return:
+        """
+
+        ring = BoundedRing(self._queue_size)
+        probe = record['probe']
+        process = probe.process
+        process_batch = record['process_batch']
+        report = probe.report
+
+        record['ring'] = ring
+        record['process'] = lambda item : \
+            ring.put((process, item)) or self.__add_drops(1)
+        record['process_batch'] = lambda rows : \
+            ring.put((process_batch, rows)) or self.__add_drops(rows.count)
+        record['report'] = lambda : ring.put((lambda _ : report(), None))
+        RingWorker(ring, probe.name).start()
+        return
+
+    def __add_drops(self, drops):
+        """
+        Adds the frames a probe ring dropped to the load of the
+        adaptive sampling, the correlation is falling behind.
+
+        :param drops:       The frames dropped
+        :return:
+        """
+
+        sampler = self._sampler
+        if sampler is not None:
+            sampler.add_drops(drops)
+        return
+
+    def __update_kernel(self, ring):
+        """
+        Updates the kernel counters from the ring.
+
+        :param ring:        The mmap ring
+        :return:
+        """
+
+        counts = ring.read_statistics()
+        for key, value in counts.items():
+            self._kernel[key] += value
+
+        # The drops are a load signal of the adaptive sampling
+        if self._sampler is not None and counts['drops']:
+            self._sampler.add_drops(counts['drops'])
+        return
+
+    def __report(self):
+        """
+        Fires a report round, every probe that correlated frames
+        since its last report reports. A queued probe reports in
+        its worker, after the frames already in its ring.
+
+        :return:
+        """
+
+        reports = 0
+        for probe in self._probes:
+            record = self._registry.get(probe)
+            if record is None or record['matched'] == record['reported']:
+                continue
+
+            # A full ring drops the report, it is retried next round
+            matched = record['matched']
+            if record['report']() is False:
+                continue
+            record['reported'] = matched
+            reports += 1
+        self._scheduler.done(reports)
+        return
+
+    def __poll_report(self):
+        """
+        Fires the report round when the capture is idle and the
+        interval has passed.
+
+        :return:
+        """
+
+        if self._scheduler.is_due():
+            self.__report()
+        return
+
+    def __poll_batch(self, flush):
+        """
+        Releases the pending batch if it is too old, or at once
+        when flushing.
+
+        :param flush:       True to release the batch at once
+        :return:
+        """
+
+        collector = self._collector
+        if collector is None:
+            return
+
+        batch = collector.flush() if flush else collector.poll()
+        if batch is not None:
+            self._dispatch_batch(batch)
+        return
+
+    def __update_dispatcher(self):
+        """
+        Rebuilds the dispatch tables from the registered probes.
+        In scapy mode every probe gets a scapy packet, in raw mode
+        only the probes that cannot consume a header record do.
+
+        :return:
+        """
+
+        records = [
+            self._registry[probe]
+            for probe in self._probes
+        ]
+        raw = []
+        batched = []
+        deep = records
+
+        if self._decode == DECODE_RAW:
+            if self._collector is not None:
+                batched = [
+                    record for record in records
+                    if record['batched'] and record['mask'] is not None
+                ]
+            raw = [
+                record for record in records
+                if record['decoder'] == DECODE_RAW and
+                record not in batched
+            ]
+            deep = [
+                record for record in records
+                if record['decoder'] != DECODE_RAW
+            ]
+
+        self._raw_dispatcher.build(raw)
+        self._deep_gate.build(deep)
+        self._dispatcher.build(deep)
+        self._batch_records = tuple(batched)
+        self._per_frame = len(raw) + len(deep) > 0
+        return
+
+    def __open_listener(self):
+        """
+        Opens the capture socket with the socket filter and the
+        snaplen. The socket joins the fanout group of the engine,
+        if any.
+
+        :return:
+        """
+
+        listener = conf.L2listen(iface = self._iface)
+        attach_program(listener.ins, self.__compile_program())
+
+        if self._fanout is not None:
+            join_fanout(listener.ins, self._fanout)
+        return listener
+
+    def __compile_program(self):
+        """
+        Compiles the socket filter and the snaplen into a BPF
+        program. The filter is compiled by libpcap, without it the
+        program only cuts the frames to the snaplen and the dispatch
+        table does the filtering.
+
+        :return:
+        """
+
+        try:
+            return compile_program(self._filter, self._snaplen, self._iface)
+        except (ImportError, OSError, Scapy_Exception) as error:
+            self.logger.info(
+                "[-] Cannot compile the socket filter: %s" %error
+            )
+        return compile_program(None, self._snaplen)
+
+    def __update_filter(self):
+        """
+        Compiles the socket filter and the snaplen from the
+        registered probes. The snaplen is the largest one of the
+        probes, a probe that reads the whole frame sets it to the
+        maximum. The capture is restarted to install the new filter.
+
+        :return:
+        """
+
+        records = [
+            self._registry[probe]
+            for probe in self._probes
+        ]
+        expression = combine_filters(
+            [record['filter'] for record in records]
+        )
+        snaplen = max(
+            [record['snaplen'] for record in records] or [SNAPLEN_MAX]
+        )
+        if expression == self._filter and snaplen == self._snaplen:
+            return
+
+        self._filter = expression
+        self._snaplen = snaplen
+        self.logger.info(
+            "[+] Socket filter: %s, snaplen: %d" %(expression, snaplen)
+        )
+        if self._running.is_set():
+            self.restart()
+        return
@@ -0,0 +1,247 @@
+"""
+
+    :Filter:
+    ==========
+
+    :
+    This is the BPF filter compiler. The probes declare the layers
+    they need and we translate these declarations into a BPF
+    expression that is installed on the capture socket, thus the
+    irrelevant traffic never leaves the kernel. The accepting
+    returns of the compiled program are set to the snaplen of the
+    probes, thus only the bytes they read are copied to user space.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import socket
+import ctypes
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The BPF primitives for each scapy layer name.
+# A layer mapped to None does not restrict the capture.
+BPF_PRIMITIVES = {
+    'Ether'     : None,
+    'IP'        : 'ip',
+    'IPv6'      : 'ip6',
+    'ARP'       : 'arp',
+    'ICMP'      : 'icmp',
+    'TCP'       : 'tcp',
+    'UDP'       : 'udp',
+    'DNS'       : '(udp port 53 or tcp port 53)',
+    'BOOTP'     : '(udp port 67 or udp port 68)',
+    'DHCP'      : '(udp port 67 or udp port 68)',
+    'NTP'       : 'udp port 123',
+    'SNMP'      : '(udp port 161 or udp port 162)',
+}
+
+# The snaplen of the probes that only read the headers. It holds an
+# Ethernet header, two VLAN tags, an IPv4 header with options and a
+# TCP header without options.
+SNAPLEN_HEADERS     = 128
+
+# The snaplen of the probes that read the whole frame
+SNAPLEN_MAX         = 262144
+
+# The BPF return instruction (BPF_RET | BPF_K)
+BPF_RET_K           = 0x06
+
+# The socket option to attach a BPF program
+SO_ATTACH_FILTER    = 26
+
+class _SockFilter(ctypes.Structure):
+    """
+    struct sock_filter
+    """
+
+    _fields_        = [
+        ('code', ctypes.c_ushort),
+        ('jt', ctypes.c_ubyte),
+        ('jf', ctypes.c_ubyte),
+        ('k', ctypes.c_uint32)
+    ]
+
+class _SockFprog(ctypes.Structure):
+    """
+    struct sock_fprog
+    """
+
+    _fields_        = [
+        ('len', ctypes.c_ushort),
+        ('filter', ctypes.POINTER(_SockFilter))
+    ]
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def add_primitive(layer, primitive):
+    """
+    This is the public access method to add a BPF primitive
+    for a layer to the filter compiler.
+
+    :param layer:           The layer name
+    :param primitive:       The BPF primitive, None to not filter
+    :return:
+    """
+
+    BPF_PRIMITIVES[layer] = primitive
+    return
+
+def compile_layers(layers):
+    """
+    Compiles the layers of a probe into a BPF expression.
+    All layers must be present, thus the primitives are
+    joined with an and. An unknown layer cannot be filtered in
+    the kernel, it is left to the probe.
+
+    :param layers:          The layers of the probe
+    :return:                The expression, None if no filter
+    """
+
+    # Container
+    primitives = []
+
+    for layer in layers:
+
+        # We accept both layer classes and layer names
+        name = getattr(layer, '__name__', layer)
+        primitive = BPF_PRIMITIVES.get(name)
+
+        if primitive is not None and \
+                primitive not in primitives:
+            primitives.append(primitive)
+
+    if len(primitives) == 0:
+        return None
+    return " and ".join(primitives)
+
+def combine_filters(filters):
+    """
+    Combines the probe expressions into one socket filter.
+    A packet is captured if any probe wants it, thus the
+    expressions are joined with an or. If one of the probes
+    needs everything, no filter can be installed.
+
+    :param filters:         The probe expressions
+    :return:                The expression, None if no filter
+    """
+
+    # Container
+    expressions = []
+
+    for expression in filters:
+
+        # One of the probes wants every frame
+        if expression is None:
+            return None
+
+        if expression not in expressions:
+            expressions.append(expression)
+
+    if len(expressions) == 0:
+        return None
+    elif len(expressions) == 1:
+        return expressions[0]
+    return " or ".join(
+        "(%s)" %expression for expression in expressions
+    )
+
+def read_iface_packets(iface):
+    """
+    Reads the number of frames the kernel has seen on the
+    interface, in both directions. This is used to count the
+    frames removed by the socket filter.
+
+    :param iface:           The interface
+    :return:                The frame count, None if unavailable
+    """
+
+    # Container
+    count = 0
+
+    for direction in ('rx_packets', 'tx_packets'):
+        try:
+            with open(
+                '/sys/class/net/%s/statistics/%s' %(iface, direction)
+            ) as handle:
+                count += int(handle.read())
+        except (IOError, OSError, ValueError):
+            return None
+    return count
+
+def compile_program(expression, snaplen=SNAPLEN_MAX, iface=None):
+    """
+    Compiles a BPF expression into a program with the libpcap of
+    scapy, the accepting returns are set to the snaplen. Without an
+    expression the program accepts every frame up to the snaplen.
+
+    :param expression:      The expression, None to not filter
+    :param snaplen:         The bytes of a frame to capture
+    :param iface:           The interface to compile for
+    :return:                The (code, jt, jf, k) instructions
+    """
+
+    if expression is None:
+        return [(BPF_RET_K, 0, 0, snaplen)]
+
+    from scapy.arch.common import compile_filter
+    program = compile_filter(expression, iface)
+
+    # Container
+    instructions = []
+
+    for index in range(program.bf_len):
+        instruction = program.bf_insns[index]
+        k = instruction.k
+        if instruction.code == BPF_RET_K and k != 0:
+            k = min(k, snaplen)
+        instructions.append(
+            (instruction.code, instruction.jt, instruction.jf, k)
+        )
+    return instructions
+
+def attach_program(sock, instructions):
+    """
+    Attaches a BPF program to a socket, it replaces the program
+    attached before.
+
+    :param sock:            The socket
+    :param instructions:    The (code, jt, jf, k) instructions
+    :return:
+    """
+
+    filters = (_SockFilter * len(instructions))(*[
+        _SockFilter(*instruction) for instruction in instructions
+    ])
+    program = _SockFprog(len(instructions), filters)
+    sock.setsockopt(
+        socket.SOL_SOCKET,
+        SO_ATTACH_FILTER,
+        ctypes.string_at(ctypes.addressof(program), ctypes.sizeof(program))
+    )
+    return
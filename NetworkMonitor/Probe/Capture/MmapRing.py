@@ -0,0 +1,477 @@
+"""
+
+    :MmapRing:
+    ==========
+
+    :
+    This is the Linux memory mapped capture backend. It sets up an
+    AF_PACKET socket with a TPACKET_V3 receive ring, the kernel fills
+    whole blocks of frames in the ring and we read them in place,
+    without a syscall or a copy per frame. The kernel drop counters
+    are read from PACKET_STATISTICS. The packet sockets can join a
+    PACKET_FANOUT group to spread the flows over several processes,
+    and hold a promiscuous membership of the interface like the
+    scapy sniffer.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import mmap
+import time
+import select
+import socket
+import struct
+import logging
+
+from NetworkMonitor.Probe.Capture.Filter \
+    import attach_program
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The capture backends
+CAPTURE_SOCKET          = 'socket'
+CAPTURE_MMAP            = 'mmap'
+CAPTURE_BACKENDS        = [
+    CAPTURE_SOCKET,
+    CAPTURE_MMAP
+]
+
+# The linux packet socket options (linux/if_packet.h)
+SOL_PACKET              = 263
+PACKET_ADD_MEMBERSHIP   = 1
+PACKET_DROP_MEMBERSHIP  = 2
+PACKET_RX_RING          = 5
+PACKET_STATISTICS       = 6
+PACKET_AUXDATA          = 8
+PACKET_VERSION          = 10
+PACKET_FANOUT           = 18
+TPACKET_V3              = 2
+ETH_P_ALL               = 0x0003
+
+# The promiscuous membership type
+PACKET_MR_PROMISC       = 1
+
+# The socket timestamp option (asm-generic/socket.h)
+SO_TIMESTAMPNS          = 35
+
+# The fanout mode, the flow hash keeps a flow on one socket and
+# the fragments are defragmented before they are hashed
+PACKET_FANOUT_HASH      = 0
+PACKET_FANOUT_FLAG_DEFRAG = 0x8000
+
+# The block status
+TP_STATUS_KERNEL        = 0
+TP_STATUS_USER          = 1
+
+# The auxiliary data status
+TP_STATUS_VLAN_VALID    = 1 << 4
+TP_STATUS_VLAN_TPID_VALID = 1 << 6
+ETH_P_8021Q             = 0x8100
+
+# struct tpacket_req3
+_TPACKET_REQ3           = struct.Struct('=7I')
+
+# The fanout option argument
+_FANOUT_ARG             = struct.Struct('=I')
+
+# struct packet_mreq
+_PACKET_MREQ            = struct.Struct('=iHH8s')
+
+# struct tpacket_auxdata and struct timespec
+_TPACKET_AUXDATA        = struct.Struct('=IIIHHHH')
+_TIMESPEC               = struct.Struct('=qq')
+_ANCILLARY_SPACE        = socket.CMSG_SPACE(_TPACKET_AUXDATA.size) + \
+                          socket.CMSG_SPACE(_TIMESPEC.size) \
+                          if hasattr(socket, 'CMSG_SPACE') else 0
+
+# An 802.1Q tag
+_VLAN_TAG               = struct.Struct('!HH')
+
+# struct tpacket_stats_v3
+_TPACKET_STATS_V3       = struct.Struct('=3I')
+
+# struct tpacket_block_desc, up to hdr.bh1.offset_to_first_pkt
+_BLOCK_STATUS           = struct.Struct('=I')
+_BLOCK_STATUS_OFFSET    = 8
+_BLOCK_HEADER           = struct.Struct('=III')
+
+# struct tpacket3_hdr, up to hv1.tp_vlan_tpid
+_FRAME_HEADER           = struct.Struct('=IIIIIIHHIIH')
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def is_available():
+    """
+    Returns true if the packet sockets are supported.
+
+    :return:
+    """
+    return hasattr(socket, 'AF_PACKET')
+
+def join_fanout(sock, group):
+    """
+    Joins a bound packet socket to a flow hashed fanout group,
+    the frames of the interface are spread over the sockets of
+    the group and the frames of a flow always go to one socket.
+
+    :param sock:            The bound packet socket
+    :param group:           The fanout group id (16 bits)
+    :return:
+    """
+
+    # The flags overflow a signed int, the option is packed
+    sock.setsockopt(
+        SOL_PACKET,
+        PACKET_FANOUT,
+        _FANOUT_ARG.pack(
+            (group & 0xffff) |
+            ((PACKET_FANOUT_HASH | PACKET_FANOUT_FLAG_DEFRAG) << 16)
+        )
+    )
+    return
+
+def recv_frame(sock, size):
+    """
+    Receives a frame from a packet socket with its auxiliary data.
+    The frame may be cut short by the snaplen of the socket filter,
+    the auxiliary data holds its length on the wire. The VLAN tag
+    stripped by the kernel is put back in the frame.
+
+    :param sock:            The packet socket, with PACKET_AUXDATA and
+                            SO_TIMESTAMPNS on
+    :param size:            The largest frame to receive
+    :return:                The frame, its time, its length on the wire
+    """
+
+    data, ancillary, flags, address = sock.recvmsg(size, _ANCILLARY_SPACE)
+    timestamp = None
+    length = len(data)
+
+    for level, kind, value in ancillary:
+        if level == socket.SOL_SOCKET and kind == SO_TIMESTAMPNS and \
+                len(value) >= _TIMESPEC.size:
+            seconds, nanoseconds = _TIMESPEC.unpack_from(value)
+            timestamp = seconds + nanoseconds / 1e9
+            continue
+        if level != SOL_PACKET or kind != PACKET_AUXDATA or \
+                len(value) < _TPACKET_AUXDATA.size:
+            continue
+
+        status, length, snaplen, mac, net, tci, tpid = \
+            _TPACKET_AUXDATA.unpack_from(value)
+        if status & TP_STATUS_VLAN_VALID:
+            if not status & TP_STATUS_VLAN_TPID_VALID:
+                tpid = ETH_P_8021Q
+            data = data[:12] + _VLAN_TAG.pack(tpid, tci) + data[12:]
+            length += _VLAN_TAG.size
+    return data, timestamp or time.time(), length
+
+class MmapRing(object):
+    """
+    This is the TPACKET_V3 receive ring of an interface. The ring
+    is made of blocks, the kernel hands a block to user space when
+    it is full or when its timeout retires it. Frames are read in
+    place as memoryviews, they are only valid until the block is
+    handed back to the kernel.
+    """
+
+    # The interface
+    _iface          = None
+
+    # The packet socket
+    _socket         = None
+
+    # The mapped ring
+    _ring           = None
+
+    # The block geometry
+    _block_size     = 0
+    _block_count    = 0
+
+    # The block to read next
+    _block          = 0
+
+    # The kernel counters
+    _statistics     = None
+
+    # The promiscuous membership, None when not promiscuous
+    _membership     = None
+
+    def __init__(self, iface, block_size, block_count, frame_size,
+                 timeout, program=None, fanout=None, promisc=False):
+        """
+        This is the constructor for the class, it opens the socket
+        and maps the ring.
+
+        :param iface:       The interface to capture on
+        :param block_size:  The block size, a multiple of the page size
+        :param block_count: The number of blocks
+        :param frame_size:  The frame slot size
+        :param timeout:     The block retire timeout (ms)
+        :param program:     The BPF program instructions
+        :param fanout:      The fanout group to join, None to not join
+        :param promisc:     Puts the interface in promiscuous mode
+        :return:
+        """
+
+        self._iface = iface
+        self._block_size = block_size
+        self._block_count = block_count
+        self._block = 0
+        self._statistics = {
+            'packets'   : 0,
+            'drops'     : 0,
+            'freezes'   : 0
+        }
+        self.logger = logging.getLogger(
+            "MmapRing - %s" %iface
+        )
+
+        self._socket = socket.socket(
+            socket.AF_PACKET,
+            socket.SOCK_RAW,
+            socket.htons(ETH_P_ALL)
+        )
+        try:
+            self._socket.setsockopt(
+                SOL_PACKET, PACKET_VERSION, TPACKET_V3
+            )
+            self._socket.setsockopt(
+                SOL_PACKET,
+                PACKET_RX_RING,
+                _TPACKET_REQ3.pack(
+                    block_size,
+                    block_count,
+                    frame_size,
+                    (block_size * block_count) // frame_size,
+                    timeout,
+                    0,
+                    0
+                )
+            )
+            self._ring = mmap.mmap(
+                self._socket.fileno(),
+                block_size * block_count,
+                mmap.MAP_SHARED,
+                mmap.PROT_READ | mmap.PROT_WRITE
+            )
+            if program is not None:
+                attach_program(self._socket, program)
+            self._socket.bind((iface, ETH_P_ALL))
+            if promisc:
+                self.__add_membership()
+            if fanout is not None:
+                join_fanout(self._socket, fanout)
+        except Exception:
+            self.close()
+            raise
+        return
+
+    def read(self, timeout):
+        """
+        Reads the frames of the blocks handed to user space. It waits
+        for the next block up to the timeout, then reads the blocks
+        that are ready and hands them back to the kernel. The VLAN
+        tag stripped by the kernel is put back in a copy of the frame,
+        like recv_frame() does.
+
+        :param timeout:     The wait timeout (seconds)
+        :return:            A generator of (frame, time, length)
+        """
+
+        if not self.__is_ready(self._block):
+            ready, _, _ = select.select(
+                [self._socket], [], [], timeout
+            )
+            if not ready:
+                return
+
+        ring = memoryview(self._ring)
+        try:
+            while self.__is_ready(self._block):
+                start = self._block * self._block_size
+                _, count, offset = _BLOCK_HEADER.unpack_from(
+                    ring, start + _BLOCK_STATUS_OFFSET
+                )
+
+                # Walk the frames of the block
+                offset += start
+                for index in range(count):
+                    next_offset, seconds, nanoseconds, snaplen, length, \
+                        status, mac, net, rxhash, tci, tpid = \
+                        _FRAME_HEADER.unpack_from(ring, offset)
+                    frame = ring[offset + mac:offset + mac + snaplen]
+
+                    # Put back the VLAN tag stripped by the kernel
+                    if status & TP_STATUS_VLAN_VALID:
+                        if not status & TP_STATUS_VLAN_TPID_VALID:
+                            tpid = ETH_P_8021Q
+                        frame = bytes(frame[:12]) + \
+                            _VLAN_TAG.pack(tpid, tci & 0xffff) + \
+                            bytes(frame[12:])
+                        length += _VLAN_TAG.size
+                    yield (
+                        frame,
+                        seconds + nanoseconds / 1e9,
+                        length
+                    )
+                    offset += next_offset
+
+                # Hand the block back to the kernel
+                _BLOCK_STATUS.pack_into(
+                    self._ring,
+                    start + _BLOCK_STATUS_OFFSET,
+                    TP_STATUS_KERNEL
+                )
+                self._block = (self._block + 1) % self._block_count
+        finally:
+            ring.release()
+        return
+
+    def read_statistics(self):
+        """
+        Reads the kernel counters of the socket. The kernel resets
+        its counters on every read, thus the counts since the last
+        read are returned.
+
+        :return:
+        """
+
+        # Container
+        counts = {
+            'packets'   : 0,
+            'drops'     : 0,
+            'freezes'   : 0
+        }
+
+        if self._socket is not None:
+            counts['packets'], counts['drops'], counts['freezes'] = \
+                _TPACKET_STATS_V3.unpack(
+                    self._socket.getsockopt(
+                        SOL_PACKET,
+                        PACKET_STATISTICS,
+                        _TPACKET_STATS_V3.size
+                    )
+                )
+            for key, value in counts.items():
+                self._statistics[key] += value
+        return counts
+
+    def get_statistics(self):
+        """
+        Returns the kernel counters of the socket since it was
+        opened.
+
+        :return:
+        """
+
+        self.read_statistics()
+        return dict(self._statistics)
+
+    def fileno(self):
+        """
+        Returns the socket file descriptor.
+
+        :return:
+        """
+        return self._socket.fileno()
+
+    def close(self):
+        """
+        Unmaps the ring, drops the promiscuous membership and closes
+        the socket.
+
+        :return:
+        """
+
+        if self._ring is not None:
+            try:
+                self._ring.close()
+            except BufferError:
+                self.logger.info(
+                    "[-] Frames of the ring are still referenced."
+                )
+            self._ring = None
+        if self._socket is not None:
+            if self._membership is not None:
+                self.__drop_membership()
+            self._socket.close()
+            self._socket = None
+        return
+
+    def __add_membership(self):
+        """
+        Puts the interface in promiscuous mode for the life of the
+        socket, the kernel counts the memberships of the sockets.
+
+        :return:
+        """
+
+        membership = _PACKET_MREQ.pack(
+            socket.if_nametoindex(self._iface),
+            PACKET_MR_PROMISC,
+            0,
+            b''
+        )
+        self._socket.setsockopt(
+            SOL_PACKET, PACKET_ADD_MEMBERSHIP, membership
+        )
+        self._membership = membership
+        return
+
+    def __drop_membership(self):
+        """
+        Drops the promiscuous membership of the socket.
+
+        :return:
+        """
+
+        try:
+            self._socket.setsockopt(
+                SOL_PACKET, PACKET_DROP_MEMBERSHIP, self._membership
+            )
+        except (OSError, socket.error):
+            self.logger.info(
+                "[-] The promiscuous membership could not be dropped."
+            )
+        self._membership = None
+        return
+
+    def __is_ready(self, block):
+        """
+        Returns true if a block is handed to user space.
+
+        :param block:       The block index
+        :return:
+        """
+
+        status, = _BLOCK_STATUS.unpack_from(
+            self._ring,
+            block * self._block_size + _BLOCK_STATUS_OFFSET
+        )
+        return status & TP_STATUS_USER != 0
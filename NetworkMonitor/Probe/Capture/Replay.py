@@ -0,0 +1,372 @@
+"""
+
+    :Replay:
+    ==========
+
+    :
+    This is the offline capture source. It reads the Ethernet frames
+    of a pcap or pcapng file and hands them to the capture engine in
+    place of a live interface, either as fast as possible or at the
+    recorded timing. The replay is measured, the throughput and the
+    peak resident memory are reported at the end of the file.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import io
+import sys
+import time
+import struct
+import logging
+import threading
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The replay modes
+REPLAY_FAST             = 'fast'
+REPLAY_TIMED            = 'timed'
+REPLAY_MODES            = [
+    REPLAY_FAST,
+    REPLAY_TIMED
+]
+
+# The only link type decoded by the engine
+LINKTYPE_ETHERNET       = 1
+
+# The read buffer of the file
+REPLAY_BUFFER_SIZE      = 1 << 20
+
+# The pcap magic numbers and their timestamp resolution
+PCAP_MAGIC              = {
+    0xa1b2c3d4  : 1e-6,
+    0xa1b23c4d  : 1e-9
+}
+
+# The pcapng block types
+PCAPNG_SHB              = 0x0a0d0d0a
+PCAPNG_IDB              = 0x00000001
+PCAPNG_SPB              = 0x00000003
+PCAPNG_EPB              = 0x00000006
+PCAPNG_BYTE_ORDER       = 0x1a2b3c4d
+
+# The pcapng interface options
+PCAPNG_OPT_END          = 0
+PCAPNG_IF_TSRESOL       = 9
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def get_peak_rss():
+    """
+    Returns the peak resident memory of the process in KB, or
+    None if it cannot be read on this platform.
+
+    :return:
+    """
+
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # The BSDs report bytes, Linux reports KB
+    if sys.platform == 'darwin':
+        peak //= 1024
+    return peak
+
+def read_frames(path):
+    """
+    Reads the frames of a pcap or pcapng file, the format is
+    found from the magic number.
+
+    :param path:            The capture file
+    :return:                A generator of (frame, time, length, link)
+    """
+
+    with io.open(path, 'rb', buffering=REPLAY_BUFFER_SIZE) as capture:
+        head = capture.read(4)
+        if len(head) < 4:
+            return
+
+        if struct.unpack('<I', head)[0] == PCAPNG_SHB:
+            frames = _read_pcapng(capture, head)
+        else:
+            frames = _read_pcap(capture, head)
+
+        for frame in frames:
+            yield frame
+    return
+
+def _read_pcap(capture, head):
+    """
+    Reads the records of a pcap file.
+
+    :param capture:         The open file, past the magic number
+    :param head:            The magic number bytes
+    :return:                A generator of (frame, time, length, link)
+    """
+
+    # Find the byte order from the magic number
+    for order in ('<', '>'):
+        magic, = struct.unpack(order + 'I', head)
+        if magic in PCAP_MAGIC:
+            break
+    else:
+        raise ValueError("Not a pcap or pcapng file")
+
+    resolution = PCAP_MAGIC[magic]
+    header = capture.read(20)
+    if len(header) < 20:
+        return
+    link = struct.unpack(order + 'HHiIII', header)[5]
+
+    record = struct.Struct(order + 'IIII')
+    while True:
+        fields = capture.read(record.size)
+        if len(fields) < record.size:
+            return
+        seconds, fraction, caplen, length = record.unpack(fields)
+        data = capture.read(caplen)
+        if len(data) < caplen:
+            return
+        yield data, seconds + fraction * resolution, length, link
+
+def _read_pcapng(capture, head):
+    """
+    Reads the packet blocks of a pcapng file. The interfaces are
+    tracked per section for their link type and timestamp
+    resolution, the other blocks are skipped.
+
+    :param capture:         The open file, past the first block type
+    :param head:            The first block type bytes
+    :return:                A generator of (frame, time, length, link)
+    """
+
+    # The interfaces of the section: (link, snaplen, resolution)
+    interfaces = []
+    order = '<'
+
+    while True:
+        if head is None:
+            head = capture.read(4)
+        if len(head) < 4:
+            return
+
+        # A section header resets the byte order and interfaces
+        if struct.unpack('<I', head)[0] == PCAPNG_SHB:
+            fields = capture.read(8)
+            if len(fields) < 8:
+                return
+            for order in ('<', '>'):
+                if struct.unpack(order + 'I', fields[4:8])[0] == \
+                        PCAPNG_BYTE_ORDER:
+                    break
+            else:
+                raise ValueError("Bad pcapng byte order magic")
+            length, = struct.unpack(order + 'I', fields[0:4])
+            capture.read(length - 12)
+            interfaces = []
+            head = None
+            continue
+
+        kind, = struct.unpack(order + 'I', head)
+        fields = capture.read(4)
+        if len(fields) < 4:
+            return
+        length, = struct.unpack(order + 'I', fields)
+        body = capture.read(length - 12)
+        trailer = capture.read(4)
+        if len(trailer) < 4:
+            return
+        head = None
+
+        if kind == PCAPNG_IDB:
+            link, _, snaplen = struct.unpack_from(order + 'HHI', body, 0)
+            interfaces.append(
+                (link, snaplen, _read_resolution(body, 8, order))
+            )
+
+        elif kind == PCAPNG_EPB:
+            interface, high, low, caplen, wirelen = \
+                struct.unpack_from(order + 'IIIII', body, 0)
+            link, _, resolution = interfaces[interface]
+            yield (
+                body[20:20 + caplen],
+                ((high << 32) | low) * resolution,
+                wirelen,
+                link
+            )
+
+        elif kind == PCAPNG_SPB:
+            wirelen, = struct.unpack_from(order + 'I', body, 0)
+            link, snaplen, _ = interfaces[0]
+            caplen = min(wirelen, snaplen or wirelen)
+            yield body[4:4 + caplen], None, wirelen, link
+
+def _read_resolution(body, offset, order):
+    """
+    Reads the timestamp resolution from the options of an
+    interface description block.
+
+    :param body:            The block body
+    :param offset:          The options offset
+    :param order:           The byte order of the section
+    :return:                The resolution (seconds)
+    """
+
+    while offset + 4 <= len(body):
+        code, size = struct.unpack_from(order + 'HH', body, offset)
+        if code == PCAPNG_OPT_END:
+            break
+        if code == PCAPNG_IF_TSRESOL and size >= 1:
+            value = bytearray(body[offset + 4:offset + 5])[0]
+            if value & 0x80:
+                return 2.0 ** -(value & 0x7f)
+            return 10.0 ** -value
+        offset += 4 + ((size + 3) & ~3)
+    return 1e-6
+
+class PcapReplay(object):
+    """
+    This is the replay of a capture file. The frames are read in
+    order and paced at the recorded timing in timed mode. The frames
+    of the other link types are skipped and counted.
+    """
+
+    # The capture file
+    _path           = None
+
+    # The replay mode
+    _mode           = REPLAY_FAST
+
+    # The replay counters
+    _statistics     = None
+
+    # Set to end the replay
+    _stopped        = None
+
+    def __init__(self, path, mode=REPLAY_FAST):
+        """
+        This is the constructor for the class.
+
+        :param path:        The pcap or pcapng file
+        :param mode:        The replay mode [fast/timed]
+        :return:
+        """
+
+        self._path = path
+        self._mode = mode
+        self._stopped = threading.Event()
+        self._statistics = {
+            'file'      : path,
+            'mode'      : mode,
+            'packets'   : 0,
+            'bytes'     : 0,
+            'skipped'   : 0,
+            'seconds'   : 0.0,
+            'rate'      : 0.0,
+            'usec'      : 0.0,
+            'peak_rss'  : None
+        }
+        self.logger = logging.getLogger(
+            "PcapReplay - %s" %path
+        )
+        return
+
+    def read(self):
+        """
+        Reads the Ethernet frames of the file. The replay is timed
+        from the first frame to the last frame read, the consumer
+        work done between the frames is part of the measure.
+
+        :return:            A generator of (frame, time, length)
+        """
+
+        statistics = self._statistics
+        timed = self._mode == REPLAY_TIMED
+        first = None
+        start = time.time()
+        try:
+            for data, timestamp, length, link in read_frames(self._path):
+                if link != LINKTYPE_ETHERNET:
+                    statistics['skipped'] += 1
+                    continue
+                if timestamp is None:
+                    timestamp = time.time()
+
+                # Pace the frames at the recorded timing
+                if timed:
+                    if first is None:
+                        first = timestamp
+                    delay = (timestamp - first) - (time.time() - start)
+                    if delay > 0 and self._stopped.wait(delay):
+                        return
+
+                statistics['packets'] += 1
+                statistics['bytes'] += length
+                yield data, timestamp, length
+        finally:
+            self.__update(time.time() - start)
+        return
+
+    def stop(self):
+        """
+        Ends the replay, a timed replay is woken up.
+
+        :return:
+        """
+        self._stopped.set()
+        return
+
+    def get_statistics(self):
+        """
+        Returns the replay counters and the throughput.
+
+        :return:
+        """
+        return dict(self._statistics)
+
+    def __update(self, elapsed):
+        """
+        Updates the throughput of the replay.
+
+        :param elapsed:     The replay time (seconds)
+        :return:
+        """
+
+        statistics = self._statistics
+        count = statistics['packets']
+        statistics['seconds'] = elapsed
+        statistics['rate'] = count / elapsed if elapsed else 0.0
+        statistics['usec'] = elapsed * 1e6 / count if count else 0.0
+        statistics['peak_rss'] = get_peak_rss()
+        return
@@ -0,0 +1,275 @@
+"""
+
+    :Ring:
+    ==========
+
+    :
+    This is the bounded ring between the capture thread and the
+    correlation workers. The capture thread puts the decoded frames
+    of a probe in the ring of the probe and goes back to the socket
+    at once, the worker of the probe takes them out and correlates
+    them. A full ring drops the frame and counts it, thus a slow
+    correlator never stalls the capture and the drops are visible.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import time
+import logging
+import threading
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The worker wait timeout when the ring is empty (seconds)
+RING_POLL_TIMEOUT   = 1
+
+# The poll interval of a join (seconds)
+RING_JOIN_INTERVAL  = 0.01
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+class BoundedRing(object):
+    """
+    This is a single producer, single consumer ring of fixed size.
+    The producer only moves the head and the consumer only moves the
+    tail, each index is written by one thread, thus no lock is taken
+    to put or get an item. The consumer sleeps on an event when the
+    ring is empty.
+    """
+
+    # The slots
+    _slots          = None
+
+    # The number of slots
+    _size           = 0
+
+    # The items put (head) and taken (tail)
+    _head           = 0
+    _tail           = 0
+
+    # The items the consumer is done with
+    _done           = 0
+
+    # The items dropped on a full ring
+    _dropped        = 0
+
+    # The deepest the ring has been
+    _high_water     = 0
+
+    # Set when an item is put or the ring is closed
+    _ready          = None
+
+    # True once closed
+    _closed         = False
+
+    def __init__(self, size):
+        """
+        This is the constructor for the class.
+
+        :param size:        The number of slots
+        :return:
+        """
+
+        self._size = size
+        self._slots = [None] * size
+        self._head = 0
+        self._tail = 0
+        self._done = 0
+        self._dropped = 0
+        self._high_water = 0
+        self._ready = threading.Event()
+        self._closed = False
+        return
+
+    def put(self, item):
+        """
+        Puts an item in the ring, it is dropped if the ring is full.
+        Only the capture thread puts items.
+
+        :param item:        The item
+        :return:            True if the item was put
+        """
+
+        depth = self._head - self._tail
+        if depth >= self._size:
+            self._dropped += 1
+            return False
+
+        # The slot is written before the head is moved
+        self._slots[self._head % self._size] = item
+        self._head += 1
+
+        if depth >= self._high_water:
+            self._high_water = depth + 1
+        if not self._ready.is_set():
+            self._ready.set()
+        return True
+
+    def get(self, timeout=RING_POLL_TIMEOUT):
+        """
+        Takes the oldest item out of the ring, it waits up to the
+        timeout for an item. Only the worker takes items.
+
+        :param timeout:     The wait timeout (seconds)
+        :return:            The item, None if the ring is empty
+        """
+
+        if self._tail == self._head:
+
+            # The head is checked again after the event is cleared,
+            # an item put in between is not missed
+            self._ready.clear()
+            if self._tail == self._head:
+                self._ready.wait(timeout)
+                if self._tail == self._head:
+                    return None
+
+        index = self._tail % self._size
+        item = self._slots[index]
+        self._slots[index] = None
+        self._tail += 1
+        return item
+
+    def task_done(self):
+        """
+        Tells the ring that the consumer is done with an item.
+
+        :return:
+        """
+        self._done += 1
+        return
+
+    def join(self):
+        """
+        Waits until the consumer is done with every item put.
+
+        :return:
+        """
+
+        while self._done < self._head and not self._closed:
+            time.sleep(RING_JOIN_INTERVAL)
+        return
+
+    def close(self):
+        """
+        Closes the ring, the worker ends once the ring is empty.
+
+        :return:
+        """
+
+        self._closed = True
+        self._ready.set()
+        return
+
+    def is_closed(self):
+        """
+        Returns true once the ring is closed.
+
+        :return:
+        """
+        return self._closed
+
+    def is_empty(self):
+        """
+        Returns true if the ring holds no item.
+
+        :return:
+        """
+        return self._tail == self._head
+
+    def get_statistics(self):
+        """
+        Returns the ring counters.
+
+        :return:
+        """
+
+        head = self._head
+        tail = self._tail
+        return {
+            'size'          : self._size,
+            'depth'         : head - tail,
+            'enqueued'      : head,
+            'dequeued'      : tail,
+            'dropped'       : self._dropped,
+            'high_water'    : self._high_water
+        }
+
+class RingWorker(threading.Thread):
+    """
+    This is the correlation worker of a probe. It takes the items
+    out of the ring of the probe, an item is a (function, argument)
+    pair that is called in the worker thread.
+    """
+
+    # The ring
+    _ring           = None
+
+    def __init__(self, ring, name):
+        """
+        This is the constructor for the class.
+
+        :param ring:        The ring to work on
+        :param name:        The probe name
+        :return:
+        """
+
+        threading.Thread.__init__(
+            self,
+            name = "RingWorker - %s" %name
+        )
+        self.daemon = True
+        self._ring = ring
+        self.logger = logging.getLogger(
+            "RingWorker - %s" %name
+        )
+        return
+
+    def run(self):
+        """
+        Correlates the items of the ring until it is closed and
+        empty.
+
+        :return:
+        """
+
+        ring = self._ring
+        while not ring.is_closed() or not ring.is_empty():
+            item = ring.get()
+            if item is None:
+                continue
+
+            function, argument = item
+            try:
+                function(argument)
+            except Exception:
+                self.logger.exception(
+                    "[-] Correlation failed"
+                )
+            ring.task_done()
+        return
@@ -0,0 +1,271 @@
+"""
+
+    :Sampler:
+    ==========
+
+    :
+    This is the packet sampler of the capture engine. In the fixed
+    mode one frame in N is dispatched to the probes. In the adaptive
+    mode the sampler measures the time spent dispatching, when the
+    probes use more than their budget of the capture thread, or when
+    the kernel or the probe rings drop frames, N is doubled and when
+    the load drops back N is halved. The counts of the reports are
+    scaled back up with the scale of the sampler over the report
+    interval.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+from timeit import default_timer
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The sampling modes
+SAMPLE_FIXED        = 'fixed'
+SAMPLE_ADAPTIVE     = 'adaptive'
+SAMPLE_MODES        = [
+    SAMPLE_FIXED,
+    SAMPLE_ADAPTIVE
+]
+
+# The largest sampling rate of the adaptive mode
+SAMPLE_RATE_MAX     = 1024
+
+# The load measure window (seconds)
+SAMPLE_WINDOW       = 1.0
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+class Sampler(object):
+    """
+    This is the 1 in N sampler. The frames are counted and every
+    Nth frame is admitted, the admitted frames are timed by the
+    engine in the adaptive mode.
+    """
+
+    # The sampling mode
+    _mode           = SAMPLE_FIXED
+
+    # The configured rate, the floor of the adaptive mode
+    _base           = 1
+
+    # The current rate
+    _rate           = 1
+
+    # The busy fraction of the capture thread allowed
+    _budget         = 0.8
+
+    # The frames since the last admitted frame
+    _count          = 0
+
+    # The frame counters
+    _admitted       = 0
+    _skipped        = 0
+
+    # The number of rate changes
+    _changes        = 0
+
+    # The frame counters at the last report of each reader
+    _marks          = None
+
+    # The current load window
+    _window         = 0
+    _busy           = 0
+    _drops          = 0
+
+    def __init__(self, rate=1, mode=SAMPLE_FIXED, budget=0.8):
+        """
+        This is the constructor for the class.
+
+        :param rate:        The sampling rate, 1 in rate frames
+        :param mode:        The sampling mode [fixed/adaptive]
+        :param budget:      The busy fraction allowed (adaptive)
+        :return:
+        """
+
+        self._mode = mode
+        self._base = max(int(rate), 1)
+        self._rate = self._base
+        self._budget = budget
+        self._count = 0
+        self._admitted = 0
+        self._skipped = 0
+        self._changes = 0
+        self._marks = {}
+        self._window = default_timer()
+        self._busy = 0
+        self._drops = 0
+        return
+
+    def configure(self, rate, mode, budget):
+        """
+        Merges the sampling a probe asks for in place, the counters
+        and the adaptive state are kept. The largest rate, the
+        adaptive mode and the smallest budget asked for are kept.
+
+        :param rate:        The sampling rate, 1 in rate frames
+        :param mode:        The sampling mode [fixed/adaptive]
+        :param budget:      The busy fraction allowed (adaptive)
+        :return:
+        """
+
+        self._base = max(self._base, int(rate))
+        self._rate = max(self._rate, self._base)
+        self._budget = min(self._budget, budget)
+        if mode == SAMPLE_ADAPTIVE and self._mode != SAMPLE_ADAPTIVE:
+            self._mode = SAMPLE_ADAPTIVE
+            self._window = default_timer()
+            self._busy = 0
+            self._drops = 0
+        return
+
+    def admit(self):
+        """
+        Returns true if the frame is dispatched.
+
+        :return:
+        """
+
+        self._count += 1
+        if self._count < self._rate:
+            self._skipped += 1
+            return False
+
+        self._count = 0
+        self._admitted += 1
+        return True
+
+    def account(self, start):
+        """
+        Accounts the time spent dispatching an admitted frame, the
+        rate is updated at the end of each load window.
+
+        :param start:       The timer value when the dispatch began
+        :return:
+        """
+
+        if self._mode != SAMPLE_ADAPTIVE:
+            return
+
+        now = default_timer()
+        self._busy += now - start
+        if now - self._window >= SAMPLE_WINDOW:
+            self.__update(now)
+        return
+
+    def add_drops(self, drops):
+        """
+        Adds the frames the kernel or a probe ring dropped to the
+        load window.
+
+        :param drops:       The frames dropped
+        :return:
+        """
+
+        self._drops += drops
+        return
+
+    def get_rate(self):
+        """
+        Returns the current sampling rate.
+
+        :return:
+        """
+        return self._rate
+
+    def get_mode(self):
+        """
+        Returns the sampling mode.
+
+        :return:
+        """
+        return self._mode
+
+    def get_budget(self):
+        """
+        Returns the busy fraction allowed.
+
+        :return:
+        """
+        return self._budget
+
+    def get_statistics(self, reader=None):
+        """
+        Returns the sampling report of a report interval. The frames
+        are counted since the last report of the reader, the counters
+        of the reader are reset. The scale is the number of frames
+        each admitted frame of the interval stands for, the counts of
+        the probes are multiplied by it.
+
+        :param reader:      The reader, i.e. the probe, None for the
+                            frames since the start
+        :return:
+        """
+
+        admitted = self._admitted
+        skipped = self._skipped
+        if reader is not None:
+            last_admitted, last_skipped = self._marks.get(reader, (0, 0))
+            self._marks[reader] = (admitted, skipped)
+            admitted -= last_admitted
+            skipped -= last_skipped
+
+        return {
+            'mode'      : self._mode,
+            'rate'      : self._rate,
+            'admitted'  : admitted,
+            'skipped'   : skipped,
+            'scale'     : float(admitted + skipped) / admitted
+                          if admitted else float(self._rate),
+            'changes'   : self._changes
+        }
+
+    def __update(self, now):
+        """
+        Updates the rate from the load of the ended window.
+
+        :param now:         The timer value
+        :return:
+        """
+
+        load = self._busy / (now - self._window)
+        rate = self._rate
+
+        if load > self._budget or self._drops > 0:
+            rate = min(rate * 2, SAMPLE_RATE_MAX)
+        elif load < self._budget / 2:
+            rate = max(rate // 2, self._base)
+
+        if rate != self._rate:
+            self._rate = rate
+            self._changes += 1
+
+        self._window = now
+        self._busy = 0
+        self._drops = 0
+        return
@@ -0,0 +1,153 @@
+"""
+
+    :Scheduler:
+    ==========
+
+    :
+    This is the report scheduler of the capture engine. The probes
+    do not count their packets to report anymore, the engine fires
+    one report round on an interval or once a number of frames has
+    been dispatched, whichever comes first. A round reports every
+    probe that correlated something since the last round, thus the
+    reports of the probes are coalesced and their cost only depends
+    on the interval and the threshold, not on the traffic.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+from timeit import default_timer
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+class ReportScheduler(object):
+    """
+    This is the report round timer. It is only used by the capture
+    thread, the frames are counted and the clock is read on each
+    frame, a round is due when either limit is reached.
+    """
+
+    # The time between two rounds (seconds)
+    _interval       = 0
+
+    # The frames that trigger a round
+    _records        = 0
+
+    # The frames since the last round
+    _count          = 0
+
+    # The timer value of the next round
+    _deadline       = 0
+
+    # The round counters
+    _rounds         = 0
+    _reports        = 0
+
+    def __init__(self, interval, records):
+        """
+        This is the constructor for the class.
+
+        :param interval:    The time between two rounds (seconds)
+        :param records:     The frames that trigger a round
+        :return:
+        """
+
+        self._interval = interval
+        self._records = max(int(records), 1)
+        self._count = 0
+        self._deadline = default_timer() + interval
+        self._rounds = 0
+        self._reports = 0
+        return
+
+    def tick(self, count=1):
+        """
+        Counts the dispatched frames.
+
+        :param count:       The frames dispatched
+        :return:            True if a round is due
+        """
+
+        self._count += count
+        return self._count >= self._records or \
+            default_timer() >= self._deadline
+
+    def is_due(self):
+        """
+        Returns true if the interval has passed, it is checked when
+        the capture is idle.
+
+        :return:
+        """
+        return default_timer() >= self._deadline
+
+    def done(self, reports):
+        """
+        Ends a round and starts the next interval.
+
+        :param reports:     The probes reported in the round
+        :return:
+        """
+
+        now = default_timer()
+        self._count = 0
+        self._deadline = now + self._interval
+        self._rounds += 1
+        self._reports += reports
+        return
+
+    def get_interval(self):
+        """
+        Returns the time between two rounds.
+
+        :return:
+        """
+        return self._interval
+
+    def get_records(self):
+        """
+        Returns the frames that trigger a round.
+
+        :return:
+        """
+        return self._records
+
+    def get_statistics(self):
+        """
+        Returns the round counters.
+
+        :return:
+        """
+        return {
+            'interval'  : self._interval,
+            'records'   : self._records,
+            'rounds'    : self._rounds,
+            'reports'   : self._reports,
+            'pending'   : self._count
+        }
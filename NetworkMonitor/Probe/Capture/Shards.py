@@ -0,0 +1,363 @@
+"""
+
+    :Shards:
+    ==========
+
+    :
+    This is the multi process capture of a passive probe. The probe
+    starts N capture processes on its interface, their packet
+    sockets join one PACKET_FANOUT group in flow hash mode, thus the
+    kernel spreads the flows over the processes and a flow always
+    lands on the same process. Each process runs its own instance of
+    the probe with its own database, the reports of the processes
+    are merged by the probe before they are published.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import os
+import copy
+import logging
+import threading
+import multiprocessing
+
+try:
+    from Queue import Empty
+except ImportError:
+    from queue import Empty
+
+from NetworkMonitor.Storage.TopK import \
+    merge_top
+from NetworkMonitor.Storage.HyperLogLog import \
+    merge_distinct
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The report poll timeout of the pool (seconds)
+SHARD_POLL_TIMEOUT  = 1
+
+# The capture counters summed over the shards
+SHARD_COUNTERS      = [
+    'captured',
+    'matched'
+]
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def merge_reports(reports):
+    """
+    Merges the reports of the shards. The rows of the tables are
+    gathered, the capture counters are summed and the capture
+    section of every shard is kept. The merge is a delta if any
+    report is one.
+
+    :param reports:         The report templates, by shard
+    :return:                The merged report template
+    """
+
+    # Container
+    tables = {}
+    shards = []
+    merged = None
+
+    for shard in sorted(reports.keys()):
+        report = reports[shard]
+        if merged is None:
+            merged = copy.copy(report)
+        for name, rows in report['data'].items():
+            tables.setdefault(name, []).extend(rows)
+        shards.append(report.get('capture'))
+
+    if merged is None:
+        return None
+
+    capture = {
+        'shards'    : shards
+    }
+    for counter in SHARD_COUNTERS:
+        capture[counter] = sum(
+            shard[counter] for shard in shards
+            if shard is not None
+        )
+    merged['data'] = tables
+    merged['capture'] = capture
+
+    # A round holding a delta is a delta
+    merged['delta'] = any(
+        report.get('delta', False) for report in reports.values()
+    )
+
+    # The top talkers of the shards are added up
+    tops = [
+        report['top'] for report in reports.values()
+        if 'top' in report
+    ]
+    if tops:
+        merged['top'] = {}
+        for field in tops[0].keys():
+            lists = [top.get(field, []) for top in tops]
+            merged['top'][field] = merge_top(
+                lists,
+                max(len(rows) for rows in lists),
+                field
+            )
+
+    # The distinct counts of the shards are merged
+    distincts = [
+        report['distinct'] for report in reports.values()
+        if 'distinct' in report
+    ]
+    if distincts:
+        merged['distinct'] = merge_distinct(distincts)
+    return merged
+
+def run_shard(probe_class, configs, shard, group, reports, stopped):
+    """
+    This is the entry point of a capture process. The probe is
+    built from its app configs, it joins the fanout group and its
+    reports are sent to the pool.
+
+    :param probe_class:     The probe class
+    :param configs:         The app configs of the probe
+    :param shard:           The shard index
+    :param group:           The fanout group id
+    :param reports:         The reports queue of the pool
+    :param stopped:         Set to stop the shard
+    :return:
+    """
+
+    configs = dict(configs)
+    configs['workers'] = 1
+    probe = probe_class(ShardQueue(reports, shard), configs)
+    probe.set_shard(shard, group)
+    probe.setup()
+
+    # Stop the probe from the pool
+    watcher = threading.Thread(
+        target = _stop_shard,
+        args = (probe, stopped)
+    )
+    watcher.daemon = True
+    watcher.start()
+
+    probe.run()
+    return
+
+def _stop_shard(probe, stopped):
+    """
+    Kills the probe of a shard once the pool is stopped.
+
+    :param probe:           The probe of the shard
+    :param stopped:         Set to stop the shard
+    :return:
+    """
+
+    stopped.wait()
+    probe.kill()
+    return
+
+class ShardQueue(object):
+    """
+    This is the application queue handed to the probe of a shard,
+    the reports are tagged with the shard index.
+    """
+
+    # The reports queue of the pool
+    _reports        = None
+
+    # The shard index
+    _shard          = 0
+
+    def __init__(self, reports, shard):
+        """
+        This is the constructor for the class.
+
+        :param reports:     The reports queue of the pool
+        :param shard:       The shard index
+        :return:
+        """
+
+        self._reports = reports
+        self._shard = shard
+        return
+
+    def put(self, data):
+        """
+        Sends a report of the shard to the pool.
+
+        :param data:        The probe data
+        :return:
+        """
+        self._reports.put((self._shard, data))
+        return
+
+class ShardPool(object):
+    """
+    This is the pool of capture processes of a probe. The pool
+    runs in the thread of the probe, it starts the processes and
+    hands each report received to the probe until every process
+    has ended.
+    """
+
+    # The probe class
+    _probe_class    = None
+
+    # The app configs of the probe
+    _configs        = None
+
+    # The number of processes
+    _count          = 0
+
+    # The fanout group id
+    _group          = 0
+
+    # The pools created in the process, each one has its own group
+    __pools         = 0
+
+    # Guards the count of the pools
+    __pools_lock    = threading.Lock()
+
+    # The capture processes
+    _processes      = None
+
+    # The reports queue
+    _reports        = None
+
+    # Set to stop the processes
+    _stopped        = None
+
+    def __init__(self, probe_class, configs, count):
+        """
+        This is the constructor for the class.
+
+        :param probe_class: The probe class
+        :param configs:     The app configs of the probe
+        :param count:       The number of processes
+        :return:
+        """
+
+        self._probe_class = probe_class
+        self._configs = configs
+        self._count = count
+        self._group = self.__next_group()
+        self._processes = []
+        self._reports = multiprocessing.Queue()
+        self._stopped = multiprocessing.Event()
+        self.logger = logging.getLogger(
+            "ShardPool - %s" %configs['name']
+        )
+        return
+
+    @classmethod
+    def __next_group(cls):
+        """
+        Returns the fanout group id of a new pool, a count of the
+        pools mixed with the pid. The pools of a process never share
+        a group: the probes sharding one interface would split their
+        frames, and a group is bound to a single interface.
+
+        :return:
+        """
+
+        with cls.__pools_lock:
+            pools = cls.__pools
+            cls.__pools += 1
+        return (os.getpid() + pools) & 0xffff
+
+    def run(self, callback):
+        """
+        Starts the processes and hands their reports to the
+        callback until they have all ended.
+
+        :param callback:    Called with (shard, data) per report
+        :return:
+        """
+
+        for shard in range(self._count):
+            process = multiprocessing.Process(
+                target = run_shard,
+                args = (
+                    self._probe_class,
+                    self._configs,
+                    shard,
+                    self._group,
+                    self._reports,
+                    self._stopped
+                ),
+                name = "%s-%d" %(self._configs['name'], shard)
+            )
+            process.daemon = True
+            process.start()
+            self._processes.append(process)
+        self.logger.info(
+            "[+] Started %d capture processes in fanout group %d"
+            %(self._count, self._group)
+        )
+
+        # The queue is drained before the processes are joined
+        while any(process.is_alive() for process in self._processes) \
+                or not self._reports.empty():
+            try:
+                shard, data = self._reports.get(
+                    timeout = SHARD_POLL_TIMEOUT
+                )
+            except Empty:
+                continue
+            callback(shard, data)
+
+        for process in self._processes:
+            process.join()
+        self.logger.info(
+            "[-] Stopped the capture processes"
+        )
+        return
+
+    def stop(self):
+        """
+        Stops the capture processes.
+
+        :return:
+        """
+        self._stopped.set()
+        return
+
+    def get_count(self):
+        """
+        Returns the number of processes.
+
+        :return:
+        """
+        return self._count
+
+    def get_group(self):
+        """
+        Returns the fanout group id.
+
+        :return:
+        """
+        return self._group
@@ -0,0 +1,37 @@
+"""
+
+    :__init__.py:
+    ==========
+
+    :
+    Contains the shared capture layer that feeds the passive
+    network probes. One capture engine runs per interface and
+    fans every packet out to the probes registered on it.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+from .Engine import *
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
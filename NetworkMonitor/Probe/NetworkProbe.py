@@ -24,13 +24,32 @@ Imports
 =============================================
 """
 
+import os
+
 from scapy.all import *
 from abc import abstractmethod
+from timeit import default_timer
 from NetworkMonitor.Probe.Probe \
     import Probe, PLACEHOLDER_ARRAY, \
     PLACEHOLDER_DICT, PLACEHOLDER_STRING
 from NetworkMonitor.Probe.MutableProbe \
     import MutableProbe
+from NetworkMonitor.Probe.Capture.Engine \
+    import CaptureEngine
+from NetworkMonitor.Probe.Capture.Decoder \
+    import DECODE_RAW, DECODE_SCAPY
+from NetworkMonitor.Probe.Capture.Filter \
+    import SNAPLEN_HEADERS, SNAPLEN_MAX
+from NetworkMonitor.Probe.Capture.Shards \
+    import ShardPool, merge_reports
+from NetworkMonitor.Probe.Capture.Clock \
+    import format_tables
+from NetworkMonitor.Storage.TopK \
+    import SpaceSaving
+from NetworkMonitor.Storage.HyperLogLog \
+    import HyperLogLog
+from NetworkMonitor.Storage.DeviceRegistry \
+    import DeviceRegistry
 from NetworkMonitor.config import *
 
 """
@@ -51,6 +70,34 @@ PROBE_BEHAVIOURS = [
 PROBE_MONITORING = PROBE_BEHAVIOURS[0]
 PROBE_OBSERVING = PROBE_BEHAVIOURS[1]
 
+OBSERVE_MODES = [
+    'aggregate',
+    'record'
+]
+OBSERVE_AGGREGATE = OBSERVE_MODES[0]
+OBSERVE_RECORD = OBSERVE_MODES[1]
+
+REPORT_MODES = [
+    'full',
+    'delta'
+]
+REPORT_FULL = REPORT_MODES[0]
+REPORT_DELTA = REPORT_MODES[1]
+
+KNOWN_SCOPES = [
+    'probe',
+    'node'
+]
+KNOWN_PROBE = KNOWN_SCOPES[0]
+KNOWN_NODE = KNOWN_SCOPES[1]
+
+TOP_FIELDS = [
+    'bytes',
+    'packets'
+]
+TOP_BYTES = TOP_FIELDS[0]
+TOP_PACKETS = TOP_FIELDS[1]
+
 """
 =============================================
 Source
@@ -88,6 +135,65 @@ class NetworkProbe(Probe):
     # Iface that is used to sniff
     _iface             = None
 
+    # Layer filter
+    layers             = []
+
+    # The packets the probe can correlate [scapy/raw]
+    decoder            = DECODE_SCAPY
+
+    # Correlates whole frame batches
+    batched            = False
+
+    # The bytes of a frame the probe reads
+    snaplen            = SNAPLEN_MAX
+
+    # True if the observed tables are aggregated per conversation
+    _aggregate         = False
+
+    # True if the probe ranks its top talkers
+    talkers            = False
+
+    # The top talker sketches by field
+    _talkers           = None
+
+    # The dimensions the probe counts the distinct values of
+    distinct           = []
+
+    # The distinct count estimators by dimension
+    _distinct          = None
+
+    # True if the probe updates the device registry of the node
+    registry           = False
+
+    # The device registry, None if not updated
+    _registry          = None
+
+    # The scope of the known devices in the registry, None for the
+    # node
+    _known_scope       = None
+
+    # The known devices of a probe without the registry
+    _known_devices     = None
+
+    # The reports made
+    _report_count      = 0
+
+    # The timer value of the last checkpoint
+    _checkpointed      = 0
+
+    # App configs
+    _configs           = None
+
+    # The shard index and fanout group in a capture process
+    _shard             = None
+    _fanout            = None
+
+    # The capture processes of a sharded probe
+    _pool              = None
+
+    # The reports of the capture processes in the current round
+    _shard_reports     = None
+
     # Check the probe types
     _types             = {
     }
@@ -151,7 +257,11 @@ class NetworkProbe(Probe):
         )
 
         # Set a new handle
+        self.__setup_registry()
         self._setup_db()
+        self.__restore()
+        self.__setup_talkers()
+        self.__setup_distinct()
         self.logger.info(
             "Setup complete for probe: %s"
             %self.name
@@ -174,35 +284,547 @@ class NetworkProbe(Probe):
     def report(self):
         """
         This is the default reporting mechanism for the network
-        probes.
+        probes. Every report is published on the queue of the probe,
+        the delta mode relies on it.
 
         :param data:
         :return:
         """
 
-        # We get all the data
-        results = self._database.get_tables()
-        template = self.get_template()
+        # We get the data, the capture times are formatted here
+        full = self.__is_snapshot()
+        results = format_tables(self._database.get_delta(full))
+        template = dict(self.get_template())
         template['data'] = results
-
-        # Set the data
+        template['delta'] = not full
+        template['capture'] = self._get_engine().get_statistics(self)
+        template['tables'] = self._database.get_statistics()
+        if self._talkers is not None:
+            template['top'] = self.__get_talkers()
+        if self._distinct:
+            template['distinct'] = self.__get_distinct()
+        if self._registry is not None:
+            template['devices'] = self._registry.get_statistics()
+
+        # Set the data and publish it, a shard sends it to the probe
+        # that runs the capture processes
         self.set_data(template)
-        return self.get_data()
+        self._packet_counter = 0
+        self._report_count += 1
+        self.__checkpoint()
+
+        data = self.get_data()
+        self._queue.put(data)
+
+        # The interval is published, the sketches and the estimators
+        # start the next one
+        if self._talkers is not None:
+            self.__reset_talkers()
+        if self._distinct:
+            self.__reset_distinct()
+        return data
+
+    def _count_talker(self, address, length, packets=1):
+        """
+        Counts the bytes and packets sent by an address in the top
+        talkers of the interval.
+
+        :param address:     The source address
+        :param length:      The bytes sent
+        :param packets:     The packets sent
+        :return:
+        """
+
+        if self._talkers is None:
+            return
+        self._talkers[TOP_BYTES].update(address, length)
+        self._talkers[TOP_PACKETS].update(address, packets)
+        return
+
+    def _count_distinct(self, dimension, value):
+        """
+        Counts a value in the distinct values of a dimension for
+        the interval.
+
+        :param dimension:   The dimension, i.e. src_ip
+        :param value:       The value
+        :return:
+        """
+
+        estimator = self._distinct.get(dimension)
+        if estimator is not None:
+            estimator.add(value)
+        return
+
+    def _see_device(self, mac, time, ip=None):
+        """
+        Records a device seen in the registry of the node, with the
+        IP address it sent from if any.
+
+        :param mac:         The MAC address
+        :param time:        The capture time
+        :param ip:          The IP address
+        :return:
+        """
+
+        if self._registry is not None:
+            self._registry.see(mac, time, ip)
+        return
+
+    def _learn_devices(self, macs):
+        """
+        Declares the known devices of the probe in the registry of
+        the node, to the probe only or to every probe of the node.
+        A probe without the registry keeps them itself.
+
+        :param macs:        The MAC addresses
+        :return:
+        """
+
+        if self._registry is not None:
+            self._registry.learn(macs, self._known_scope)
+        else:
+            self._known_devices.update(macs)
+        return
+
+    def _is_known_device(self, mac):
+        """
+        Returns true if a device is known to the probe, declared by
+        the probe or node wide by any probe.
+
+        :param mac:         The MAC address
+        :return:
+        """
+
+        if self._registry is not None:
+            return self._registry.is_known(mac, self._known_scope)
+        return mac in self._known_devices
+
+    def _see_port(self, ip, port, time):
+        """
+        Records a port a device was reached on in the registry of
+        the node, the device is found by its IP address.
+
+        :param ip:          The IP address
+        :param port:        The port
+        :param time:        The capture time
+        :return:
+        """
+
+        if self._registry is not None:
+            self._registry.see_port(ip, port, time)
+        return
+
+    def __setup_registry(self):
+        """
+        Joins the device registry of the node, the probes of the
+        process share it.
+
+        :return:
+        """
+
+        self._known_devices = set()
+        if not self.registry:
+            self._registry = None
+            return
+
+        self._registry = DeviceRegistry.get_registry(
+            int(self._get_config('devices', REGISTRY_CAPACITY)),
+            REGISTRY_BINDINGS,
+            REGISTRY_PORTS
+        )
+
+        # The known devices of a probe are its own unless node wide
+        scope = self._get_config('known_scope', KNOWN_SCOPE)
+        if scope not in KNOWN_SCOPES:
+            self.logger.info(
+                "[-] Unknown known scope: %s" %scope
+            )
+            scope = KNOWN_PROBE
+        self._known_scope = None if scope == KNOWN_NODE else self
+        return
+
+    def __setup_distinct(self):
+        """
+        Sets up the distinct count estimators of the dimensions of
+        the probe, their registers are fixed whatever the values.
+
+        :return:
+        """
+
+        precision = int(
+            self._get_config('distinct_precision', DISTINCT_PRECISION)
+        )
+        self._distinct = {}
+        if precision <= 0:
+            return
+        for dimension in self.distinct:
+            self._distinct[dimension] = HyperLogLog(precision)
+        return
+
+    def __get_distinct(self):
+        """
+        Returns the serialized estimators of the interval, the
+        estimators keep counting until it is published.
+
+        :return:
+        """
+
+        # Results
+        results = {}
+
+        for dimension, estimator in self._distinct.items():
+            results[dimension] = estimator.to_dict()
+        return results
+
+    def __reset_distinct(self):
+        """
+        Resets the distinct count estimators once their interval has
+        been published, they start the next interval.
+
+        :return:
+        """
+
+        for estimator in self._distinct.values():
+            estimator.reset()
+        return
+
+    def __setup_talkers(self):
+        """
+        Sets up the top talker sketches of the probes that rank
+        them, their counters are fixed whatever the hosts seen.
+
+        :return:
+        """
+
+        if not self.talkers or \
+                int(self._get_config('top_k', TOP_K)) <= 0:
+            self._talkers = None
+            return
+
+        counters = int(self._get_config('top_counters', TOP_COUNTERS))
+        self._talkers = dict(
+            (field, SpaceSaving(counters)) for field in TOP_FIELDS
+        )
+        return
+
+    def __get_talkers(self):
+        """
+        Returns the top talkers of the interval by bytes and by
+        packets, the sketches keep counting until it is published.
+
+        :return:
+        """
+
+        # Results
+        results = {}
+
+        k = int(self._get_config('top_k', TOP_K))
+        for field, sketch in self._talkers.items():
+            results[field] = [
+                {
+                    'address'   : address,
+                    field       : count,
+                    'error'     : error
+                }
+                for address, count, error in sketch.top(k)
+            ]
+        return results
+
+    def __reset_talkers(self):
+        """
+        Resets the top talker sketches once their interval has been
+        published, they start the next interval.
+
+        :return:
+        """
+
+        for sketch in self._talkers.values():
+            sketch.reset()
+        return
+
+    def __get_checkpoint(self):
+        """
+        Returns the checkpoint file of the probe, each capture
+        process has its own. The probe that runs the processes
+        has no tables of its own and no checkpoint.
+
+        :return:
+        """
+
+        path = self._get_config('checkpoint')
+        if path is None or self._pool is not None:
+            return None
+        if self._shard is not None:
+            path = "%s.%d" %(path, self._shard)
+        return path
+
+    def __restore(self):
+        """
+        Restores the tables of the last checkpoint, the probe starts
+        with the state it had learned.
+
+        :return:
+        """
+
+        self._checkpointed = default_timer()
+        path = self.__get_checkpoint()
+        if path is None or not os.path.exists(path):
+            return
+
+        try:
+            restored = self._database.load(path)
+        except (EnvironmentError, ValueError, EOFError, TypeError) as e:
+            self.logger.error(
+                "[-] Could not restore the checkpoint %s: %s"
+                %(path, e)
+            )
+            return
+        self.logger.info(
+            "[+] Restored the tables %s from %s"
+            %(", ".join(restored), path)
+        )
+        return
+
+    def __checkpoint(self, force=False):
+        """
+        Checkpoints the tables every checkpoint interval.
+
+        :param force:       True to checkpoint now
+        :return:
+        """
+
+        path = self.__get_checkpoint()
+        if path is None or self._database is None:
+            return
+
+        now = default_timer()
+        interval = float(
+            self._get_config('checkpoint_interval', CHECKPOINT_INTERVAL)
+        )
+        if not force and now - self._checkpointed < interval:
+            return
+
+        try:
+            self._database.save(path)
+        except (EnvironmentError, ValueError) as e:
+            self.logger.error(
+                "[-] Could not checkpoint to %s: %s"
+                %(path, e)
+            )
+        self._checkpointed = now
+        return
+
+    def __is_snapshot(self):
+        """
+        Returns true if the report holds all the rows. In the delta
+        mode it only holds the rows changed since the previous
+        report, except the first one and one every snapshot reports.
+
+        :return:
+        """
+
+        if self._get_config('report_mode', REPORT_MODE) != REPORT_DELTA:
+            return True
+        snapshot = int(self._get_config('report_snapshot', REPORT_SNAPSHOT))
+        if snapshot <= 0:
+            return self._report_count == 0
+        return self._report_count % snapshot == 0
 
     def _run(self):
         """
-        This is the general running mechanism.
+        This is the general running mechanism. The probe registers
+        itself to the shared capture engine of its iface, the engine
+        sniffs once and dispatches each packet to every probe. When
+        a pcap file is configured the file is replayed instead and
+        the probe reports once the replay has ended. With several
+        workers the capture runs in as many processes instead.
 
-        :param probe_table: The probing execution tables.
         :return:
         """
 
-        sniff(
-            iface = self._iface,
-            prn = self.__process
+        workers = int(self._get_config('workers', CAPTURE_WORKERS))
+        if workers > 1 and self._get_config('pcap') is None:
+            self._run_shards(workers)
+            return
+
+        engine = self._get_engine()
+        if self._get_config('pcap') is not None:
+            engine.set_replay(
+                self._get_config('replay', CAPTURE_REPLAY)
+            )
+        engine.set_capture(
+            self._get_config('capture', CAPTURE_BACKEND)
         )
+        engine.set_decode(
+            self._get_config('decode', CAPTURE_DECODE)
+        )
+        engine.set_batch(
+            int(self._get_config('batch', CAPTURE_BATCH)),
+            float(self._get_config('batch_interval', CAPTURE_BATCH_INTERVAL))
+        )
+        engine.set_sampling(
+            int(self._get_config('sample', CAPTURE_SAMPLE)),
+            self._get_config('sample_mode', CAPTURE_SAMPLE_MODE),
+            float(self._get_config('sample_budget', CAPTURE_SAMPLE_BUDGET))
+        )
+        engine.set_queue(
+            int(self._get_config('queue_size', CAPTURE_QUEUE))
+        )
+        engine.set_report(
+            float(self._get_config('report_interval', REPORT_INTERVAL)),
+            int(self._get_config('report_records', REPORT_RECORDS))
+        )
+        if self._fanout is not None:
+            engine.set_fanout(self._fanout)
+        engine.register(self)
+        engine.run()
+
+        # Report what the replay left in the database
+        if engine.get_replay() is not None:
+            self.report()
         return
 
+    def _run_shards(self, workers):
+        """
+        Runs the capture in several processes. The processes share
+        the frames of the iface through a fanout group, each one
+        runs its own instance of the probe and the probe merges
+        their reports.
+
+        :param workers:     The number of capture processes
+        :return:
+        """
+
+        self._shard_reports = {}
+        self._pool = ShardPool(
+            type(self),
+            self._configs,
+            workers
+        )
+        self._pool.run(self.__merge_report)
+
+        # Publish the round the processes left
+        self.__publish_round()
+        return
+
+    def __merge_report(self, shard, data):
+        """
+        Merges the report of a capture process in the round of
+        reports. The round is merged and published once every
+        process has reported, or before a process reports twice so
+        that no delta is lost. The report of the process itself is
+        only published with shard_reports, tagged with its shard.
+
+        :param shard:       The shard index
+        :param data:        The probe data of the shard
+        :return:
+        """
+
+        if data['data'] is None:
+            return
+
+        report = dict(data['data'])
+        report['shard'] = shard
+        if self._get_config('shard_reports', SHARD_REPORTS):
+            self._queue.put(
+                {
+                    'id'    : data['id'],
+                    'data'  : report
+                }
+            )
+
+        if shard in self._shard_reports:
+            self.__publish_round()
+        self._shard_reports[shard] = report
+        if len(self._shard_reports) >= self._pool.get_count():
+            self.__publish_round()
+        return
+
+    def __publish_round(self):
+        """
+        Merges the reports of the round and publishes the merged
+        report, it is the data of the probe.
+
+        :return:
+        """
+
+        if not self._shard_reports:
+            return
+
+        merged = merge_reports(self._shard_reports)
+        merged.pop('shard', None)
+        self._shard_reports = {}
+        self.set_data(merged)
+        self._queue.put(self.get_data())
+        return
+
+    def set_shard(self, shard, group):
+        """
+        Makes the probe the shard of a sharded probe, it runs in
+        a capture process and joins the fanout group.
+
+        :param shard:       The shard index
+        :param group:       The fanout group id
+        :return:
+        """
+
+        self._shard = shard
+        self._fanout = group
+        return
+
+    def kill(self):
+        """
+        Kills the probe and removes it from the capture engine.
+
+        :return:
+        """
+
+        if self._pool is not None:
+            self._pool.stop()
+
+        # The last report, while the probe is still registered
+        elif self._database is not None:
+            self.report()
+        self.__checkpoint(True)
+        self._get_engine().unregister(self)
+        Probe.kill(self)
+        return
+
+    def update(self):
+        """
+        The reports are published as they are made, nothing is left
+        to publish once the probe has run.
+
+        :return:
+        """
+        return
+
+    def _get_engine(self):
+        """
+        Returns the capture engine of the probe, the engine of the
+        pcap file if one is configured, else the one of the iface.
+
+        :return:
+        """
+        return CaptureEngine.get_engine(
+            self._get_config('pcap', self._iface)
+        )
+
+    def _get_config(self, name, default=None):
+        """
+        Returns an app config of the probe.
+
+        :param name:        The config name
+        :param default:     The value if not configured
+        :return:
+        """
+
+        if self._configs is None or \
+                name not in self._configs.keys():
+            return default
+        return self._configs[name]
+
     def _register_probe(self, type, obj):
         """
         This registers a function based on the type of monitor that
@@ -230,6 +852,75 @@ class NetworkProbe(Probe):
         )
         return
 
+    def _setup_observed(self, names):
+        """
+        Sets up the tables of the observing behaviour. In the
+        aggregate mode they hold one row per conversation, in the
+        record mode one record per packet.
+
+        :param names:       The table names
+        :return:
+        """
+
+        mode = self._get_config('observe', OBSERVE_MODE)
+        self._aggregate = mode == OBSERVE_AGGREGATE
+        if self._aggregate:
+            self._database.setup_aggregates(
+                names,
+                self._get_bounds(names)
+            )
+        else:
+            self._database.setup_db(
+                names,
+                None,
+                self._get_bounds(names)
+            )
+        return
+
+    def _get_bounds(self, names):
+        """
+        Returns the capacity and the TTL of the tables that grow
+        with the traffic. The KNOWN tables hold the configured
+        entries and are not bounded. The app configs set the
+        defaults and the TABLES section overrides them per table.
+
+        :param names:       The table names
+        :return:            The (capacity, ttl) by table name
+        """
+
+        # Results
+        bounds = {}
+
+        tables = self._get_config('TABLES', {})
+        capacity = int(self._get_config('capacity', TABLE_CAPACITY))
+        ttl = float(self._get_config('ttl', TTL))
+
+        for name in names:
+            if name.startswith('KNOWN_'):
+                continue
+            table = tables.get(name, {})
+            bounds[name] = (
+                int(table.get('capacity', capacity)),
+                float(table.get('ttl', ttl))
+            )
+        return bounds
+
+    def _observe(self, name, key, time, length, build):
+        """
+        Counts a packet in the row of its conversation, the row is
+        only built for a new conversation.
+
+        :param name:        The table name
+        :param key:         The conversation key
+        :param time:        The capture time
+        :param length:      The bytes of the packet
+        :param build:       Returns the fields of a new row
+        :return:
+        """
+
+        self._database.get_table(name).add(key, build, time, length)
+        return
+
     @abstractmethod
     def _correlate(self, packet):
         """
@@ -239,6 +930,16 @@ class NetworkProbe(Probe):
         """
         raise NotImplemented
 
+    def _correlate_batch(self, batch):
+        """
+        Correlates a batch of decoded frames, only the probes
+        that are batched implement it.
+
+        :param batch:       The frame batch
+        :return:
+        """
+        raise NotImplemented
+
     @abstractmethod
     def _setup_db(self):
         """
@@ -250,47 +951,52 @@ class NetworkProbe(Probe):
         raise NotImplemented
 
 
-    def __process(self, packet):
+    def process(self, packet):
         """
         This is the processing method that is used to process the
         packets in order to filter and create reports internally.
+        It is called by the capture engine for every packet that
+        holds the layers of the probe, the engine schedules the
+        reports.
 
         :packet:            The packet that was sniffed
         :return:
         """
 
-        # Report bool
-        reported = False
-
         self._packet_count     += 1
-        self._packet_counter   += 1
 
-        # Cycle through the probe table
-        for probe in self._probe_table.keys():
+        # Execute the probe, a packet that fails to correlate must
+        # not stop the capture of the iface
+        try:
+            self.execute(
+                packet
+            )
+        except Exception:
+            self.logger.exception(
+                "[-] Correlation failed"
+            )
+        return
 
-            # Get the layer
-            layers = self._probe_table[probe]['layers']
-            object = self._probe_table[probe]['object']
+    def process_batch(self, batch):
+        """
+        This is the processing method of the batch mode. It is
+        called by the capture engine with the rows of a batch that
+        hold the layers of the probe.
 
-            # Check to see if the layers are satisfied
-            for layer in layers:
+        :batch:             The frame batch
+        :return:
+        """
 
-                # If there is a missing layer
-                if not packet.haslayer(layer):
-                    return
+        self._packet_count     += batch.count
+        self._packet_counter   += batch.count
 
-            print("*** Found a good packet to read.")
-            # Execute the probe
-            object.execute(
-                packet
+        # Correlate the whole batch
+        try:
+            self._correlate_batch(
+                batch
             )
-
-            # Check the packet count to report...
-            if self._packet_count >= PACKET_REPORT_MAX:
-                object.report()
-                reported = True
-
-        if reported:
-            reported = False
-            self._packet_counter = 0
-        return
\ No newline at end of file
+        except Exception:
+            self.logger.exception(
+                "[-] Correlation failed"
+            )
+        return
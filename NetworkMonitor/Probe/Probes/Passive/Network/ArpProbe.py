@@ -74,16 +74,28 @@ class ArpProbe(MacProbe):
     # Layer filter
     layers          = [ARP]
 
+    # Correlates the raw decoded headers
+    decoder         = DECODE_RAW
+
+    # Only reads the headers
+    snaplen         = SNAPLEN_HEADERS
+
+    # Does not count the distinct senders
+    distinct        = []
+
     # ====================
     # Protected
     # ====================
 
     # Local database tables
     _tables         = [
-        'KNOWN_MAC',
         'UNKNOWN_MAC'
     ]
 
+    # The hash indexed fields of the tables
+    _indexes        = {
+    }
+
     # ====================
     # Private
     # ====================
@@ -124,51 +136,17 @@ class ArpProbe(MacProbe):
         )
         return
 
-    def __setup_db(self):
+    def _get_known(self):
         """
-        Setup the probe specific database.
+        Returns the known MAC addresses of the known_mac configs,
+        formatted like the captured ones. The known configs of the
+        MAC probe are read if there is no known_mac.
+
         :return:
         """
-        # Create a database
-        self._database = ProbeDb(
-            self._configs['name']
-        )
-
-        # Setup the known database
-        if self.behaviour == PROBE_MONITORING:
-
-            # We need to check the already registered ips
-            self._database.setup_db(
-                self._tables
-            )
-
-            # Get the table
-            table = self._database.get_table('KNOWN_MAC')
-
-            # Add the entries to the internal db
-            for mac in self._configs['known_mac']:
-
-                # Add the Ips in the known table
-                table.insert(
-                    {
-                        'type'          : 'MAC',
-                        'address'       : mac,
-                    }
-                )
-
-        elif self.behaviour == PROBE_OBSERVING:
-
-            # Create a new table
-            tables = [
-                'MAC'
-            ]
-
-            # We need to check the already registered ips
-            self._database.setup_db(
-                tables
-            )
-        return
 
+        macs = self._get_config('known_mac', self._get_config('known', []))
+        return [self._format_mac(mac) for mac in macs]
 
     def _correlate(self, pkt):
         """
@@ -184,15 +162,30 @@ class ArpProbe(MacProbe):
         src_mac         = pkt[ARP].hwsrc
         dest_ip         = pkt[ARP].pdst
         src_ip          = pkt[ARP].psrc
+        pkt_time        = float(pkt.time)
+
+        # The sender binds its IP address to its MAC address
+        self._see_device(src_mac, pkt_time, src_ip)
+
+        # Count the packet in its conversation
+        if self.behaviour == PROBE_OBSERVING and self._aggregate:
+            self._observe(
+                'MAC', (src_mac, src_ip, dest_mac, dest_ip), pkt_time,
+                getattr(pkt, 'wirelen', None) or 0,
+                lambda : {
+                    'type'          : 'ARP|IP',
+                    'src_mac'       : src_mac,
+                    'src_ip'        : src_ip,
+                    'dst_mac'       : dest_mac,
+                    'dst_ip'        : dest_ip
+                }
+            )
+            return
 
         dest_data = {
             'type'          : 'ARP|IP',
             'seq'           : self._packet_count,
-            'time'          : time.asctime(
-                time.localtime(
-                    time.time()
-                )
-            ),
+            'time'          : pkt_time,
             'mac'           : dest_mac,
             'ip'            : dest_ip
         }
@@ -200,11 +193,7 @@ class ArpProbe(MacProbe):
         src_data = {
             'type'          : 'ARP|IP',
             'seq'           : self._packet_count,
-            'time'          : time.asctime(
-                time.localtime(
-                    time.time()
-                )
-            ),
+            'time'          : pkt_time,
             'mac'           : src_mac,
             'ip'            : src_ip
         }
@@ -217,22 +206,19 @@ class ArpProbe(MacProbe):
             unknown_table = self._database.get_table(
                 'UNKNOWN_MAC'
             )
-            known_table = self._database.get_table(
-                'KNOWN_MAC'
-            )
-            src_pkt = known_table.search(
-                Query().address == src_mac
+            src_known = self._is_known_device(
+                src_mac
             )
-            dest_pkt = known_table.search(
-                Query().address == dest_mac
+            dest_known = self._is_known_device(
+                dest_mac
             )
-            if dest_pkt is None:
+            if not dest_known:
 
                 # We have an unknown destination ip
                 unknown_table.insert(
                     dest_data
                 )
-            if src_pkt is None:
+            if not src_known:
 
                 # We have an unknown destination ip
                 unknown_table.insert(
@@ -24,7 +24,6 @@ Imports
 =============================================
 """
 
-import time
 from netaddr import *
 from tinydb import Query
 from scapy.layers.dns import *
@@ -81,6 +80,22 @@ class DnsProbe(IpProbe):
     # Layer filter
     layers          = [DNS, IP]
 
+    # Needs the full scapy dissection
+    decoder         = DECODE_SCAPY
+
+    # Correlates the frames one at a time
+    batched         = False
+
+    # Reads the whole frame
+    snaplen         = SNAPLEN_MAX
+
+    # Does not rank the top talkers nor count the distinct values
+    talkers         = False
+    distinct        = []
+
+    # Does not update the device registry
+    registry        = False
+
     # ====================
     # Protected
     # ====================
@@ -91,6 +106,11 @@ class DnsProbe(IpProbe):
         'UNKNOWN_DNS',
     ]
 
+    # The hash indexed fields of the tables
+    _indexes        = {
+        'KNOWN_DNS'     : ['address']
+    }
+
     # ====================
     # Private
     # ====================
@@ -108,7 +128,9 @@ class DnsProbe(IpProbe):
         """
         # Create a database
         self._database = ProbeDb(
-            self._configs['name']
+            self._configs['name'],
+            self._get_config('store', TABLE_STORE),
+            int(self._get_config('stripes', TABLE_STRIPES))
         )
 
         # Setup the known database
@@ -116,7 +138,9 @@ class DnsProbe(IpProbe):
 
             # We need to check the already registered ips
             self._database.setup_db(
-                self._tables
+                self._tables,
+                self._indexes,
+                self._get_bounds(self._tables)
             )
 
             # Get the table
@@ -129,7 +153,7 @@ class DnsProbe(IpProbe):
                 table.insert(
                     {
                         'type'          : 'DNS',
-                        'address'       : dns,
+                        'address'       : self.__format_name(dns),
                     }
                 )
         elif self.behaviour == PROBE_OBSERVING:
@@ -140,11 +164,24 @@ class DnsProbe(IpProbe):
             ]
 
             # We need to check the already registered ips
-            self._database.setup_db(
+            self._setup_observed(
                 tables
             )
         return
 
+    def __format_name(self, name):
+        """
+        Formats a DNS name for the known names, lower case and
+        without the trailing dot.
+
+        :param name:            The DNS name
+        :return:
+        """
+
+        if isinstance(name, bytes):
+            name = name.decode('utf-8', 'replace')
+        return name.strip().rstrip('.').lower()
+
     def _correlate(self, pkt):
         """
         This is the correlation algorithm that will look at the databases and
@@ -165,15 +202,28 @@ class DnsProbe(IpProbe):
 
         # Get the DNS name
         dns_name        = pkt[DNS]
+        pkt_time        = float(pkt.time)
+
+        # Count the packet in its conversation
+        if self.behaviour == PROBE_OBSERVING and self._aggregate:
+            query = self.__format_name(pkt[DNSQR].qname) \
+                if DNSQR in pkt else None
+            self._observe(
+                'DNS', (src, dst, query), pkt_time, ip_len,
+                lambda : {
+                    'type'          : 'DNS|IP',
+                    'src'           : src,
+                    'dst'           : dst,
+                    'query'         : query,
+                    'version'       : ip_version
+                }
+            )
+            return
 
         dns_data = {
             'type'          : 'DNS|IP',
             'seq'           : self._packet_count,
-            'time'          : time.asctime(
-                time.localtime(
-                    time.time()
-                )
-            ),
+            'time'          : pkt_time,
             'dns'           : dns_name.__dict__,
             'src'           : src,
             'dst'           : dst,
@@ -195,10 +245,10 @@ class DnsProbe(IpProbe):
             known_table = self._database.get_table(
                 'KNOWN_DNS'
             )
-            pkt = known_table.search(
-                Query().address == dns_name
+            known = DNSQR in pkt and known_table.has(
+                'address', self.__format_name(pkt[DNSQR].qname)
             )
-            if pkt is None:
+            if not known:
 
                 # We have an unknown destination ip
                 unknown_table.insert(
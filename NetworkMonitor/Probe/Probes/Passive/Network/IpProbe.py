@@ -24,14 +24,21 @@ Imports
 =============================================
 """
 
-import time
 from netaddr import *
 from tinydb import Query
 from scapy.layers.all import *
 from scapy.layers.inet import *
 
+from NetworkMonitor.Storage.PrefixTrie \
+    import PrefixTrie
 from NetworkMonitor.Storage.ProbeDb \
     import ProbeDb
+from NetworkMonitor.Probe.Capture.Batch \
+    import aggregate, first_rows, build_networks, match_networks, \
+    map_rows, format_ipv4, format_mac, unique_values, is_available, \
+    LAYER_FLAGS
+from NetworkMonitor.Probe.Capture.Decoder \
+    import ETH_P_8021Q
 from NetworkMonitor.Probe.Probes.Passive.PassiveNetworkProbe \
     import *
 
@@ -86,6 +93,27 @@ class IpProbe(PassiveNetworkProbe):
     # Layer filter
     layers          = [Ether, IP]
 
+    # Correlates the raw decoded headers
+    decoder         = DECODE_RAW
+
+    # Correlates whole frame batches
+    batched         = True
+
+    # Only reads the headers
+    snaplen         = SNAPLEN_HEADERS
+
+    # Ranks the top talkers
+    talkers         = True
+
+    # Counts the distinct addresses
+    distinct        = [
+        'src_ip',
+        'dst_ip'
+    ]
+
+    # Updates the device registry of the node
+    registry        = True
+
     # ====================
     # Protected
     # ====================
@@ -96,6 +124,20 @@ class IpProbe(PassiveNetworkProbe):
         'UNKNOWN_IP'
     ]
 
+    # The hash indexed fields of the tables
+    _indexes        = {
+    }
+
+    # The known ips and networks, longest prefix matched
+    _known_trie     = None
+
+    # The batch columns of the distinct dimensions
+    _batch_columns  = {
+        'src_ip'    : 'src_ip',
+        'dst_ip'    : 'dst_ip',
+        'dst_port'  : 'dport'
+    }
+
     # ====================
     # Private
     # ====================
@@ -106,6 +148,9 @@ class IpProbe(PassiveNetworkProbe):
     # Time
     _date          = None
 
+    # The packed known networks of the batch mode
+    _known_networks = None
+
     def __init__(self, queue, configs):
         """
         This is the default constructor for the class.
@@ -143,7 +188,9 @@ class IpProbe(PassiveNetworkProbe):
         """
         # Create a database
         self._database = ProbeDb(
-            self._configs['name']
+            self._configs['name'],
+            self._get_config('store', TABLE_STORE),
+            int(self._get_config('stripes', TABLE_STRIPES))
         )
 
         # Setup the known database
@@ -151,39 +198,15 @@ class IpProbe(PassiveNetworkProbe):
 
             # We need to check the already registered ips
             self._database.setup_db(
-                self._tables
+                self._tables,
+                self._indexes,
+                self._get_bounds(self._tables)
             )
 
-            # Get the table
-            table = self._database.get_table('KNOWN_IP')
-
-            # Add the entries to the internal db
-            for ip in self._configs['known']:
-
-                # We need to convert it into a supported IP
-                # This IP can be a subnet IP that needs to be put into a list
-                address = self.__get_address(
-                    ip
-                )
-
-                if type(address) is list():
-                    for ip in address:
-
-                        # Add the Ips in the known table
-                        table.insert(
-                            {
-                                'type'          : 'IP',
-                                'address'       : ip,
-                            }
-                        )
-                else:
-                    # Add the Ips in the known table
-                    table.insert(
-                        {
-                            'type'          : 'IP',
-                            'address'       : ip,
-                        }
-                    )
+            # Add the known ips and networks
+            self._setup_known_ips(
+                self._configs['known']
+            )
         elif self.behaviour == PROBE_OBSERVING:
 
             # Create a new table
@@ -192,7 +215,7 @@ class IpProbe(PassiveNetworkProbe):
             ]
 
             # We need to check the already registered ips
-            self._database.setup_db(
+            self._setup_observed(
                 tables
             )
         return
@@ -217,15 +240,34 @@ class IpProbe(PassiveNetworkProbe):
         ip_version      = pkt[IP].version
         ip_id           = pkt[IP].id
         ip_ttl          = pkt[IP].ttl
+        pkt_time        = float(pkt.time)
+
+        # Rank the sender and count the addresses
+        self._count_talker(src_ip, ip_len)
+        self._count_distinct('src_ip', src_ip)
+        self._count_distinct('dst_ip', dest_ip)
+        self._see_device(src_mac, pkt_time, src_ip)
+
+        # Count the packet in its conversation
+        if self.behaviour == PROBE_OBSERVING and self._aggregate:
+            self._observe(
+                'IP', (src_ip, dest_ip), pkt_time, ip_len,
+                lambda : {
+                    'type'          : 'IP|MAC',
+                    'src_ip'        : src_ip,
+                    'dst_ip'        : dest_ip,
+                    'src_mac'       : src_mac,
+                    'dst_mac'       : dest_mac,
+                    'iptype'        : type_mac,
+                    'version'       : ip_version
+                }
+            )
+            return
 
         dest_data = {
             'type'          : 'IP|MAC',
             'seq'           : self._packet_count,
-            'time'          : time.asctime(
-                time.localtime(
-                    time.time()
-                )
-            ),
+            'time'          : pkt_time,
             'mac'           : dest_mac,
             'iptype'        : type_mac,
             'length'        : ip_len,
@@ -239,11 +281,7 @@ class IpProbe(PassiveNetworkProbe):
         src_data = {
             'type'          : 'IP|MAC',
             'seq'           : self._packet_count,
-            'time'          : time.asctime(
-                time.localtime(
-                    time.time()
-                )
-            ),
+            'time'          : pkt_time,
             'mac'           : src_mac,
             'iptype'        : type_mac,
             'length'        : ip_len,
@@ -262,22 +300,15 @@ class IpProbe(PassiveNetworkProbe):
             unknown_table = self._database.get_table(
                 'UNKNOWN_IP'
             )
-            known_table = self._database.get_table(
-                'KNOWN_IP'
-            )
-            src_pkt = known_table.search(
-                Query().address == src_ip
-            )
-            dest_pkt = known_table.search(
-                Query().address == dest_ip
-            )
-            if dest_pkt is None:
+            src_known = src_ip in self._known_trie
+            dest_known = dest_ip in self._known_trie
+            if not dest_known:
 
                 # We have an unknown destination ip
                 unknown_table.insert(
                     dest_data
                 )
-            if src_pkt is None:
+            if not src_known:
 
                 # We have an unknown destination ip
                 unknown_table.insert(
@@ -297,38 +328,289 @@ class IpProbe(PassiveNetworkProbe):
             )
         return
 
-    def __get_address(self, ip):
+    def _correlate_batch(self, batch):
         """
-        This is the method that is used to get the ip address
-        or network that is needed in the probing.
+        This is the correlation algorithm of the batch mode. The
+        known addresses are checked for the whole batch at once, the
+        rows are inserted with the records of the packet mode.
 
-        :param ip:              The ip address or the ip network
+        :param batch:           The frame batch
         :return:
         """
 
-        # Container
-        addresses = []
+        # Rank the senders and count the addresses
+        self._count_batch_talkers(batch)
+        self._count_batch_distinct(batch)
+        self._see_batch_devices(batch)
 
-        # Generator
-        generate_ip = lambda address : addresses.append(
-                {
-                    'v4'    :   str(
-                        address.ipv4()
-                    ),
-                    'v6'    :   str(
-                        address.ipv6()
-                    )
-                }
+        # We check the dehaviour
+        if self.behaviour == PROBE_MONITORING:
+
+            # Get the table
+            unknown_table = self._database.get_table(
+                'UNKNOWN_IP'
+            )
+
+            # We have unknown ips, the destination then the source
+            self._insert_records(
+                unknown_table,
+                batch,
+                [
+                    ('dst', ~match_networks(
+                        batch['dst_ip'], self._known_networks
+                    )),
+                    ('src', ~match_networks(
+                        batch['src_ip'], self._known_networks
+                    ))
+                ]
+            )
+
+        # Count the packets in their conversations
+        elif self.behaviour == PROBE_OBSERVING and self._aggregate:
+            self._add_conversations(
+                self._database.get_table(
+                    'IP'
+                ),
+                batch,
+                ['src_ip', 'dst_ip']
+            )
+
+        # Just register the IP for logging
+        elif self.behaviour == PROBE_OBSERVING:
+            self._insert_records(
+                self._database.get_table(
+                    'IP'
+                ),
+                batch,
+                [
+                    ('src', None),
+                    ('dst', None)
+                ]
+            )
+        return
+
+    def _count_batch_talkers(self, batch):
+        """
+        Counts the bytes and packets of a batch in the top talkers,
+        once per source address.
+
+        :param batch:           The frame batch
+        :return:
+        """
+
+        if self._talkers is None:
+            return
+
+        unique, packets, totals, first, last = aggregate(
+            batch, ['src_ip']
         )
+        for index in range(len(unique)):
+            self._count_talker(
+                format_ipv4(unique['src_ip'][index]),
+                int(totals[index]),
+                int(packets[index])
+            )
+        return
 
-        # We have a network to generate
-        if '/' in ip:
-            network = list(IPNetwork(ip))
-            for address in network:
-                generate_ip(address)
-            return addresses
+    def _see_batch_devices(self, batch):
+        """
+        Records the senders of a batch in the device registry, once
+        per MAC and IP address pair.
+
+        :param batch:           The frame batch
+        :return:
+        """
+
+        if self._registry is None:
+            return
+
+        unique, packets, totals, first, last = aggregate(
+            batch, ['src_mac', 'src_ip']
+        )
+        for index in range(len(unique)):
+            self._registry.see(
+                format_mac(unique['src_mac'][index]),
+                float(last[index]),
+                format_ipv4(unique['src_ip'][index]),
+                float(first[index])
+            )
+        return
+
+    def _count_batch_distinct(self, batch):
+        """
+        Counts the distinct values of a batch, each dimension is a
+        column of the batch and each value is counted once. The
+        addresses are counted as strings, like in the packets.
+
+        :param batch:           The frame batch
+        :return:
+        """
+
+        for dimension in self._distinct.keys():
+            values = unique_values(batch[self._batch_columns[dimension]])
+            if dimension.endswith('_ip'):
+                values = [format_ipv4(value) for value in values]
+            for value in values:
+                self._count_distinct(dimension, value)
+        return
+
+    def _insert_records(self, table, batch, sides):
+        """
+        Inserts the rows of a batch with the records of the packet
+        mode, in the order of the rows and of the sides. The flags
+        of a side select its rows, None selects them all.
+
+        :param table:           The table to insert into
+        :param batch:           The frame batch
+        :param sides:           The (side, flags by row) to insert
+        :return:
+        """
+
+        # The sequence of the first row, the batch is counted
+        start = self._packet_count - batch.count
+
+        if any(flags is None for side, flags in sides):
+            indexes = range(batch.count)
         else:
-            return ip
+            selected = sides[0][1]
+            for side, flags in sides[1:]:
+                selected = selected | flags
+            indexes = selected.nonzero()[0]
+
+        for index in indexes:
+            row = batch.columns[index]
+            for side, flags in sides:
+                if flags is not None and not flags[index]:
+                    continue
+                table.insert(
+                    self._get_record(row, side, start + int(index) + 1)
+                )
+        return
+
+    def _add_conversations(self, table, batch, keys):
+        """
+        Aggregates the rows of a batch per conversation and adds
+        their totals to the conversation table, a new conversation
+        row is built from its first row like in the packet mode.
+
+        :param table:           The conversation table
+        :param batch:           The frame batch
+        :param keys:            The key column names
+        :return:
+        """
+
+        unique, packets, totals, first, last = aggregate(
+            batch, keys
+        )
+        rows = first_rows(batch, keys)
+
+        for index in range(len(unique)):
+            key, fields = self._get_conversation(
+                batch.columns[rows[index]]
+            )
+            table.add(
+                key,
+                lambda : fields,
+                float(last[index]),
+                int(totals[index]),
+                int(packets[index]),
+                float(first[index])
+            )
+        return
+
+    def _get_record(self, row, side, seq):
+        """
+        Returns the record of a side of a batch row, the same as
+        the packet mode.
+
+        :param row:             The batch row
+        :param side:            The side, src or dst
+        :param seq:             The sequence of the row
+        :return:
+        """
+        return {
+            'type'          : 'IP|MAC',
+            'seq'           : seq,
+            'time'          : float(row['time']),
+            'mac'           : format_mac(row[side + '_mac']),
+            'iptype'        : self.__get_ether_type(row),
+            'length'        : int(row['ip_len']),
+            'checksum'      : int(row['chksum']),
+            'ttl'           : int(row['ttl']),
+            'id'            : int(row['ip_id']),
+            'ip'            : format_ipv4(row[side + '_ip']),
+            'version'       : int(row['version'])
+        }
+
+    def _get_conversation(self, row):
+        """
+        Returns the conversation key and the fields of a new
+        conversation row of a batch row, the same as the packet
+        mode.
+
+        :param row:             The batch row
+        :return:
+        """
+
+        src_ip = format_ipv4(row['src_ip'])
+        dst_ip = format_ipv4(row['dst_ip'])
+        return (src_ip, dst_ip), {
+            'type'          : 'IP|MAC',
+            'src_ip'        : src_ip,
+            'dst_ip'        : dst_ip,
+            'src_mac'       : format_mac(row['src_mac']),
+            'dst_mac'       : format_mac(row['dst_mac']),
+            'iptype'        : self.__get_ether_type(row),
+            'version'       : int(row['version'])
+        }
+
+    def __get_ether_type(self, row):
+        """
+        Returns the type of the Ethernet header of a batch row, the
+        batch decodes the type behind a VLAN tag.
+
+        :param row:             The batch row
+        :return:
+        """
+
+        if row['layers'] & LAYER_FLAGS['Dot1Q']:
+            return ETH_P_8021Q
+        return int(row['ether_type'])
+
+    def _setup_known_ips(self, addresses):
+        """
+        Sets up the known ips and networks. Each one is put once in
+        the known table and as a prefix in the trie matched per
+        packet, a network is never expanded into its addresses.
+
+        :param addresses:       The ip addresses or the ip networks
+        :return:
+        """
+
+        # Get the table
+        table = self._database.get_table('KNOWN_IP')
+        self._known_trie = PrefixTrie()
+
+        # Add the entries to the internal db
+        for ip in addresses:
+            self._known_trie.insert(
+                ip
+            )
+
+            # Add the Ips in the known table
+            table.insert(
+                {
+                    'type'          : 'IP',
+                    'address'       : ip,
+                }
+            )
+
+        # Pack the known networks for the batch mode
+        if is_available():
+            self._known_networks = build_networks(
+                addresses
+            )
+        return
 
 
 
@@ -24,7 +24,6 @@ Imports
 =============================================
 """
 
-import time
 from netaddr import *
 from tinydb import Query
 from scapy.layers.inet6 import *
@@ -81,16 +80,33 @@ class MacProbe(PassiveNetworkProbe):
     # Layer filter
     layers          = [Ether, IP]
 
+    # Correlates the raw decoded headers
+    decoder         = DECODE_RAW
+
+    # Only reads the headers
+    snaplen         = SNAPLEN_HEADERS
+
+    # Counts the distinct senders
+    distinct        = [
+        'mac'
+    ]
+
+    # Updates the device registry of the node
+    registry        = True
+
     # ====================
     # Protected
     # ====================
 
     # Local database tables
     _tables         = [
-        'KNOWN_MAC',
         'UNKNOWN_MAC'
     ]
 
+    # The hash indexed fields of the tables
+    _indexes        = {
+    }
+
     # ====================
     # Private
     # ====================
@@ -139,7 +155,9 @@ class MacProbe(PassiveNetworkProbe):
         """
         # Create a database
         self._database = ProbeDb(
-            self._configs['name']
+            self._configs['name'],
+            self._get_config('store', TABLE_STORE),
+            int(self._get_config('stripes', TABLE_STRIPES))
         )
 
         # Setup the known database
@@ -147,22 +165,13 @@ class MacProbe(PassiveNetworkProbe):
 
             # We need to check the already registered ips
             self._database.setup_db(
-                self._tables
+                self._tables,
+                self._indexes,
+                self._get_bounds(self._tables)
             )
 
-            # Get the table
-            table = self._database.get_table('KNOWN_MAC')
-
-            # Add the entries to the internal db
-            for mac in self._configs['known']:
-
-                # Add the Ips in the known table
-                table.insert(
-                    {
-                        'type'          : 'MAC',
-                        'address'       : mac,
-                    }
-                )
+            # The known devices are checked in the registry of the node
+            self._learn_devices(self._get_known())
         elif self.behaviour == PROBE_OBSERVING:
 
             # Create a new table
@@ -171,11 +180,30 @@ class MacProbe(PassiveNetworkProbe):
             ]
 
             # We need to check the already registered ips
-            self._database.setup_db(
+            self._setup_observed(
                 tables
             )
         return
 
+    def _get_known(self):
+        """
+        Returns the known MAC addresses of the configs, formatted
+        like the captured ones.
+
+        :return:
+        """
+        return [self._format_mac(mac) for mac in self._configs['known']]
+
+    def _format_mac(self, mac):
+        """
+        Formats a configured MAC address like the captured ones,
+        lower case and colon separated.
+
+        :param mac:             The MAC address
+        :return:
+        """
+        return str(mac).strip().lower().replace('-', ':')
+
     def _correlate(self, pkt):
         """
         This is the correlation algorithm that will look at the databases and
@@ -196,15 +224,32 @@ class MacProbe(PassiveNetworkProbe):
         ip_version      = pkt[IP].version
         ip_id           = pkt[IP].id
         ip_ttl          = pkt[IP].ttl
+        pkt_time        = float(pkt.time)
+
+        # Count the sender and record it in the registry
+        self._count_distinct('mac', src_mac)
+        self._see_device(src_mac, pkt_time, src_ip)
+
+        # Count the packet in its conversation
+        if self.behaviour == PROBE_OBSERVING and self._aggregate:
+            self._observe(
+                'MAC', (src_mac, dest_mac), pkt_time, ip_len,
+                lambda : {
+                    'type'          : 'IP|MAC',
+                    'src_mac'       : src_mac,
+                    'dst_mac'       : dest_mac,
+                    'mactype'       : type_mac,
+                    'src_ip'        : src_ip,
+                    'dst_ip'        : dest_ip,
+                    'ver'           : ip_version
+                }
+            )
+            return
 
         dest_data = {
             'type'          : 'IP|MAC',
             'seq'           : self._packet_count,
-            'time'          : time.asctime(
-                time.localtime(
-                    time.time()
-                )
-            ),
+            'time'          : pkt_time,
             'mac'           : dest_mac,
             'mactype'       : type_mac,
             'length'        : ip_len,
@@ -218,11 +263,7 @@ class MacProbe(PassiveNetworkProbe):
         src_data = {
             'type'          : 'IP|MAC',
             'seq'           : self._packet_count,
-            'time'          : time.asctime(
-                time.localtime(
-                    time.time()
-                )
-            ),
+            'time'          : pkt_time,
             'mac'           : src_mac,
             'mactype'       : type_mac,
             'length'        : ip_len,
@@ -242,22 +283,19 @@ class MacProbe(PassiveNetworkProbe):
             unknown_table = self._database.get_table(
                 'UNKNOWN_MAC'
             )
-            known_table = self._database.get_table(
-                'KNOWN_MAC'
-            )
-            src_pkt = known_table.search(
-                Query().address == src_mac
+            src_known = self._is_known_device(
+                src_mac
             )
-            dest_pkt = known_table.search(
-                Query().address == dest_mac
+            dest_known = self._is_known_device(
+                dest_mac
             )
-            if dest_pkt is None:
+            if not dest_known:
 
                 # We have an unknown destination ip
                 unknown_table.insert(
                     dest_data
                 )
-            if src_pkt is None:
+            if not src_known:
 
                 # We have an unknown destination ip
                 unknown_table.insert(
@@ -25,6 +25,8 @@ Imports
 
 from NetworkMonitor.Probe.Probes.Passive.Network.IpProbe \
     import *
+from NetworkMonitor.Storage.AccessList \
+    import AccessList, AclRule, ACL_ALLOW, ACL_DENY
 
 """
 =============================================
@@ -77,6 +79,22 @@ class TcpProbe(IpProbe):
     # Layer filter
     layers          = [TCP, IP]
 
+    # Correlates the raw decoded headers
+    decoder         = DECODE_RAW
+
+    # Correlates whole frame batches
+    batched         = True
+
+    # Only reads the headers
+    snaplen         = SNAPLEN_HEADERS
+
+    # Counts the distinct addresses and services
+    distinct        = [
+        'src_ip',
+        'dst_ip',
+        'dst_port'
+    ]
+
     # ====================
     # Protected
     # ====================
@@ -85,7 +103,6 @@ class TcpProbe(IpProbe):
     _tables         = [
         'KNOWN_IP',
         'UNKNOWN_IP',
-        'KNOWN_PORT',
     ]
 
     # ====================
@@ -98,6 +115,9 @@ class TcpProbe(IpProbe):
     # Time
     _date          = None
 
+    # The compiled access list of the known ips and ports
+    _acl            = None
+
     def _setup_db(self):
         """
         Setup the probe specific database.
@@ -105,7 +125,9 @@ class TcpProbe(IpProbe):
         """
         # Create a database
         self._database = ProbeDb(
-            self._configs['name']
+            self._configs['name'],
+            self._get_config('store', TABLE_STORE),
+            int(self._get_config('stripes', TABLE_STRIPES))
         )
 
         # Setup the known database
@@ -113,52 +135,18 @@ class TcpProbe(IpProbe):
 
             # We need to check the already registered ips
             self._database.setup_db(
-                self._tables
+                self._tables,
+                self._indexes,
+                self._get_bounds(self._tables)
             )
 
-            # Get the table
-            table = self._database.get_table('KNOWN_IP')
-
-            # Add the entries to the internal db
-            for ip in self._configs['known_ip']:
-
-                # We need to convert it into a supported IP
-                # This IP can be a subnet IP that needs to be put into a list
-                address = self.__get_address(
-                    ip
-                )
-
-                if type(address) is list():
-                    for ip in address:
-
-                        # Add the Ips in the known table
-                        table.insert(
-                            {
-                                'type'          : 'IP',
-                                'address'       : ip,
-                            }
-                        )
-                else:
-                    # Add the Ips in the known table
-                    table.insert(
-                        {
-                            'type'          : 'IP',
-                            'address'       : ip,
-                        }
-                    )
-            # Get the table
-            table = self._database.get_table('KNOWN_PORT')
-
-            # Add the entries to the internal db
-            for port in self._configs['known_port']:
+            # Add the known ips and networks
+            self._setup_known_ips(
+                self._configs['known_ip']
+            )
 
-                # Add the Ips in the known table
-                table.insert(
-                    {
-                        'type'          : 'PORT',
-                        'port'          : port,
-                    }
-                )
+            # Compile the access list of the endpoints
+            self._acl = self._setup_acl()
         elif self.behaviour == PROBE_OBSERVING:
 
             # Create a new table
@@ -167,7 +155,7 @@ class TcpProbe(IpProbe):
             ]
 
             # We need to check the already registered ips
-            self._database.setup_db(
+            self._setup_observed(
                 tables
             )
         return
@@ -191,6 +179,7 @@ class TcpProbe(IpProbe):
         ip_version          = pkt[IP].version
         ip_id               = pkt[IP].id
         ip_ttl              = pkt[IP].ttl
+        ip_time             = float(pkt.time)
 
         # Correlate IP
         self._correlate_ip(
@@ -198,26 +187,216 @@ class TcpProbe(IpProbe):
                 dst_ip,     dst_port,
                 ip_len,     ip_chksum,
                 ip_version, ip_id,
-                ip_ttl
+                ip_ttl,     ip_time
+        )
+        return
+
+    def _correlate_batch(self, batch):
+        """
+        This is the correlation algorithm of the batch mode. The
+        known ips and ports are checked for the whole batch at once,
+        the rows are inserted with the records of the packet mode.
+
+        :param batch:           The frame batch
+        :return:
+        """
+
+        # Rank the senders and count the addresses and services
+        self._count_batch_talkers(batch)
+        self._count_batch_distinct(batch)
+        self._see_batch_ports(batch)
+
+        # We check the dehaviour
+        if self.behaviour == PROBE_MONITORING:
+
+            # Get the table
+            unknown_table = self._database.get_table(
+                'UNKNOWN_IP'
+            )
+            protocol = self.type.lower()
+            verdicts = map_rows(
+                batch,
+                ['src_ip', 'sport', 'dst_ip', 'dport'],
+                lambda row : self._acl.evaluate(
+                    format_ipv4(row['src_ip']), int(row['sport']),
+                    format_ipv4(row['dst_ip']), int(row['dport']),
+                    protocol
+                )
+            )
+
+            # The unknown destination, else the unknown source
+            src_known = verdicts[:, 0]
+            dst_known = verdicts[:, 1]
+            self._insert_records(
+                unknown_table,
+                batch,
+                [
+                    ('dst', ~dst_known),
+                    ('src', dst_known & ~src_known)
+                ]
+            )
+
+        # Count the packets in their conversations
+        elif self.behaviour == PROBE_OBSERVING and self._aggregate:
+            self._add_conversations(
+                self._database.get_table(
+                    'TCP'
+                ),
+                batch,
+                ['src_ip', 'sport', 'dst_ip', 'dport']
+            )
+
+        # Just register the IP for logging
+        elif self.behaviour == PROBE_OBSERVING:
+            self._insert_records(
+                self._database.get_table(
+                    'TCP'
+                ),
+                batch,
+                [
+                    ('src', None),
+                    ('dst', None)
+                ]
+            )
+        return
+
+    def _get_record(self, row, side, seq):
+        """
+        Returns the record of a side of a batch row, the same as
+        the packet mode.
+
+        :param row:             The batch row
+        :param side:            The side, src or dst
+        :param seq:             The sequence of the row
+        :return:
+        """
+        return {
+            'type'          : 'IP|PORT',
+            'seq'           : seq,
+            'time'          : float(row['time']),
+            'ip'            : format_ipv4(row[side + '_ip']),
+            'port'          : int(row[side[0] + 'port']),
+            'length'        : int(row['ip_len']),
+            'checksum'      : int(row['chksum']),
+            'ttl'           : int(row['ttl']),
+            'id'            : int(row['ip_id']),
+            'version'       : int(row['version'])
+        }
+
+    def _get_conversation(self, row):
+        """
+        Returns the conversation key and the fields of a new
+        conversation row of a batch row, the same as the packet
+        mode.
+
+        :param row:             The batch row
+        :return:
+        """
+
+        src_ip = format_ipv4(row['src_ip'])
+        dst_ip = format_ipv4(row['dst_ip'])
+        sport = int(row['sport'])
+        dport = int(row['dport'])
+        return (src_ip, sport, dst_ip, dport), {
+            'type'          : 'IP|PORT',
+            'src_ip'        : src_ip,
+            'sport'         : sport,
+            'dst_ip'        : dst_ip,
+            'dport'         : dport,
+            'version'       : int(row['version'])
+        }
+
+    def _setup_acl(self):
+        """
+        Compiles the access list of the endpoints. The acl rules of
+        the configs are used if any, else the known ips and ports
+        are allowed and the other endpoints denied.
+
+        :return:
+        """
+
+        rules = self._get_config('acl')
+        if rules:
+            if not isinstance(rules, list):
+                rules = [rules]
+            acl = AccessList(
+                rules,
+                self._get_config('acl_default', ACL_DEFAULT),
+                int(self._get_config('acl_cache', ACL_CACHE))
+            )
+        else:
+            acl = AccessList(
+                [
+                    AclRule(
+                        ACL_ALLOW,
+                        self._configs['known_ip'],
+                        self._configs['known_port']
+                    )
+                ],
+                ACL_DENY,
+                int(self._get_config('acl_cache', ACL_CACHE))
+            )
+        acl.compile()
+        return acl
+
+    def _see_batch_ports(self, batch):
+        """
+        Records the ports reached in a batch in the device registry,
+        once per destination address and port.
+
+        :param batch:           The frame batch
+        :return:
+        """
+
+        if self._registry is None:
+            return
+
+        unique, packets, totals, first, last = aggregate(
+            batch, ['dst_ip', 'dport']
         )
+        for index in range(len(unique)):
+            self._registry.see_port(
+                format_ipv4(unique['dst_ip'][index]),
+                int(unique['dport'][index]),
+                float(last[index])
+            )
         return
 
     def _correlate_ip(self, src, src_port, dst, dst_port,
-                      ip_len, ip_chksum, ip_version, ip_id, ip_ttl):
+                      ip_len, ip_chksum, ip_version, ip_id, ip_ttl,
+                      ip_time):
         """
-        Correlate the ip addresses.
+        Correlate the ip addresses, ip_time is the capture time.
 
         :return:
         """
 
+        # Rank the sender and count the addresses and services
+        self._count_talker(src, ip_len)
+        self._count_distinct('src_ip', src)
+        self._count_distinct('dst_ip', dst)
+        self._count_distinct('dst_port', dst_port)
+        self._see_port(dst, dst_port, ip_time)
+
+        # Count the packet in its conversation
+        if self.behaviour == PROBE_OBSERVING and self._aggregate:
+            self._observe(
+                'TCP', (src, src_port, dst, dst_port), ip_time, ip_len,
+                lambda : {
+                    'type'          : 'IP|PORT',
+                    'src_ip'        : src,
+                    'sport'         : src_port,
+                    'dst_ip'        : dst,
+                    'dport'         : dst_port,
+                    'version'       : ip_version
+                }
+            )
+            return
+
         dest_data = {
             'type'          : 'IP|PORT',
             'seq'           : self._packet_count,
-            'time'          : time.asctime(
-                time.localtime(
-                    time.time()
-                )
-            ),
+            'time'          : ip_time,
             'ip'            : dst,
             'port'          : dst_port,
             'length'        : ip_len,
@@ -230,11 +409,7 @@ class TcpProbe(IpProbe):
         src_data = {
             'type'          : 'IP|PORT',
             'seq'           : self._packet_count,
-            'time'          : time.asctime(
-                time.localtime(
-                    time.time()
-                )
-            ),
+            'time'          : ip_time,
             'ip'            : src,
             'port'          : src_port,
             'length'        : ip_len,
@@ -249,41 +424,22 @@ class TcpProbe(IpProbe):
 
             # We need to check the validity of the ip
             # Get the table
-            known_ip_table = self._database.get_table(
-                'KNOWN_IP'
-            )
             unknown_table = self._database.get_table(
                 'UNKNOWN_IP'
             )
-            known_port_table = self._database.get_table(
-                'KNOWN_PORT'
-            )
 
-            # Address
-            src_pkt_q = known_ip_table.search(
-                Query().address == src
-            )
-            dst_pkt_q = known_ip_table.search(
-                Query().address == dst
-            )
-
-            # Port
-            src_port_q = known_port_table.search(
-                Query().address == src_port
-            )
-            dst_port_q = known_port_table.search(
-                Query().address == dst_port
+            # Both endpoints in one access list lookup
+            src_known, dst_known = self._acl.evaluate(
+                src, src_port, dst, dst_port, self.type.lower()
             )
 
-            if (dst_pkt_q is None) or \
-                    (dst_port_q is None):
+            if not dst_known:
 
                 # We have an unknown destination ip
                 unknown_table.insert(
                     dest_data
                 )
-            elif (src_pkt_q is None) or \
-                    (src_port_q is None):
+            elif not src_known:
 
                 # We have an unknown destination ip
                 unknown_table.insert(
@@ -79,6 +79,15 @@ class UdpProbe(TcpProbe):
     # Layer filter
     layers          = [UDP, IP]
 
+    # Correlates the raw decoded headers
+    decoder         = DECODE_RAW
+
+    # Correlates whole frame batches
+    batched         = True
+
+    # Only reads the headers
+    snaplen         = SNAPLEN_HEADERS
+
     # ====================
     # Protected
     # ====================
@@ -87,7 +96,6 @@ class UdpProbe(TcpProbe):
     _tables         = [
         'KNOWN_IP',
         'UNKNOWN_IP',
-        'KNOWN_PORT',
     ]
 
     # ====================
@@ -119,6 +127,7 @@ class UdpProbe(TcpProbe):
         ip_version          = pkt[IP].version
         ip_id               = pkt[IP].id
         ip_ttl              = pkt[IP].ttl
+        ip_time             = float(pkt.time)
 
         # Correlate IP
         self._correlate_ip(
@@ -126,7 +135,7 @@ class UdpProbe(TcpProbe):
                 dst_ip,     dst_port,
                 ip_len,     ip_chksum,
                 ip_version, ip_id,
-                ip_ttl
+                ip_ttl,     ip_time
         )
         return
 
@@ -0,0 +1,503 @@
+"""
+
+    :AccessList:
+    ==========
+
+    :
+    This is the access list of the monitoring probes. A rule allows
+    or denies the networks, the port ranges and the protocols of an
+    endpoint, in the inbound (destination), outbound (source) or any
+    direction, and the first rule matching an endpoint decides it.
+    The rules are compiled in bitmaps, bit n for rule n: a prefix
+    trie gives the rules holding an address, the port intervals the
+    rules holding a port and the protocol and direction masks the
+    rest. Their AND holds the matching rules and its lowest bit is
+    the first one, thus a lookup costs two trie walks and a binary
+    search whatever the number of rules.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import bisect
+import socket
+
+from NetworkMonitor.Storage.PrefixTrie \
+    import PrefixTrie, parse_prefix
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+ACL_ACTIONS = [
+    'allow',
+    'deny'
+]
+ACL_ALLOW = ACL_ACTIONS[0]
+ACL_DENY = ACL_ACTIONS[1]
+
+ACL_DIRECTIONS = [
+    'in',
+    'out',
+    'any'
+]
+ACL_IN = ACL_DIRECTIONS[0]
+ACL_OUT = ACL_DIRECTIONS[1]
+ACL_ANY = ACL_DIRECTIONS[2]
+
+# The wildcard of a rule field
+ACL_WILDCARD        = '*'
+
+# The protocol names by number
+ACL_PROTOCOLS       = {
+    1               : 'icmp',
+    6               : 'tcp',
+    17              : 'udp'
+}
+
+# The whole port range
+ACL_PORTS           = (0, 65535)
+
+# The networks of a rule without networks
+ACL_NETWORKS        = ['0.0.0.0/0', '::/0']
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def parse_ports(ports):
+    """
+    Parses a port or a port range.
+
+    :param ports:           The ports, i.e. 80, 8000-8080 or *
+    :return:                The (first, last) range, None for any
+    """
+
+    ports = str(ports).strip()
+    if ports == ACL_WILDCARD:
+        return None
+    first, _, last = ports.partition('-')
+    first = int(first)
+    last = int(last) if last else first
+    if not ACL_PORTS[0] <= first <= last <= ACL_PORTS[1]:
+        raise ValueError("Bad port range: %s" %ports)
+    return first, last
+
+def parse_protocol(protocol):
+    """
+    Parses a protocol name or number.
+
+    :param protocol:        The protocol, i.e. tcp, 17 or *
+    :return:                The protocol name, None for any
+    """
+
+    protocol = str(protocol).strip().lower()
+    if protocol == ACL_WILDCARD:
+        return None
+    if protocol.isdigit():
+        return ACL_PROTOCOLS.get(int(protocol), protocol)
+    return protocol
+
+def parse_rule(text):
+    """
+    Parses a rule of the configs, the fields after the action are
+    optional and match anything when left out.
+
+        <allow|deny> <network|*> [<ports|*> [<protocol|*> [<in|out|any>]]]
+
+    :param text:            The rule, i.e. allow 10.0.0.0/8 80-443 tcp in
+    :return:                The rule
+    """
+
+    fields = str(text).split()
+    if not 2 <= len(fields) <= 5:
+        raise ValueError("Bad rule: %s" %text)
+    fields += [ACL_WILDCARD] * (4 - len(fields)) + [ACL_ANY]
+
+    action, network, ports, protocol, direction = fields[:5]
+    return AclRule(
+        action.lower(),
+        None if network == ACL_WILDCARD else [network],
+        None if ports == ACL_WILDCARD else [parse_ports(ports)],
+        None if protocol == ACL_WILDCARD else [parse_protocol(protocol)],
+        direction.lower()
+    )
+
+class AclRule(object):
+    """
+    This is a rule of the access list. The networks, port ranges and
+    protocols are lists, None for any.
+    """
+
+    __slots__       = ('action', 'networks', 'ports', 'protocols',
+                       'direction')
+
+    def __init__(self, action, networks=None, ports=None, protocols=None,
+                 direction=ACL_ANY):
+        """
+        This is the constructor for the class.
+
+        :param action:      The action [allow/deny]
+        :param networks:    The addresses or CIDR networks
+        :param ports:       The (first, last) port ranges
+        :param protocols:   The protocol names
+        :param direction:   The endpoint matched [in/out/any]
+        :return:
+        """
+
+        if action not in ACL_ACTIONS:
+            raise ValueError("Unknown rule action: %s" %action)
+        if direction not in ACL_DIRECTIONS:
+            raise ValueError("Unknown rule direction: %s" %direction)
+
+        self.action = action
+        self.networks = None if networks is None else [
+            str(network).strip() for network in networks
+        ]
+        self.ports = None if ports is None else [
+            parse_ports(port) if not isinstance(port, tuple) else port
+            for port in ports
+        ]
+        self.protocols = None if protocols is None else [
+            parse_protocol(protocol) for protocol in protocols
+        ]
+        self.direction = direction
+        return
+
+    def to_dict(self):
+        """
+        Returns the rule as a record.
+
+        :return:
+        """
+        return {
+            'action'    : self.action,
+            'networks'  : self.networks,
+            'ports'     : self.ports,
+            'protocols' : self.protocols,
+            'direction' : self.direction
+        }
+
+class AccessList(object):
+    """
+    This is a compiled access list. The rules are compiled on the
+    first lookup after a change, the verdicts of the endpoints are
+    cached up to a size.
+    """
+
+    # The rules, in order
+    _rules          = None
+
+    # The action when no rule matches an endpoint
+    _default        = ACL_DENY
+
+    # The rules by longest prefix, the rules of the enclosing
+    # prefixes included
+    _trie           = None
+
+    # The first port of each interval and the rules holding it
+    _bounds         = None
+    _port_masks     = None
+
+    # The rules without ports
+    _any_port       = 0
+
+    # The rules by direction and protocol, None for the protocols
+    # no rule names
+    _selectors      = None
+
+    # The allow rules
+    _allowed        = 0
+
+    # True once the rules are compiled
+    _compiled       = False
+
+    # The verdicts by 5-tuple and the most verdicts cached
+    _cache          = None
+    _cache_size     = 0
+
+    def __init__(self, rules=None, default=ACL_DENY, cache=0):
+        """
+        This is the constructor for the class.
+
+        :param rules:       The rules, or their text
+        :param default:     The action when no rule matches
+        :param cache:       The most verdicts cached, 0 to not cache
+        :return:
+        """
+
+        if default not in ACL_ACTIONS:
+            raise ValueError("Unknown default action: %s" %default)
+
+        self._rules = []
+        self._default = default
+        self._cache = {}
+        self._cache_size = cache
+        for rule in rules or []:
+            self.add(rule)
+        return
+
+    def add(self, rule):
+        """
+        Appends a rule, the list is compiled again on the next
+        lookup.
+
+        :param rule:        The rule, or its text
+        :return:
+        """
+
+        if not isinstance(rule, AclRule):
+            rule = parse_rule(rule)
+        self._rules.append(rule)
+        self._compiled = False
+        return
+
+    def compile(self):
+        """
+        Compiles the rules in the trie and the masks.
+
+        :return:
+        """
+
+        self.__compile_networks()
+        self.__compile_ports()
+
+        # Containers
+        protocols = {None : 0}
+        directions = {ACL_IN : 0, ACL_OUT : 0}
+
+        self._allowed = 0
+        for index, rule in enumerate(self._rules):
+            bit = 1 << index
+            for protocol in rule.protocols or [None]:
+                protocols[protocol] = protocols.get(protocol, 0) | bit
+            for direction in directions:
+                if rule.direction in (direction, ACL_ANY):
+                    directions[direction] |= bit
+            if rule.action == ACL_ALLOW:
+                self._allowed |= bit
+
+        # The rules of any protocol match every protocol
+        self._selectors = {}
+        for direction, rules in directions.items():
+            for protocol, mask in protocols.items():
+                self._selectors[(direction, protocol)] = rules & (
+                    mask | protocols[None]
+                )
+
+        self._cache = {}
+        self._compiled = True
+        return
+
+    def lookup(self, address, port, protocol, direction):
+        """
+        Returns the first rule matching an endpoint.
+
+        :param address:     The address
+        :param port:        The port, None to only match any port
+        :param protocol:    The protocol name
+        :param direction:   The endpoint [in/out], in for the destination
+        :return:            The rule index, -1 if none matches
+        """
+
+        if not self._compiled:
+            self.compile()
+
+        mask = self._trie.lookup(address)
+        if not mask:
+            return -1
+        selector = self._selectors.get((direction, protocol))
+        if selector is None:
+            selector = self._selectors[(direction, None)]
+        mask &= selector
+        if mask:
+            if port is None:
+                mask &= self._any_port
+            else:
+                mask &= self._port_masks[
+                    bisect.bisect_right(self._bounds, port) - 1
+                ]
+        if not mask:
+            return -1
+        return (mask & -mask).bit_length() - 1
+
+    def evaluate(self, src, sport, dst, dport, protocol):
+        """
+        Decides both endpoints of a packet, the source against the
+        outbound rules and the destination against the inbound
+        ones.
+
+        :param src:         The source address
+        :param sport:       The source port
+        :param dst:         The destination address
+        :param dport:       The destination port
+        :param protocol:    The protocol name
+        :return:            True if allowed, for the source and for
+                            the destination
+        """
+
+        key = (src, sport, dst, dport, protocol)
+        verdict = self._cache.get(key)
+        if verdict is not None:
+            return verdict
+
+        verdict = (
+            self.__is_allowed(src, sport, protocol, ACL_OUT),
+            self.__is_allowed(dst, dport, protocol, ACL_IN)
+        )
+        if self._cache_size:
+            if len(self._cache) >= self._cache_size:
+                self._cache = {}
+            self._cache[key] = verdict
+        return verdict
+
+    def get_rules(self):
+        """
+        Returns the rules, in order.
+
+        :return:
+        """
+        return list(self._rules)
+
+    def get_statistics(self):
+        """
+        Returns the sizes of the compiled list.
+
+        :return:
+        """
+
+        if not self._compiled:
+            self.compile()
+        return {
+            'rules'     : len(self._rules),
+            'prefixes'  : len(self._trie),
+            'intervals' : len(self._bounds),
+            'cached'    : len(self._cache)
+        }
+
+    def __len__(self):
+        """
+        Returns the number of rules.
+
+        :return:
+        """
+        return len(self._rules)
+
+    def __is_allowed(self, address, port, protocol, direction):
+        """
+        Returns true if an endpoint is allowed.
+
+        :param address:     The address
+        :param port:        The port
+        :param protocol:    The protocol name
+        :param direction:   The endpoint [in/out]
+        :return:
+        """
+
+        index = self.lookup(address, port, protocol, direction)
+        if index < 0:
+            return self._default == ACL_ALLOW
+        return bool(self._allowed >> index & 1)
+
+    def __compile_networks(self):
+        """
+        Compiles the networks in the prefix trie. The prefixes are
+        inserted shortest first, each one takes the rules of the
+        longest prefix enclosing it, thus the longest match holds
+        every rule of the address.
+
+        :return:
+        """
+
+        # Container
+        prefixes = {}
+
+        for index, rule in enumerate(self._rules):
+            networks = rule.networks
+            for network in ACL_NETWORKS if networks is None else networks:
+                family, packed, length = parse_prefix(network)
+                for byte in range(len(packed)):
+                    keep = min(max(length - byte * 8, 0), 8)
+                    packed[byte] &= (0xff << (8 - keep)) & 0xff
+                key = (length, family, bytes(packed))
+                prefixes[key] = prefixes.get(key, 0) | (1 << index)
+
+        self._trie = PrefixTrie()
+        for key in sorted(prefixes):
+            length, family, packed = key
+            address = socket.inet_ntop(family, packed)
+            enclosing = self._trie.lookup(address) or 0
+            self._trie.insert(
+                "%s/%d" %(address, length),
+                prefixes[key] | enclosing
+            )
+        return
+
+    def __compile_ports(self):
+        """
+        Compiles the port ranges in intervals, the rules of each
+        interval are swept from the range starts and ends.
+
+        :return:
+        """
+
+        # Containers
+        starts = {}
+        ends = {}
+
+        self._any_port = 0
+        for index, rule in enumerate(self._rules):
+            bit = 1 << index
+            if rule.ports is None:
+                self._any_port |= bit
+            for first, last in self.__merge_ranges(rule.ports):
+                starts[first] = starts.get(first, 0) | bit
+                ends[last + 1] = ends.get(last + 1, 0) | bit
+
+        self._bounds = sorted(
+            set(starts) | set(ends) | set([ACL_PORTS[0]])
+        )
+        self._port_masks = []
+        mask = 0
+        for bound in self._bounds:
+            mask = (mask & ~ends.get(bound, 0)) | starts.get(bound, 0)
+            self._port_masks.append(mask)
+        return
+
+    def __merge_ranges(self, ports):
+        """
+        Merges the overlapping port ranges of a rule.
+
+        :param ports:       The (first, last) ranges, None for any
+        :return:
+        """
+
+        # Results
+        merged = []
+
+        for first, last in sorted([ACL_PORTS] if ports is None else ports):
+            if merged and first <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+            else:
+                merged.append((first, last))
+        return merged
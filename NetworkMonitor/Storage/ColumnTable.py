@@ -0,0 +1,935 @@
+"""
+
+    :ColumnTable:
+    ==========
+
+    :
+    This is the columnar record table of the probes. A record is not
+    kept as a dict but spread over typed arrays, one per field: the
+    IPv4 addresses packed in 32 bits, the MAC addresses in 48 bits,
+    the small integers i.e. the ports in 16 bits, the capture times
+    in 32 bit seconds and every other value interned once in a pool
+    shared by the columns. A record costs a few bytes per field
+    instead of a dict of strings, the rows are only rebuilt as dicts
+    when the table is reported.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import re
+import socket
+import struct
+import time
+
+from array import array
+from collections import Counter, OrderedDict
+
+from NetworkMonitor.Probe.Capture.Clock import \
+    CLOCK_FIELDS
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The column kinds and their array type codes
+COLUMN_IPV4         = 'ipv4'
+COLUMN_MAC          = 'mac'
+COLUMN_TIME         = 'time'
+COLUMN_SHORT        = 'short'
+COLUMN_INT          = 'int'
+COLUMN_FLOAT        = 'float'
+COLUMN_POOL         = 'pool'
+COLUMN_TYPECODES    = {
+    COLUMN_IPV4     : 'I',
+    COLUMN_MAC      : 'Q',
+    COLUMN_TIME     : 'I',
+    COLUMN_SHORT    : 'H',
+    COLUMN_INT      : 'q',
+    COLUMN_FLOAT    : 'd',
+    COLUMN_POOL     : 'I'
+}
+
+# The fewest slots the ring grows by
+COLUMN_GROWTH       = 64
+
+# The packed IPv4 address
+_UINT32             = struct.Struct('!I')
+
+# The MAC addresses as captured, lower case and colon separated
+_MAC                = re.compile(r'[0-9a-f]{2}(?::[0-9a-f]{2}){5}\Z')
+
+# The errors of a value a column cannot pack
+_PACK_ERRORS        = (socket.error, ValueError, TypeError, OverflowError)
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def _pack_ipv4(value):
+    """
+    Packs a dotted IPv4 address in 32 bits, only the canonical
+    form is packed so that it unpacks to the same string.
+
+    :param value:           The address
+    :return:
+    """
+    return _UINT32.unpack(socket.inet_pton(socket.AF_INET, value))[0]
+
+def _unpack_ipv4(value):
+    """
+    Unpacks a 32 bits IPv4 address.
+
+    :param value:           The packed address
+    :return:
+    """
+    return socket.inet_ntoa(_UINT32.pack(value))
+
+def _pack_mac(value):
+    """
+    Packs a lower case colon separated MAC address in 48 bits.
+
+    :param value:           The address
+    :return:
+    """
+
+    if _MAC.match(value) is None:
+        raise ValueError(value)
+    return int(value.replace(':', ''), 16)
+
+def _unpack_mac(value):
+    """
+    Unpacks a 48 bits MAC address.
+
+    :param value:           The packed address
+    :return:
+    """
+
+    digits = '%012x' %value
+    return ':'.join(
+        digits[index:index + 2] for index in range(0, 12, 2)
+    )
+
+def _pack_time(value):
+    """
+    Packs a capture time in 32 bits seconds.
+
+    :param value:           The epoch
+    :return:
+    """
+
+    if not 0 <= value < 0x100000000:
+        raise ValueError(value)
+    return int(value)
+
+def _pack_short(value):
+    """
+    Packs an integer in 16 bits.
+
+    :param value:           The integer
+    :return:
+    """
+
+    if type(value) is not int or not 0 <= value <= 0xffff:
+        raise ValueError(value)
+    return value
+
+def _pack_int(value):
+    """
+    Packs an integer in 64 bits.
+
+    :param value:           The integer
+    :return:
+    """
+
+    if type(value) is not int or not -(1 << 63) <= value < 1 << 63:
+        raise ValueError(value)
+    return value
+
+def _pack_float(value):
+    """
+    Packs a float.
+
+    :param value:           The float
+    :return:
+    """
+
+    if type(value) is not float:
+        raise ValueError(value)
+    return value
+
+# The codecs of the column kinds
+COLUMN_CODECS       = {
+    COLUMN_IPV4     : (_pack_ipv4, _unpack_ipv4),
+    COLUMN_MAC      : (_pack_mac, _unpack_mac),
+    COLUMN_TIME     : (_pack_time, float),
+    COLUMN_SHORT    : (_pack_short, int),
+    COLUMN_INT      : (_pack_int, int),
+    COLUMN_FLOAT    : (_pack_float, float)
+}
+
+def column_kind(field, value):
+    """
+    Returns the column kind of the first value of a field.
+
+    :param field:           The field name
+    :param value:           The value
+    :return:
+    """
+
+    if field in CLOCK_FIELDS and isinstance(value, float):
+        kinds = (COLUMN_TIME,)
+    elif type(value) is int:
+        kinds = (COLUMN_SHORT, COLUMN_INT)
+    elif type(value) is float:
+        kinds = (COLUMN_FLOAT,)
+    elif isinstance(value, str):
+        kinds = (COLUMN_IPV4, COLUMN_MAC)
+    else:
+        kinds = ()
+
+    for kind in kinds:
+        try:
+            COLUMN_CODECS[kind][0](value)
+        except _PACK_ERRORS:
+            continue
+        return kind
+    return COLUMN_POOL
+
+class ValuePool(object):
+    """
+    This is the interned value pool of a table. A value is stored
+    once and the columns hold its code, the codes are counted and
+    reused once no row holds them. A value that cannot be hashed,
+    i.e. a dict, is not interned, it is stored once per row.
+    """
+
+    # The values by code
+    _values         = None
+
+    # The codes by value
+    _codes          = None
+
+    # The rows holding each code
+    _refs           = None
+
+    # The codes free to reuse
+    _free           = None
+
+    def __init__(self):
+        """
+        This is the constructor for the class.
+
+        :return:
+        """
+
+        self._values = []
+        self._codes = {}
+        self._refs = array('I')
+        self._free = []
+        return
+
+    def intern(self, value):
+        """
+        Returns the code of a value, a row now holds it.
+
+        :param value:       The value
+        :return:
+        """
+
+        try:
+            code = self._codes.get(value)
+        except TypeError:
+            code = self.__allocate(value)
+        else:
+            if code is None:
+                code = self._codes[value] = self.__allocate(value)
+        self._refs[code] += 1
+        return code
+
+    def find(self, value):
+        """
+        Returns the code of a value, None if no row holds it.
+
+        :param value:       The value
+        :return:
+        """
+        return self._codes.get(value)
+
+    def release(self, code):
+        """
+        Releases the code of a row, the code is reused once no row
+        holds it.
+
+        :param code:        The code
+        :return:
+        """
+
+        self._refs[code] -= 1
+        if self._refs[code] == 0:
+            try:
+                del self._codes[self._values[code]]
+            except TypeError:
+                pass
+            self._values[code] = None
+            self._free.append(code)
+        return
+
+    def get(self, code):
+        """
+        Returns the value of a code.
+
+        :param code:        The code
+        :return:
+        """
+        return self._values[code]
+
+    def restore(self, values, columns):
+        """
+        Restores the values of a checkpoint, the codes are counted
+        again in the pool columns and the unused ones are freed.
+
+        :param values:      The values by code
+        :param columns:     The pool column arrays
+        :return:
+        """
+
+        refs = Counter()
+        for data in columns:
+            refs.update(data)
+
+        self._values = list(values)
+        self._codes = {}
+        self._refs = array('I', [refs[code] for code in range(len(values))])
+        self._free = []
+        for code, value in enumerate(self._values):
+            if self._refs[code]:
+                try:
+                    self._codes[value] = code
+                except TypeError:
+                    pass
+            else:
+                self._values[code] = None
+                self._free.append(code)
+        return
+
+    def get_values(self):
+        """
+        Returns the values by code.
+
+        :return:
+        """
+        return list(self._values)
+
+    def get_bytes(self):
+        """
+        Returns the approximate size of the pool.
+
+        :return:
+        """
+        return self._refs.itemsize * len(self._refs) + \
+            16 * len(self._values)
+
+    def __allocate(self, value):
+        """
+        Returns a free code holding a value, no row holds it yet.
+
+        :param value:       The value
+        :return:
+        """
+
+        if self._free:
+            code = self._free.pop()
+            self._values[code] = value
+        else:
+            code = len(self._values)
+            self._values.append(value)
+            self._refs.append(0)
+        return code
+
+class Column(object):
+    """
+    This is a typed column. The values the kind cannot pack turn the
+    column into a pool column, it is done once.
+    """
+
+    __slots__       = ('kind', 'data', 'pack', 'unpack')
+
+    def __init__(self, kind, data=None):
+        """
+        This is the constructor for the class.
+
+        :param kind:        The column kind
+        :param data:        The packed values
+        :return:
+        """
+
+        self.kind = kind
+        self.data = array(COLUMN_TYPECODES[kind]) if data is None \
+            else data
+        self.pack, self.unpack = COLUMN_CODECS.get(kind, (None, None))
+        return
+
+class ColumnTable(object):
+    """
+    This is an oldest first bounded table with columnar storage. The
+    rows are slots of a ring over the column arrays, a full table
+    evicts its oldest row and the expiry advances the front, both in
+    O(1) per row. It answers the calls the probes make on a table:
+    insert, all, has and purge.
+    """
+
+    # The table name
+    name            = None
+
+    # The columns by field name
+    _columns        = None
+
+    # The interned values of the pool columns
+    _pool           = None
+
+    # The allocated slots, the slot of the oldest row, the rows
+    _size           = 0
+    _start          = 0
+    _count          = 0
+
+    # The last record id
+    _last_id        = 0
+
+    # The most rows held, 0 for no limit
+    _capacity       = 0
+
+    # The age before a row expires (seconds), 0 for no limit
+    _ttl            = 0
+
+    # The indexes: field -- value -- slots
+    _indexes        = None
+
+    # The rows removed on a full table and on age
+    _evicted        = 0
+    _expired        = 0
+
+    def __init__(self, name, capacity=0, ttl=0):
+        """
+        This is the constructor for the class.
+
+        :param name:        The table name
+        :param capacity:    The most rows held, 0 for no limit
+        :param ttl:         The age before a row expires
+        :return:
+        """
+
+        self.name = name
+        self._capacity = capacity
+        self._ttl = ttl
+        self._indexes = {}
+        self._evicted = 0
+        self._expired = 0
+        self._last_id = 0
+        self.purge()
+        return
+
+    def create_index(self, field):
+        """
+        Declares a hash index on a field.
+
+        :param field:       The field to index
+        :return:
+        """
+
+        self._indexes[field] = {}
+        self.__rebuild()
+        return
+
+    def has(self, field, value):
+        """
+        Returns true if a row holds the value in the field.
+
+        :param field:       The field
+        :param value:       The value looked for
+        :return:
+        """
+
+        index = self._indexes.get(field)
+        if index is not None:
+            try:
+                return value in index
+            except TypeError:
+                return False
+
+        column = self._columns.get(field)
+        if column is None:
+            return False
+        if column.kind == COLUMN_POOL:
+            try:
+                packed = self._pool.find(value)
+            except TypeError:
+                return False
+        else:
+            try:
+                packed = column.pack(value)
+            except _PACK_ERRORS:
+                return False
+        if packed is None:
+            return False
+        return any(
+            column.data[slot] == packed for slot in self.__slots()
+        )
+
+    def insert(self, record):
+        """
+        Inserts a record. The expired rows are removed, then the
+        oldest one if the table is full.
+
+        :param record:      The record, a dict
+        :return:            The record id
+        """
+
+        if not isinstance(record, dict):
+            raise ValueError('Record is not a dictionary')
+
+        self.__expire(record.get('time'))
+        if self._capacity and self._count >= self._capacity:
+            self.__remove_oldest()
+            self._evicted += 1
+
+        # Add the columns of the new fields
+        for field in record:
+            if field not in self._columns:
+                self.__add_column(field, record[field])
+
+        slot = self.__allocate()
+        for field, column in self._columns.items():
+            value = record.get(field)
+            if column.pack is not None:
+                try:
+                    column.data[slot] = column.pack(value)
+                    continue
+                except _PACK_ERRORS:
+                    pass
+            self.__write(column, slot, value)
+
+        for field, index in self._indexes.items():
+            self.__index_slot(index, slot, record.get(field))
+
+        self._count += 1
+        self._last_id += 1
+        return self._last_id
+
+    def insert_multiple(self, records):
+        """
+        Inserts records.
+
+        :param records:     The records
+        :return:            The record ids
+        """
+        return [self.insert(record) for record in records]
+
+    def search(self, cond):
+        """
+        Returns the records matching a condition.
+
+        :param cond:        The condition, i.e. a Query
+        :return:
+        """
+        return [record for record in self.all() if cond(record)]
+
+    def all(self):
+        """
+        Returns the records rebuilt as dicts, oldest first.
+
+        :return:
+        """
+        return [self.__read(slot) for slot in self.__slots()]
+
+    def get_watermark(self):
+        """
+        Returns the id of the last record.
+
+        :return:
+        """
+        return self._last_id
+
+    def since(self, watermark):
+        """
+        Returns the records inserted since the watermark rebuilt as
+        dicts, oldest first. They are the last rows of the ring.
+
+        :param watermark:   The watermark of the previous call
+        :return:
+        """
+
+        rows = min(self._count, max(self._last_id - watermark, 0))
+        return [
+            self.__read(slot)
+            for slot in self.__slots()[self._count - rows:]
+        ]
+
+    def purge(self):
+        """
+        Removes every row.
+
+        :return:
+        """
+
+        self._columns = OrderedDict()
+        self._pool = ValuePool()
+        self._size = 0
+        self._start = 0
+        self._count = 0
+        for field in self._indexes.keys():
+            self._indexes[field] = {}
+        return
+
+    def get_state(self):
+        """
+        Returns the raw bytes of the columns, oldest row first, the
+        pool values and the counters, the checkpoint of the table.
+
+        :return:
+        """
+
+        # Container
+        columns = []
+
+        end = self._start + self._count
+        for field, column in self._columns.items():
+            data = column.data
+            if end <= self._size:
+                rows = data[self._start:end]
+            else:
+                rows = data[self._start:] + data[:end - self._size]
+            columns.append((field, column.kind, rows.tobytes()))
+
+        return {
+            'columns'   : columns,
+            'pool'      : self._pool.get_values(),
+            'count'     : self._count,
+            'last_id'   : self._last_id,
+            'evicted'   : self._evicted,
+            'expired'   : self._expired
+        }
+
+    def set_state(self, state):
+        """
+        Restores the columns of a checkpoint from their raw bytes.
+        The capacity is the current one, the oldest rows past it
+        are left out.
+
+        :param state:       The checkpoint of the table
+        :return:
+        """
+
+        self.purge()
+        count = state['count']
+        drop = max(count - self._capacity, 0) if self._capacity else 0
+
+        for field, kind, raw in state['columns']:
+            data = array(COLUMN_TYPECODES[kind], raw)
+            self._columns[field] = Column(kind, data[drop:])
+
+        self._pool.restore(
+            state['pool'],
+            [
+                column.data for column in self._columns.values()
+                if column.kind == COLUMN_POOL
+            ]
+        )
+        self._size = self._count = count - drop
+        self._start = 0
+        self._last_id = state['last_id']
+        self._evicted = state['evicted']
+        self._expired = state['expired']
+        self.__rebuild()
+        return
+
+    def get_statistics(self):
+        """
+        Returns the table counters, the bytes are the size of the
+        columns and of the pool.
+
+        :return:
+        """
+        return {
+            'rows'      : self._count,
+            'capacity'  : self._capacity,
+            'ttl'       : self._ttl,
+            'evicted'   : self._evicted,
+            'expired'   : self._expired,
+            'bytes'     : sum(
+                column.data.itemsize * len(column.data)
+                for column in self._columns.values()
+            ) + self._pool.get_bytes()
+        }
+
+    def __len__(self):
+        """
+        Returns the number of rows.
+
+        :return:
+        """
+        return self._count
+
+    def __slots(self):
+        """
+        Returns the slots of the rows, oldest first.
+
+        :return:
+        """
+
+        size = self._size
+        start = self._start
+        return [(start + offset) % size for offset in range(self._count)]
+
+    def __allocate(self):
+        """
+        Returns the slot of a new row, the ring grows by half its
+        size up to the capacity when every slot holds a row.
+
+        :return:
+        """
+
+        if self._count < self._size:
+            return (self._start + self._count) % self._size
+
+        # Unroll the ring before it grows
+        if self._start:
+            self.__rotate()
+
+        grow = max(self._size >> 1, COLUMN_GROWTH)
+        if self._capacity:
+            grow = min(grow, self._capacity - self._size)
+        zeros = [0] * grow
+        for column in self._columns.values():
+            column.data.extend(zeros)
+        self._size += grow
+        return self._count
+
+    def __rotate(self):
+        """
+        Moves the oldest row to the first slot.
+
+        :return:
+        """
+
+        start = self._start
+        for column in self._columns.values():
+            data = column.data
+            column.data = data[start:] + data[:start]
+        self._start = 0
+        self.__rebuild()
+        return
+
+    def __add_column(self, field, value):
+        """
+        Adds the column of a new field, the rows already held get a
+        None value.
+
+        :param field:       The field name
+        :param value:       The first value of the field
+        :return:
+        """
+
+        kind = column_kind(field, value)
+        if self._count and kind != COLUMN_POOL:
+            kind = COLUMN_POOL
+
+        column = Column(kind)
+        column.data.extend([0] * self._size)
+        if self._count:
+            for slot in self.__slots():
+                column.data[slot] = self._pool.intern(None)
+        self._columns[field] = column
+        return
+
+    def __write(self, column, slot, value):
+        """
+        Writes a value in the slot of a column, a value the column
+        cannot pack turns it into a pool column.
+
+        :param column:      The column
+        :param slot:        The slot
+        :param value:       The value
+        :return:
+        """
+
+        if column.kind != COLUMN_POOL:
+            try:
+                column.data[slot] = column.pack(value)
+                return
+            except _PACK_ERRORS:
+                self.__widen(column, value)
+                if column.kind != COLUMN_POOL:
+                    column.data[slot] = column.pack(value)
+                    return
+        column.data[slot] = self._pool.intern(value)
+        return
+
+    def __widen(self, column, value):
+        """
+        Widens a short column to 64 bits for a larger integer, else
+        turns the column into a pool column.
+
+        :param column:      The column
+        :param value:       The value the column cannot pack
+        :return:
+        """
+
+        if column.kind == COLUMN_SHORT:
+            try:
+                _pack_int(value)
+                column.__init__(
+                    COLUMN_INT,
+                    array(COLUMN_TYPECODES[COLUMN_INT], column.data)
+                )
+                return
+            except ValueError:
+                pass
+
+        data = array(COLUMN_TYPECODES[COLUMN_POOL], [0] * self._size)
+        for slot in self.__slots():
+            data[slot] = self._pool.intern(
+                column.unpack(column.data[slot])
+            )
+        column.__init__(COLUMN_POOL, data)
+        return
+
+    def __read(self, slot):
+        """
+        Rebuilds the record of a slot.
+
+        :param slot:        The slot
+        :return:
+        """
+
+        # Container
+        record = {}
+
+        for field, column in self._columns.items():
+            if column.kind == COLUMN_POOL:
+                record[field] = self._pool.get(column.data[slot])
+            else:
+                record[field] = column.unpack(column.data[slot])
+        return record
+
+    def __expire(self, now):
+        """
+        Removes the rows older than the TTL, the oldest ones are at
+        the front.
+
+        :param now:         The capture time of the new record
+        :return:
+        """
+
+        if not self._ttl:
+            return
+        if not isinstance(now, (int, float)):
+            now = time.time()
+
+        column = self._columns.get('time')
+        if column is None:
+            return
+
+        limit = now - self._ttl
+        while self._count:
+            if column.kind == COLUMN_POOL:
+                stamp = self._pool.get(column.data[self._start])
+                if not isinstance(stamp, (int, float)):
+                    break
+            else:
+                stamp = column.unpack(column.data[self._start])
+            if stamp >= limit:
+                break
+            self.__remove_oldest()
+            self._expired += 1
+        return
+
+    def __remove_oldest(self):
+        """
+        Removes the oldest row, its pool values and its index
+        entries.
+
+        :return:
+        """
+
+        slot = self._start
+        for field, index in self._indexes.items():
+            column = self._columns.get(field)
+            if column is None:
+                continue
+            if column.kind == COLUMN_POOL:
+                value = self._pool.get(column.data[slot])
+            else:
+                value = column.unpack(column.data[slot])
+            try:
+                slots = index.get(value)
+            except TypeError:
+                continue
+            if slots is None:
+                continue
+            slots.discard(slot)
+            if not slots:
+                del index[value]
+
+        for column in self._columns.values():
+            if column.kind == COLUMN_POOL:
+                self._pool.release(column.data[slot])
+
+        self._start = (slot + 1) % self._size
+        self._count -= 1
+        return
+
+    def __index_slot(self, index, slot, value):
+        """
+        Adds a slot to an index, the values that cannot be hashed
+        are not indexed.
+
+        :param index:       The index
+        :param slot:        The slot
+        :param value:       The value of the slot
+        :return:
+        """
+
+        try:
+            index.setdefault(value, set()).add(slot)
+        except TypeError:
+            pass
+        return
+
+    def __rebuild(self):
+        """
+        Rebuilds the indexes from the rows.
+
+        :return:
+        """
+
+        for field in self._indexes.keys():
+            index = self._indexes[field] = {}
+            column = self._columns.get(field)
+            if column is None:
+                continue
+            unpack = self._pool.get if column.kind == COLUMN_POOL \
+                else column.unpack
+            for slot in self.__slots():
+                self.__index_slot(index, slot, unpack(column.data[slot]))
+        return
@@ -0,0 +1,304 @@
+"""
+
+    :Conversations:
+    ==========
+
+    :
+    This is the conversation table of the observing probes. The
+    probe keeps one row per conversation key, i.e. (src, dst) or
+    (src, sport, dst, dport), with its first seen and last seen
+    times and its packet and byte counters, instead of one record
+    per packet. The rows that have not seen a packet for the TTL
+    are expired, thus the table and the reports grow with the
+    number of live conversations, not with the traffic. A table
+    with a capacity evicts its least recently seen row when full.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+from collections import OrderedDict
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+class ConversationTable(object):
+    """
+    This is an aggregated table. The rows are found by their key
+    in a dict, a packet of a known conversation only updates the
+    counters of its row and moves it to the back. The rows are
+    thus kept least recently seen first, the expiry and the
+    eviction only look at the front. The capture times drive the
+    expiry, a replay expires like a live capture.
+    """
+
+    # The table name
+    name            = None
+
+    # The rows by conversation key, least recently seen first
+    _rows           = None
+
+    # The idle time before a row expires (seconds), 0 for no limit
+    _ttl            = 0
+
+    # The most rows held, 0 for no limit
+    _capacity       = 0
+
+    # The rows removed on age and on a full table
+    _expired        = 0
+    _evicted        = 0
+
+    # The last change and the change of each row
+    _sequence       = 0
+    _changes        = None
+
+    def __init__(self, name, ttl, capacity=0):
+        """
+        This is the constructor for the class.
+
+        :param name:        The table name
+        :param ttl:         The idle time before a row expires
+        :param capacity:    The most rows held, 0 for no limit
+        :return:
+        """
+
+        self.name = name
+        self._rows = OrderedDict()
+        self._ttl = ttl
+        self._capacity = capacity
+        self._expired = 0
+        self._evicted = 0
+        self._sequence = 0
+        self._changes = {}
+        return
+
+    def update(self, key, time, length, packets=1, first=None):
+        """
+        Counts packets in the row of a conversation.
+
+        :param key:         The conversation key
+        :param time:        The capture time of the last packet
+        :param length:      The bytes of the packets
+        :param packets:     The number of packets
+        :param first:       The capture time of the first packet
+        :return:            False if the conversation is not known
+        """
+
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+
+        if time > row['last']:
+            row['last'] = row['time'] = time
+        if first is not None and first < row['first']:
+            row['first'] = first
+        row['packets'] += packets
+        row['bytes'] += length
+        self._rows[key] = row
+        self.__change(key)
+        self.expire(time)
+        return True
+
+    def insert(self, key, row, time, length, packets=1, first=None):
+        """
+        Adds the row of a new conversation.
+
+        :param key:         The conversation key
+        :param row:         The fields of the conversation
+        :param time:        The capture time of the last packet
+        :param length:      The bytes of the packets
+        :param packets:     The number of packets
+        :param first:       The capture time of the first packet
+        :return:
+        """
+
+        row['first'] = time if first is None else first
+        row['last'] = row['time'] = time
+        row['packets'] = packets
+        row['bytes'] = length
+        self.expire(time)
+        if self._capacity and len(self._rows) >= self._capacity:
+            oldest, _ = self._rows.popitem(last=False)
+            del self._changes[oldest]
+            self._evicted += 1
+        self._rows[key] = row
+        self.__change(key)
+        return
+
+    def add(self, key, build, time, length, packets=1, first=None):
+        """
+        Counts packets in the row of a conversation, the row is
+        built and inserted for a new conversation.
+
+        :param key:         The conversation key
+        :param build:       Returns the fields of a new row
+        :param time:        The capture time of the last packet
+        :param length:      The bytes of the packets
+        :param packets:     The number of packets
+        :param first:       The capture time of the first packet
+        :return:            True if the conversation was known
+        """
+
+        if self.update(key, time, length, packets, first):
+            return True
+        self.insert(key, build(), time, length, packets, first)
+        return False
+
+    def expire(self, now):
+        """
+        Removes the rows idle for more than the TTL, the least
+        recently seen rows are at the front.
+
+        :param now:         The current capture time
+        :return:            The number of rows removed
+        """
+
+        if not self._ttl:
+            return 0
+
+        # Counter
+        expired = 0
+
+        limit = now - self._ttl
+        rows = self._rows
+        while rows:
+            key = next(iter(rows))
+            if rows[key]['last'] >= limit:
+                break
+            del rows[key]
+            del self._changes[key]
+            expired += 1
+
+        self._expired += expired
+        return expired
+
+    def all(self):
+        """
+        Returns the rows of the live conversations.
+
+        :return:
+        """
+        return list(self._rows.values())
+
+    def get_watermark(self):
+        """
+        Returns the last change.
+
+        :return:
+        """
+        return self._sequence
+
+    def since(self, watermark):
+        """
+        Returns the rows inserted or updated since the watermark,
+        least recently seen first. A changed row is moved to the
+        back, only the back is read.
+
+        :param watermark:   The watermark of the previous call
+        :return:
+        """
+
+        # Results
+        rows = []
+
+        for key in reversed(self._rows):
+            if self._changes[key] <= watermark:
+                break
+            rows.append(self._rows[key])
+        rows.reverse()
+        return rows
+
+    def get_state(self):
+        """
+        Returns the rows and the counters, the checkpoint of the
+        table.
+
+        :return:
+        """
+        return {
+            'rows'      : list(self._rows.items()),
+            'evicted'   : self._evicted,
+            'expired'   : self._expired
+        }
+
+    def set_state(self, state):
+        """
+        Restores the rows and the counters of a checkpoint. The
+        capacity is the current one, the least recently seen rows
+        past it are left out.
+
+        :param state:       The checkpoint of the table
+        :return:
+        """
+
+        rows = state['rows']
+        if self._capacity:
+            rows = rows[-self._capacity:]
+
+        self._rows = OrderedDict(rows)
+        self._changes = {}
+        self._sequence = 0
+        for key in self._rows:
+            self.__change(key)
+        self._evicted = state['evicted']
+        self._expired = state['expired']
+        return
+
+    def get_statistics(self):
+        """
+        Returns the table counters.
+
+        :return:
+        """
+        return {
+            'rows'      : len(self._rows),
+            'capacity'  : self._capacity,
+            'ttl'       : self._ttl,
+            'evicted'   : self._evicted,
+            'expired'   : self._expired
+        }
+
+    def __len__(self):
+        """
+        Returns the number of live conversations.
+
+        :return:
+        """
+        return len(self._rows)
+
+    def __change(self, key):
+        """
+        Records the change of a row.
+
+        :param key:         The conversation key
+        :return:
+        """
+
+        self._sequence += 1
+        self._changes[key] = self._sequence
+        return
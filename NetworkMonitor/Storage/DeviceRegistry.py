@@ -0,0 +1,374 @@
+"""
+
+    :DeviceRegistry:
+    ==========
+
+    :
+    This is the device registry of a node. The network probes of
+    the process share one registry, a device is found by its MAC
+    address in one dict lookup and holds the IP addresses bound to
+    it, the ports it was reached on and its first seen and last seen
+    times. The known devices of the configs are kept apart from the
+    devices seen, per probe, or for every probe of the node when a
+    probe declares them node wide.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import threading
+
+from collections import OrderedDict
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+class Device(object):
+    """
+    This is a device seen on the network. Its IP addresses and
+    ports are kept least recently seen first and bounded, a router
+    or a server cannot grow its device without limit.
+    """
+
+    __slots__ = ('mac', 'ips', 'ports', 'first', 'last')
+
+    def __init__(self, mac, time):
+        """
+        This is the constructor for the class.
+
+        :param mac:         The MAC address
+        :param time:        The capture time it was first seen
+        :return:
+        """
+
+        self.mac = mac
+        self.ips = OrderedDict()
+        self.ports = OrderedDict()
+        self.first = time
+        self.last = time
+        return
+
+    def to_dict(self):
+        """
+        Returns the device as a record.
+
+        :return:
+        """
+        return {
+            'type'      : 'DEVICE',
+            'mac'       : self.mac,
+            'ips'       : list(self.ips.keys()),
+            'ports'     : sorted(self.ports.keys()),
+            'first'     : self.first,
+            'last'      : self.last
+        }
+
+class DeviceRegistry(object):
+    """
+    This is the shared registry of the devices by MAC address. The
+    devices are kept least recently seen first, a full registry
+    evicts the front one with its IP bindings. Every update takes
+    the registry lock, the known check does not.
+    """
+
+    # The shared registry of the process
+    __registry      = None
+
+    # The lock of the shared registry creation
+    __registry_lock = threading.Lock()
+
+    # The devices by MAC address, least recently seen first
+    _devices        = None
+
+    # The MAC address bound to each IP address
+    _addresses      = None
+
+    # The MAC addresses of the known devices by scope, None for the
+    # devices known to every probe
+    _known          = None
+
+    # The most devices held, 0 for no limit
+    _capacity       = 0
+
+    # The most IP addresses and ports held per device
+    _bindings       = 0
+    _ports          = 0
+
+    # The devices removed on a full registry
+    _evicted        = 0
+
+    # The lock of the updates
+    _lock           = None
+
+    def __init__(self, capacity=0, bindings=0, ports=0):
+        """
+        This is the constructor for the class.
+        Use get_registry() to get the shared registry.
+
+        :param capacity:    The most devices held, 0 for no limit
+        :param bindings:    The most IP addresses per device
+        :param ports:       The most ports per device
+        :return:
+        """
+
+        self._devices = OrderedDict()
+        self._addresses = {}
+        self._known = {None : set()}
+        self._capacity = capacity
+        self._bindings = bindings
+        self._ports = ports
+        self._evicted = 0
+        self._lock = threading.Lock()
+        return
+
+    @classmethod
+    def get_registry(cls, capacity=0, bindings=0, ports=0):
+        """
+        Returns the shared registry of the process, it is created
+        on the first call. The bounds of a later call only raise
+        those of the registry.
+
+        :param capacity:    The most devices held, 0 for no limit
+        :param bindings:    The most IP addresses per device
+        :param ports:       The most ports per device
+        :return:
+        """
+
+        with cls.__registry_lock:
+            if cls.__registry is None:
+                cls.__registry = cls(capacity, bindings, ports)
+            else:
+                cls.__registry.__raise_bounds(capacity, bindings, ports)
+            return cls.__registry
+
+    def learn(self, macs, scope=None):
+        """
+        Declares known devices, to a scope or to every probe.
+
+        :param macs:        The MAC addresses
+        :param scope:       The scope, i.e. the probe, None for the
+                            devices known to every probe
+        :return:
+        """
+
+        with self._lock:
+            self._known.setdefault(scope, set()).update(macs)
+        return
+
+    def is_known(self, mac, scope=None):
+        """
+        Returns true if the device was declared known to the scope
+        or to every probe.
+
+        :param mac:         The MAC address
+        :param scope:       The scope, i.e. the probe
+        :return:
+        """
+
+        known = self._known
+        if mac in known[None]:
+            return True
+        return scope is not None and mac in known.get(scope, ())
+
+    def see(self, mac, time, ip=None, first=None):
+        """
+        Records that a device was seen, with the IP address it sent
+        from if any.
+
+        :param mac:         The MAC address
+        :param time:        The capture time of the last packet
+        :param ip:          The IP address bound to the MAC address
+        :param first:       The capture time of the first packet
+        :return:
+        """
+
+        with self._lock:
+            device = self._devices.get(mac)
+            if device is None:
+                if self._capacity and \
+                        len(self._devices) >= self._capacity:
+                    self.__remove_oldest()
+                    self._evicted += 1
+                device = self._devices[mac] = Device(mac, time)
+            else:
+                self._devices.move_to_end(mac)
+                if time > device.last:
+                    device.last = time
+            if first is not None and first < device.first:
+                device.first = first
+
+            if ip is not None:
+                self.__bind(device, ip)
+        return
+
+    def see_port(self, ip, port, time):
+        """
+        Records a port a device was reached on, the device is the
+        one bound to the IP address. The ports of an address without
+        a device are not kept.
+
+        :param ip:          The IP address
+        :param port:        The port
+        :param time:        The capture time
+        :return:
+        """
+
+        with self._lock:
+            device = self._devices.get(self._addresses.get(ip))
+            if device is None:
+                return
+            ports = device.ports
+            ports.pop(port, None)
+            ports[port] = time
+            if self._ports and len(ports) > self._ports:
+                ports.popitem(last=False)
+        return
+
+    def get_device(self, mac):
+        """
+        Returns the record of a device, None if it was not seen.
+
+        :param mac:         The MAC address
+        :return:
+        """
+
+        with self._lock:
+            device = self._devices.get(mac)
+            return None if device is None else device.to_dict()
+
+    def find(self, ip):
+        """
+        Returns the MAC address bound to an IP address, None if
+        not bound.
+
+        :param ip:          The IP address
+        :return:
+        """
+        return self._addresses.get(ip)
+
+    def all(self):
+        """
+        Returns the records of the devices, least recently seen
+        first.
+
+        :return:
+        """
+
+        with self._lock:
+            return [device.to_dict() for device in self._devices.values()]
+
+    def get_statistics(self):
+        """
+        Returns the registry counters.
+
+        :return:
+        """
+        return {
+            'devices'   : len(self._devices),
+            'known'     : len(set().union(*self._known.values())),
+            'addresses' : len(self._addresses),
+            'capacity'  : self._capacity,
+            'evicted'   : self._evicted
+        }
+
+    def __len__(self):
+        """
+        Returns the number of devices seen.
+
+        :return:
+        """
+        return len(self._devices)
+
+    def __bind(self, device, ip):
+        """
+        Binds an IP address to a device, the address is moved from
+        the device it was bound to before.
+
+        :param device:      The device
+        :param ip:          The IP address
+        :return:
+        """
+
+        owner = self._addresses.get(ip)
+        if owner is not None and owner != device.mac:
+            previous = self._devices.get(owner)
+            if previous is not None:
+                previous.ips.pop(ip, None)
+        self._addresses[ip] = device.mac
+
+        ips = device.ips
+        ips.pop(ip, None)
+        ips[ip] = device.last
+        if self._bindings and len(ips) > self._bindings:
+            oldest, _ = ips.popitem(last=False)
+            if self._addresses.get(oldest) == device.mac:
+                del self._addresses[oldest]
+        return
+
+    def __remove_oldest(self):
+        """
+        Removes the least recently seen device and its bindings.
+
+        :return:
+        """
+
+        mac, device = self._devices.popitem(last=False)
+        for ip in device.ips:
+            if self._addresses.get(ip) == mac:
+                del self._addresses[ip]
+        return
+
+    def __raise_bounds(self, capacity, bindings, ports):
+        """
+        Raises the bounds of the registry to those given, 0 being
+        no limit.
+
+        :param capacity:    The most devices held
+        :param bindings:    The most IP addresses per device
+        :param ports:       The most ports per device
+        :return:
+        """
+
+        with self._lock:
+            self._capacity = self.__raise(self._capacity, capacity)
+            self._bindings = self.__raise(self._bindings, bindings)
+            self._ports = self.__raise(self._ports, ports)
+        return
+
+    def __raise(self, current, bound):
+        """
+        Returns the larger of two bounds, 0 being no limit.
+
+        :param current:     The current bound
+        :param bound:       The bound asked for
+        :return:
+        """
+
+        if not current or not bound:
+            return 0
+        return max(current, bound)
@@ -0,0 +1,216 @@
+"""
+
+    :HyperLogLog:
+    ==========
+
+    :
+    This is the distinct count estimator of the probes. A value is
+    hashed to 64 bits, the first bits pick a register and the
+    register keeps the longest run of leading zeros seen in the
+    rest. The number of distinct values is estimated from the
+    registers with a fixed memory of 2^precision bytes, i.e. 4 KB
+    for a standard error of 1.6%. The hash is stable across
+    processes and nodes, two estimators of the same precision are
+    merged by taking the largest of each register.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import base64
+import hashlib
+import math
+import struct
+import zlib
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The precisions allowed, the register count is 2^precision
+HLL_PRECISIONS      = range(4, 17)
+
+# The hash of the values
+_HASH64             = struct.Struct('!Q')
+_MASK64             = (1 << 64) - 1
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def hash64(value):
+    """
+    Hashes a value to 64 bits, the same way in every process.
+
+    :param value:           The value
+    :return:
+    """
+
+    digest = hashlib.blake2b(
+        str(value).encode('utf-8'),
+        digest_size = 8
+    ).digest()
+    return _HASH64.unpack(digest)[0]
+
+class HyperLogLog(object):
+    """
+    This is a HyperLogLog estimator with dense byte registers.
+    """
+
+    # The bits of the register index
+    _precision      = 0
+
+    # The registers
+    _registers      = None
+
+    def __init__(self, precision, registers=None):
+        """
+        This is the constructor for the class.
+
+        :param precision:   The bits of the register index
+        :param registers:   The registers to start from
+        :return:
+        """
+
+        if precision not in HLL_PRECISIONS:
+            raise ValueError("Bad precision: %s" %precision)
+
+        self._precision = precision
+        self._registers = bytearray(1 << precision) \
+            if registers is None else bytearray(registers)
+        if len(self._registers) != 1 << precision:
+            raise ValueError("Bad register count")
+        return
+
+    def add(self, value):
+        """
+        Counts a value.
+
+        :param value:       The value
+        :return:
+        """
+
+        hashed = hash64(value)
+        index = hashed >> (64 - self._precision)
+        rest = (hashed << self._precision) & _MASK64
+        rank = min(64 - rest.bit_length(), 64 - self._precision) + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+        return
+
+    def merge(self, other):
+        """
+        Merges another estimator of the same precision in this one.
+
+        :param other:       The estimator
+        :return:
+        """
+
+        if other._precision != self._precision:
+            raise ValueError("Cannot merge different precisions")
+        self._registers = bytearray(
+            map(max, self._registers, other._registers)
+        )
+        return
+
+    def estimate(self):
+        """
+        Returns the estimated number of distinct values, the small
+        counts are estimated from the empty registers.
+
+        :return:
+        """
+
+        registers = self._registers
+        m = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(
+            math.ldexp(1.0, -rank) for rank in registers
+        )
+
+        zeros = registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(float(m) / zeros)
+        return int(round(estimate))
+
+    def reset(self):
+        """
+        Empties the registers.
+
+        :return:
+        """
+
+        self._registers = bytearray(len(self._registers))
+        return
+
+    def to_dict(self):
+        """
+        Serializes the estimator, the registers are compressed and
+        base64 encoded.
+
+        :return:
+        """
+        return {
+            'precision' : self._precision,
+            'registers' : base64.b64encode(
+                zlib.compress(bytes(self._registers))
+            ).decode('ascii'),
+            'estimate'  : self.estimate()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Deserializes an estimator.
+
+        :param data:        The serialized estimator
+        :return:
+        """
+        return cls(
+            int(data['precision']),
+            zlib.decompress(base64.b64decode(data['registers']))
+        )
+
+def merge_distinct(distincts):
+    """
+    Merges the serialized estimators of several reports, i.e. of
+    the capture processes of a probe, dimension by dimension.
+
+    :param distincts:       The serialized estimators by dimension
+    :return:
+    """
+
+    # Container
+    merged = {}
+
+    for distinct in distincts:
+        for dimension, data in distinct.items():
+            estimator = HyperLogLog.from_dict(data)
+            if dimension in merged:
+                merged[dimension].merge(estimator)
+            else:
+                merged[dimension] = estimator
+    return dict(
+        (dimension, estimator.to_dict())
+        for dimension, estimator in merged.items()
+    )
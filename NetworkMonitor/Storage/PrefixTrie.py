@@ -0,0 +1,226 @@
+"""
+
+    :PrefixTrie:
+    ==========
+
+    :
+    This is the known network store of the probes. The known
+    addresses and CIDR networks are kept as prefixes in a multibit
+    trie, one level per address byte, and an address is matched
+    against the longest prefix that holds it. A lookup walks at most
+    4 levels for IPv4 and 16 for IPv6 whatever the number or the
+    size of the networks, a /8 costs the same as a host.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import socket
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The bits of a trie level
+TRIE_STRIDE         = 8
+
+# The address bits by family
+TRIE_BITS           = {
+    socket.AF_INET  : 32,
+    socket.AF_INET6 : 128
+}
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+def parse_prefix(network):
+    """
+    Parses an address or a CIDR network.
+
+    :param network:         The address or network, i.e. 10.0.0.0/8
+    :return:                The family, the address bytes, the length
+    """
+
+    network = str(network).strip()
+    if '/' in network:
+        address, length = network.split('/', 1)
+    else:
+        address, length = network, None
+
+    family = socket.AF_INET6 if ':' in address else socket.AF_INET
+    packed = bytearray(socket.inet_pton(family, address))
+    bits = TRIE_BITS[family]
+    length = bits if length is None else int(length)
+    if not 0 <= length <= bits:
+        raise ValueError("Bad prefix length: %s" %network)
+    return family, packed, length
+
+class TrieNode(object):
+    """
+    This is a level of the trie. The prefixes that end inside the
+    level are expanded over the bytes they cover, the prefix that
+    ends on the level boundary covers the whole level.
+    """
+
+    __slots__       = ('children', 'expanded', 'covered')
+
+    def __init__(self):
+        """
+        This is the constructor for the class.
+
+        :return:
+        """
+
+        # The next levels by byte
+        self.children = {}
+
+        # The (length, value) of the prefixes ending in the level
+        self.expanded = {}
+
+        # The (length, value) of the prefix covering the level
+        self.covered = None
+        return
+
+class PrefixTrie(object):
+    """
+    This is the longest prefix match table of the IPv4 and IPv6
+    networks. Each prefix holds a value, the configured network
+    by default.
+    """
+
+    # The roots by family
+    _roots          = None
+
+    # The prefixes inserted
+    _prefixes       = None
+
+    def __init__(self, networks=None):
+        """
+        This is the constructor for the class.
+
+        :param networks:    The addresses or networks to insert
+        :return:
+        """
+
+        self._roots = {
+            socket.AF_INET  : TrieNode(),
+            socket.AF_INET6 : TrieNode()
+        }
+        self._prefixes = []
+        for network in networks or []:
+            self.insert(network)
+        return
+
+    def insert(self, network, value=None):
+        """
+        Inserts an address or a CIDR network. The bytes left of the
+        last level are expanded, a longer prefix is never replaced
+        by a shorter one.
+
+        :param network:     The address or network
+        :param value:       The value of the prefix, the network if None
+        :return:
+        """
+
+        family, packed, length = parse_prefix(network)
+        entry = (length, network if value is None else value)
+
+        # Walk the whole bytes of the prefix
+        node = self._roots[family]
+        depth, rest = divmod(length, TRIE_STRIDE)
+        for byte in packed[:depth]:
+            child = node.children.get(byte)
+            if child is None:
+                child = node.children[byte] = TrieNode()
+            node = child
+
+        if rest == 0:
+            if node.covered is None or node.covered[0] <= length:
+                node.covered = entry
+        else:
+            span = 1 << (TRIE_STRIDE - rest)
+            first = packed[depth] & ~(span - 1) & 0xff
+            for byte in range(first, first + span):
+                current = node.expanded.get(byte)
+                if current is None or current[0] <= length:
+                    node.expanded[byte] = entry
+
+        self._prefixes.append(network)
+        return
+
+    def lookup(self, address):
+        """
+        Returns the value of the longest prefix holding the address.
+
+        :param address:     The address
+        :return:            The value, None if no prefix holds it
+        """
+
+        family = socket.AF_INET6 if ':' in address else socket.AF_INET
+        try:
+            packed = bytearray(socket.inet_pton(family, address))
+        except (socket.error, ValueError, TypeError):
+            return None
+
+        best = None
+        node = self._roots[family]
+        for byte in packed:
+            if node.covered is not None:
+                best = node.covered
+            entry = node.expanded.get(byte)
+            if entry is not None:
+                best = entry
+            node = node.children.get(byte)
+            if node is None:
+                break
+        else:
+            if node.covered is not None:
+                best = node.covered
+
+        return None if best is None else best[1]
+
+    def get_prefixes(self):
+        """
+        Returns the prefixes inserted.
+
+        :return:
+        """
+        return list(self._prefixes)
+
+    def __contains__(self, address):
+        """
+        Returns true if a prefix holds the address.
+
+        :param address:     The address
+        :return:
+        """
+        return self.lookup(address) is not None
+
+    def __len__(self):
+        """
+        Returns the number of prefixes inserted.
+
+        :return:
+        """
+        return len(self._prefixes)
@@ -24,10 +24,27 @@ Imports
 =============================================
 """
 
+import marshal
+import mmap
+import os
+import struct
+import sys
+import threading
+
 from tinydb import \
     TinyDB, Query
+from tinydb.database import \
+    Table
 from tinydb.storages import \
     MemoryStorage
+from NetworkMonitor.Storage.Conversations import \
+    ConversationTable
+from NetworkMonitor.Storage.RecordTable import \
+    RecordTable
+from NetworkMonitor.Storage.ColumnTable import \
+    ColumnTable
+from NetworkMonitor.Storage.StripedTable import \
+    StripedTable, StripedConversations
 
 """
 =============================================
@@ -40,12 +57,249 @@ __author__  =   "gammaRay"
 __version__ =   "1.0"
 __date__    =   "9/28/2015"
 
+# The stores of the bounded tables [record/column]
+DB_STORES           = {
+    'record'        : RecordTable,
+    'column'        : ColumnTable
+}
+
+# The checkpoint header: magic, Python major and minor, format. The
+# payload is marshalled, it is only read back by the same Python.
+DB_MAGIC            = b'PRDB'
+DB_FORMAT           = 2
+DB_HEADER           = struct.Struct('!4sBBH')
+DB_MARSHAL          = 2
+
 """
 =============================================
 Source
 =============================================
 """
 
+class IndexedTable(Table):
+    """
+    This is a table with hash indexes on declared fields. An index
+    maps each value of its field to the ids of the elements holding
+    it, thus a membership check is one dict lookup whatever the
+    size of the table.
+
+    extends: Table
+    """
+
+    # The indexes: field -- value -- element ids
+    _indexes        = None
+
+    # The changes made to the table
+    _version        = 0
+
+    # The lock of the changes and the scans
+    _lock           = None
+
+    def __init__(self, storage, **options):
+        """
+        This is the constructor for the class.
+
+        :param storage:     The storage proxy of the table
+        :return:
+        """
+
+        Table.__init__(
+            self,
+            storage,
+            **options
+        )
+        self._indexes = {}
+        self._version = 0
+        self._lock = threading.RLock()
+        return
+
+    def create_index(self, field):
+        """
+        Declares a hash index on a field, the elements already in
+        the table are indexed.
+
+        :param field:       The field to index
+        :return:
+        """
+
+        with self._lock:
+            self._indexes[field] = {}
+            for element in self.all():
+                self.__index_element(element.eid, element, [field])
+        return
+
+    def get_indexes(self):
+        """
+        Returns the indexed fields.
+
+        :return:
+        """
+        return list(self._indexes.keys())
+
+    def has(self, field, value):
+        """
+        Returns true if an element holds the value in the field.
+        The index is used if the field is indexed, else the table
+        is scanned.
+
+        :param field:       The field
+        :param value:       The value looked for
+        :return:
+        """
+
+        with self._lock:
+            index = self._indexes.get(field)
+            if index is None:
+                return any(
+                    element.get(field) == value
+                    for element in self.all()
+                )
+            try:
+                return value in index
+            except TypeError:
+                return False
+
+    def all(self):
+        """
+        Returns the elements.
+
+        :return:
+        """
+
+        with self._lock:
+            return Table.all(self)
+
+    def get_watermark(self):
+        """
+        Returns the changes made to the table so far.
+
+        :return:
+        """
+        return self._version
+
+    def since(self, watermark):
+        """
+        Returns the elements if the table changed since the
+        watermark. The tables are the configured entries and rarely
+        change, they are not tracked per element.
+
+        :param watermark:   The watermark of the previous call
+        :return:
+        """
+        return self.all() if self._version > watermark else []
+
+    def insert(self, element):
+        """
+        Inserts an element and indexes it.
+
+        :param element:     The element to insert
+        :return:            The element id
+        """
+
+        with self._lock:
+            eid = Table.insert(self, element)
+            self.__index_element(eid, element, self._indexes.keys())
+            self._version += 1
+        return eid
+
+    def insert_multiple(self, elements):
+        """
+        Inserts elements and indexes them.
+
+        :param elements:    The elements to insert
+        :return:            The element ids
+        """
+
+        elements = list(elements)
+        with self._lock:
+            eids = Table.insert_multiple(self, elements)
+            for eid, element in zip(eids, elements):
+                self.__index_element(eid, element, self._indexes.keys())
+            self._version += 1
+        return eids
+
+    def remove(self, cond=None, eids=None):
+        """
+        Removes the matching elements, the indexes are rebuilt.
+
+        :param cond:        The condition to check against
+        :param eids:        The element ids
+        :return:            The removed element ids
+        """
+
+        with self._lock:
+            removed = Table.remove(self, cond, eids)
+            self.__rebuild()
+            self._version += 1
+        return removed
+
+    def update(self, fields, cond=None, eids=None):
+        """
+        Updates the matching elements, the indexes are rebuilt.
+
+        :param fields:      The fields or the update function
+        :param cond:        The condition to check against
+        :param eids:        The element ids
+        :return:            The updated element ids
+        """
+
+        with self._lock:
+            updated = Table.update(self, fields, cond, eids)
+            self.__rebuild()
+            self._version += 1
+        return updated
+
+    def purge(self):
+        """
+        Removes every element, the indexes are emptied.
+
+        :return:
+        """
+
+        with self._lock:
+            Table.purge(self)
+            for field in self._indexes.keys():
+                self._indexes[field] = {}
+            self._version += 1
+        return
+
+    def __index_element(self, eid, element, fields):
+        """
+        Adds an element to the indexes of the fields, the values
+        that cannot be hashed are not indexed.
+
+        :param eid:         The element id
+        :param element:     The element
+        :param fields:      The indexed fields
+        :return:
+        """
+
+        for field in fields:
+            if field not in element:
+                continue
+            try:
+                self._indexes[field].setdefault(
+                    element[field], set()
+                ).add(eid)
+            except TypeError:
+                continue
+        return
+
+    def __rebuild(self):
+        """
+        Rebuilds the indexes from the table.
+
+        :return:
+        """
+
+        for field in self._indexes.keys():
+            self._indexes[field] = {}
+        for element in self.all():
+            self.__index_element(
+                element.eid, element, self._indexes.keys()
+            )
+        return
+
 class ProbeDb(TinyDB):
     """
     This is the probe database engine that is contained in memory.
@@ -56,20 +310,54 @@ class ProbeDb(TinyDB):
     For instance the IpPlugin will use this probe database,
     as a caching mechanism for the IPs that are read and registered.
 
+    The tables hash index the fields declared at setup, the
+    probes check their known addresses and ports with them. The
+    tables given bounds at setup hold at most their capacity and
+    expire their records after their TTL, their records are kept
+    as dicts or in typed columns depending on the store.
+
+    The tables belong to the database, the bounded and aggregated
+    tables are split in lock stripes and the indexed tables take
+    a lock, thus the threads of a probe can share its database.
+
     extends: TinyDB
     """
 
+    # The table class, with hash indexes
+    table_class     = IndexedTable
+
     # Table Handles
-    __tables        = {}
+    __tables        = None
+
+    # The table class of the bounded tables
+    _store          = RecordTable
 
-    def __init__(self, name):
+    # The lock stripes of the bounded and aggregated tables
+    _stripes        = 1
+
+    # The watermarks of the last delta by table name
+    _watermarks     = None
+
+    def __init__(self, name, store=None, stripes=1):
         """
         This is the constructor for the class.
 
         :param name:     The probe name that needs this db.
+        :param store:    The store of the bounded tables [record/column]
+        :param stripes:  The lock stripes of the bounded tables
         :return:
         """
 
+        if store is not None:
+            if store not in DB_STORES:
+                raise ValueError("Unknown table store: %s" %store)
+            self._store = DB_STORES[store]
+        if int(stripes) < 1:
+            raise ValueError("Bad table stripes: %s" %stripes)
+        self._stripes = int(stripes)
+        self.__tables = {}
+        self._watermarks = {}
+
         # Override the base class
         TinyDB.__init__(
             self,
@@ -77,7 +365,7 @@ class ProbeDb(TinyDB):
         )
         return
 
-    def setup_db(self, data):
+    def setup_db(self, data, indexes=None, bounds=None):
         """
         Sets up the database with either no data
         or with passed data.
@@ -96,7 +384,22 @@ class ProbeDb(TinyDB):
                     "saved" : <saving>
                     }
 
+        The indexes map a table name to the fields it indexes.
+        i.e.
+            indexes = {
+                    "table 1" : ["address"]
+                    }
+
+        The bounds map a table name to its capacity and TTL, 0 for
+        no limit.
+        i.e.
+            bounds = {
+                    "table 1" : (10000, 600)
+                    }
+
         :param data:            The data needed to start the database
+        :param indexes:         The indexed fields by table name
+        :param bounds:          The (capacity, ttl) by table name
         :return:
         """
 
@@ -106,15 +409,52 @@ class ProbeDb(TinyDB):
 
         # Setup the tables and data
         for name in data:
-            table = self.table(
-                name
-            )
-            table.name = name
+            fields = [] if indexes is None else indexes.get(name, [])
+            if bounds is not None and name in bounds:
+                capacity, ttl = bounds[name]
+                table = StripedTable(
+                    name,
+                    [
+                        self._store(name, share, ttl)
+                        for share in self.__split(capacity)
+                    ],
+                    fields[0] if fields else None
+                )
+            else:
+                table = self.table(
+                    name
+                )
+                table.name = name
+
+            # Declare the indexes of the table
+            for field in fields:
+                table.create_index(field)
 
             # Add the table to the internal db
             self.__tables[name] = table
         return
 
+    def setup_aggregates(self, names, bounds):
+        """
+        Sets up aggregated tables, one row per conversation key
+        instead of one record per packet.
+
+        :param names:           The table names
+        :param bounds:          The (capacity, ttl) by table name
+        :return:
+        """
+
+        for name in names:
+            capacity, ttl = bounds[name]
+            self.__tables[name] = StripedConversations(
+                name,
+                [
+                    ConversationTable(name, ttl, share)
+                    for share in self.__split(capacity)
+                ]
+            )
+        return
+
     def get_table(self, name=None):
         """
         Returns a table of given name
@@ -145,4 +485,141 @@ class ProbeDb(TinyDB):
 
             # Add the data to a single dict
             results[table_name] = table_value.all()
-        return results
\ No newline at end of file
+        return results
+
+    def get_delta(self, full=False):
+        """
+        Gets the rows inserted or updated in each table since the
+        previous delta, the tables without changes are left out. A
+        full delta gets all the rows, like get_tables, and the next
+        delta starts from it. The rows removed on capacity or age
+        are not part of a delta, the table counters hold them.
+
+        :param full:            True for all the rows
+        :return:
+        """
+
+        # Results
+        results = {}
+
+        for name, table in self.__tables.items():
+            watermark = table.get_watermark()
+            if full or name not in self._watermarks:
+                results[name] = table.all()
+            elif watermark != self._watermarks[name]:
+                rows = table.since(self._watermarks[name])
+                if rows:
+                    results[name] = rows
+            self._watermarks[name] = watermark
+        return results
+
+    def get_statistics(self):
+        """
+        Gets the counters of the bounded tables.
+
+        :return:
+        """
+
+        # Results
+        results = {}
+
+        for name, table in self.__tables.items():
+            if hasattr(table, 'get_statistics'):
+                results[name] = table.get_statistics()
+        return results
+
+    def save(self, path):
+        """
+        Checkpoints the tables that learn from the traffic to a
+        binary file. The known tables are built from the configs
+        and are left out. The file is written aside and renamed,
+        a failed checkpoint leaves the previous one.
+
+        :param path:            The checkpoint file
+        :return:                The names of the tables saved
+        """
+
+        # Container
+        tables = {}
+
+        for name, table in self.__tables.items():
+            if hasattr(table, 'get_state'):
+                tables[name] = (
+                    table.get_kind(),
+                    table.get_state()
+                )
+
+        payload = marshal.dumps(tables, DB_MARSHAL)
+        temp = path + '.tmp'
+        with open(temp, 'wb') as handle:
+            handle.write(
+                DB_HEADER.pack(
+                    DB_MAGIC,
+                    sys.version_info[0],
+                    sys.version_info[1],
+                    DB_FORMAT
+                )
+            )
+            handle.write(payload)
+        os.rename(temp, path)
+        return sorted(tables.keys())
+
+    def load(self, path):
+        """
+        Restores the tables of a checkpoint. The file is memory
+        mapped and read in place, only the tables set up with the
+        same name, store and stripes are restored.
+
+        :param path:            The checkpoint file
+        :return:                The names of the tables restored
+        """
+
+        # Results
+        restored = []
+
+        with open(path, 'rb') as handle:
+            mapped = mmap.mmap(
+                handle.fileno(),
+                0,
+                access = mmap.ACCESS_READ
+            )
+        try:
+            if len(mapped) < DB_HEADER.size:
+                raise ValueError("Truncated checkpoint: %s" %path)
+            magic, major, minor, version = DB_HEADER.unpack_from(mapped)
+            if magic != DB_MAGIC or version != DB_FORMAT or \
+                    (major, minor) != tuple(sys.version_info[:2]):
+                raise ValueError("Incompatible checkpoint: %s" %path)
+            view = memoryview(mapped)[DB_HEADER.size:]
+            try:
+                tables = marshal.loads(view)
+            finally:
+                view.release()
+        finally:
+            mapped.close()
+
+        for name, (kind, state) in tables.items():
+            table = self.__tables.get(name)
+            if table is None or not hasattr(table, 'get_kind') or \
+                    table.get_kind() != kind:
+                continue
+            table.set_state(state)
+            restored.append(name)
+        return sorted(restored)
+
+    def __split(self, capacity):
+        """
+        Splits the capacity of a table between its stripes, 0 for
+        no limit.
+
+        :param capacity:        The capacity of the table
+        :return:                The capacities of the stripes
+        """
+
+        if not capacity:
+            return [0] * self._stripes
+        share, extra = divmod(capacity, self._stripes)
+        return [
+            max(share + (1 if index < extra else 0), 1)
+            for index in range(self._stripes)
+        ]
@@ -0,0 +1,352 @@
+"""
+
+    :RecordTable:
+    ==========
+
+    :
+    This is the bounded record table of the probes. The records are
+    kept in insertion order, the table holds at most its capacity
+    and the records older than its TTL are expired. Both the
+    eviction and the expiry take the oldest records first, in O(1)
+    per record, thus a busy segment cannot grow the table without
+    bound and the pressure is visible in the eviction counters.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import time
+
+from collections import OrderedDict
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+class RecordTable(object):
+    """
+    This is an oldest first bounded table. It answers the calls the
+    probes make on a table: insert, all, has and purge. The indexed
+    fields are kept up to date as the records leave.
+    """
+
+    # The table name
+    name            = None
+
+    # The records by id, oldest first
+    _records        = None
+
+    # The last record id
+    _last_id        = 0
+
+    # The most records held, 0 for no limit
+    _capacity       = 0
+
+    # The age before a record expires (seconds), 0 for no limit
+    _ttl            = 0
+
+    # The indexes: field -- value -- record ids
+    _indexes        = None
+
+    # The records removed on a full table and on age
+    _evicted        = 0
+    _expired        = 0
+
+    def __init__(self, name, capacity=0, ttl=0):
+        """
+        This is the constructor for the class.
+
+        :param name:        The table name
+        :param capacity:    The most records held, 0 for no limit
+        :param ttl:         The age before a record expires
+        :return:
+        """
+
+        self.name = name
+        self._records = OrderedDict()
+        self._last_id = 0
+        self._capacity = capacity
+        self._ttl = ttl
+        self._indexes = {}
+        self._evicted = 0
+        self._expired = 0
+        return
+
+    def create_index(self, field):
+        """
+        Declares a hash index on a field.
+
+        :param field:       The field to index
+        :return:
+        """
+
+        self._indexes[field] = {}
+        for eid, record in self._records.items():
+            self.__index_record(eid, record, [field])
+        return
+
+    def has(self, field, value):
+        """
+        Returns true if a record holds the value in the field.
+
+        :param field:       The field
+        :param value:       The value looked for
+        :return:
+        """
+
+        index = self._indexes.get(field)
+        if index is None:
+            return any(
+                record.get(field) == value
+                for record in self._records.values()
+            )
+        try:
+            return value in index
+        except TypeError:
+            return False
+
+    def insert(self, record):
+        """
+        Inserts a record. The expired records are removed, then the
+        oldest one if the table is full.
+
+        :param record:      The record, a dict
+        :return:            The record id
+        """
+
+        if not isinstance(record, dict):
+            raise ValueError('Record is not a dictionary')
+
+        self.__expire(record.get('time'))
+        if self._capacity and len(self._records) >= self._capacity:
+            self.__remove_oldest()
+            self._evicted += 1
+
+        self._last_id += 1
+        self._records[self._last_id] = record
+        self.__index_record(self._last_id, record, self._indexes.keys())
+        return self._last_id
+
+    def insert_multiple(self, records):
+        """
+        Inserts records.
+
+        :param records:     The records
+        :return:            The record ids
+        """
+        return [self.insert(record) for record in records]
+
+    def search(self, cond):
+        """
+        Returns the records matching a condition.
+
+        :param cond:        The condition, i.e. a Query
+        :return:
+        """
+        return [
+            record for record in self._records.values()
+            if cond(record)
+        ]
+
+    def all(self):
+        """
+        Returns the records, oldest first.
+
+        :return:
+        """
+        return list(self._records.values())
+
+    def get_watermark(self):
+        """
+        Returns the id of the last record.
+
+        :return:
+        """
+        return self._last_id
+
+    def since(self, watermark):
+        """
+        Returns the records inserted since the watermark, oldest
+        first. They are the newest ones, only they are read.
+
+        :param watermark:   The watermark of the previous call
+        :return:
+        """
+
+        # Results
+        records = []
+
+        for eid in reversed(self._records):
+            if eid <= watermark:
+                break
+            records.append(self._records[eid])
+        records.reverse()
+        return records
+
+    def purge(self):
+        """
+        Removes every record.
+
+        :return:
+        """
+
+        self._records.clear()
+        for field in self._indexes.keys():
+            self._indexes[field] = {}
+        return
+
+    def get_state(self):
+        """
+        Returns the records and the counters, the checkpoint of the
+        table.
+
+        :return:
+        """
+        return {
+            'records'   : list(self._records.values()),
+            'last_id'   : self._last_id,
+            'evicted'   : self._evicted,
+            'expired'   : self._expired
+        }
+
+    def set_state(self, state):
+        """
+        Restores the records and the counters of a checkpoint. The
+        capacity is the current one, the oldest records past it are
+        left out.
+
+        :param state:       The checkpoint of the table
+        :return:
+        """
+
+        records = state['records']
+        if self._capacity:
+            records = records[-self._capacity:]
+
+        # The records kept are the newest ones
+        last_id = state['last_id']
+        self._records = OrderedDict(
+            zip(range(last_id - len(records) + 1, last_id + 1), records)
+        )
+        self._last_id = last_id
+        self._evicted = state['evicted']
+        self._expired = state['expired']
+
+        for field in self._indexes.keys():
+            self._indexes[field] = {}
+        for eid, record in self._records.items():
+            self.__index_record(eid, record, self._indexes.keys())
+        return
+
+    def get_statistics(self):
+        """
+        Returns the table counters.
+
+        :return:
+        """
+        return {
+            'rows'      : len(self._records),
+            'capacity'  : self._capacity,
+            'ttl'       : self._ttl,
+            'evicted'   : self._evicted,
+            'expired'   : self._expired
+        }
+
+    def __len__(self):
+        """
+        Returns the number of records.
+
+        :return:
+        """
+        return len(self._records)
+
+    def __expire(self, now):
+        """
+        Removes the records older than the TTL, the oldest ones
+        are at the front.
+
+        :param now:         The capture time of the new record
+        :return:
+        """
+
+        if not self._ttl:
+            return
+        if not isinstance(now, (int, float)):
+            now = time.time()
+
+        limit = now - self._ttl
+        records = self._records
+        while records:
+            eid = next(iter(records))
+            stamp = records[eid].get('time')
+            if not isinstance(stamp, (int, float)) or stamp >= limit:
+                break
+            self.__remove_oldest()
+            self._expired += 1
+        return
+
+    def __remove_oldest(self):
+        """
+        Removes the oldest record and its index entries.
+
+        :return:
+        """
+
+        eid, record = self._records.popitem(last=False)
+        for field, index in self._indexes.items():
+            try:
+                eids = index.get(record.get(field))
+            except TypeError:
+                continue
+            if eids is None:
+                continue
+            eids.discard(eid)
+            if not eids:
+                del index[record[field]]
+        return
+
+    def __index_record(self, eid, record, fields):
+        """
+        Adds a record to the indexes of the fields, the values that
+        cannot be hashed are not indexed.
+
+        :param eid:         The record id
+        :param record:      The record
+        :param fields:      The indexed fields
+        :return:
+        """
+
+        for field in fields:
+            if field not in record:
+                continue
+            try:
+                self._indexes[field].setdefault(
+                    record[field], set()
+                ).add(eid)
+            except TypeError:
+                continue
+        return
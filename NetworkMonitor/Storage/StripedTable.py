@@ -0,0 +1,407 @@
+"""
+
+    :StripedTable:
+    ==========
+
+    :
+    This is the lock striped table of the probes. A table is split
+    in stripes, each one a bounded table of the store with its own
+    lock, and a row goes to the stripe of the hash of its key. Two
+    threads only wait for each other when they touch the same
+    stripe, thus the correlators, the reports and the checkpoints
+    of a probe can use its tables at the same time. The capacity
+    of the table is shared between its stripes, each stripe
+    evicts and expires its own rows.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import itertools
+import threading
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The counters of the stripes added up in the table counters
+STRIPE_COUNTERS     = ('rows', 'capacity', 'evicted', 'expired', 'bytes')
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+class StripedTable(object):
+    """
+    This is a record table split in stripes. The records are spread
+    on the stripes by the hash of a field, or in turn without one,
+    a lookup on that field takes one lock and the other calls take
+    the locks of the stripes one after the other. The records are
+    read stripe by stripe, oldest first in each stripe.
+    """
+
+    # The table name
+    name            = None
+
+    # The tables of the stripes and their locks
+    _stripes        = None
+    _locks          = None
+
+    # The field that picks the stripe of a record, None to go in turn
+    _field          = None
+
+    # The next stripe of the records without a field
+    _turn           = None
+
+    # The lock waits of each stripe
+    _contended      = None
+
+    def __init__(self, name, stripes, field=None):
+        """
+        This is the constructor for the class.
+
+        :param name:        The table name
+        :param stripes:     The tables of the stripes
+        :param field:       The field that picks the stripe
+        :return:
+        """
+
+        if not stripes:
+            raise ValueError("A striped table needs a stripe")
+
+        self.name = name
+        self._stripes = list(stripes)
+        self._locks = [threading.Lock() for _ in self._stripes]
+        self._field = field
+        self._turn = itertools.count()
+        self._contended = [0] * len(self._stripes)
+        return
+
+    def get_kind(self):
+        """
+        Returns the store and the number of stripes, a checkpoint is
+        only restored in a table of the same kind.
+
+        :return:
+        """
+        return "%s/%d" %(
+            self._stripes[0].__class__.__name__,
+            len(self._stripes)
+        )
+
+    def create_index(self, field):
+        """
+        Declares a hash index on a field in every stripe.
+
+        :param field:       The field to index
+        :return:
+        """
+
+        for index in range(len(self._stripes)):
+            self._call(index, 'create_index', field)
+        return
+
+    def has(self, field, value):
+        """
+        Returns true if a record holds the value in the field. Only
+        the stripe of the value is looked at for the stripe field.
+
+        :param field:       The field
+        :param value:       The value looked for
+        :return:
+        """
+
+        if field == self._field:
+            return self._call(self._route(value), 'has', field, value)
+        return any(
+            self._call(index, 'has', field, value)
+            for index in range(len(self._stripes))
+        )
+
+    def insert(self, record):
+        """
+        Inserts a record in its stripe.
+
+        :param record:      The record, a dict
+        :return:            The record id in the stripe
+        """
+
+        if not isinstance(record, dict):
+            raise ValueError('Record is not a dictionary')
+
+        if self._field is None:
+            index = next(self._turn) % len(self._stripes)
+        else:
+            index = self._route(record.get(self._field))
+        return self._call(index, 'insert', record)
+
+    def insert_multiple(self, records):
+        """
+        Inserts records.
+
+        :param records:     The records
+        :return:            The record ids
+        """
+        return [self.insert(record) for record in records]
+
+    def search(self, cond):
+        """
+        Returns the records matching a condition.
+
+        :param cond:        The condition, i.e. a Query
+        :return:
+        """
+        return self.__gather('search', cond)
+
+    def all(self):
+        """
+        Returns the records, stripe by stripe.
+
+        :return:
+        """
+        return self.__gather('all')
+
+    def get_watermark(self):
+        """
+        Returns the watermarks of the stripes.
+
+        :return:
+        """
+        return tuple(
+            self._call(index, 'get_watermark')
+            for index in range(len(self._stripes))
+        )
+
+    def since(self, watermark):
+        """
+        Returns the records changed in each stripe since its
+        watermark.
+
+        :param watermark:   The watermark of the previous call
+        :return:
+        """
+
+        # Results
+        records = []
+
+        for index in range(len(self._stripes)):
+            records.extend(
+                self._call(index, 'since', watermark[index])
+            )
+        return records
+
+    def purge(self):
+        """
+        Removes every record.
+
+        :return:
+        """
+
+        for index in range(len(self._stripes)):
+            self._call(index, 'purge')
+        return
+
+    def get_state(self):
+        """
+        Returns the checkpoints of the stripes.
+
+        :return:
+        """
+        return [
+            self._call(index, 'get_state')
+            for index in range(len(self._stripes))
+        ]
+
+    def set_state(self, state):
+        """
+        Restores the checkpoints of the stripes.
+
+        :param state:       The checkpoints of the stripes
+        :return:
+        """
+
+        if len(state) != len(self._stripes):
+            raise ValueError("Checkpoint of %d stripes" %len(state))
+        for index in range(len(self._stripes)):
+            self._call(index, 'set_state', state[index])
+        return
+
+    def get_statistics(self):
+        """
+        Returns the table counters, the counters of the stripes are
+        added up. The contended counter holds the calls that waited
+        for the lock of a stripe.
+
+        :return:
+        """
+
+        # Results
+        results = {}
+
+        for index in range(len(self._stripes)):
+            statistics = self._call(index, 'get_statistics')
+            for name in STRIPE_COUNTERS:
+                if name in statistics:
+                    results[name] = results.get(name, 0) + \
+                        statistics[name]
+            results['ttl'] = statistics['ttl']
+
+        results['stripes'] = len(self._stripes)
+        results['contended'] = sum(self._contended)
+        return results
+
+    def __len__(self):
+        """
+        Returns the number of records.
+
+        :return:
+        """
+        return sum(
+            self._call(index, '__len__')
+            for index in range(len(self._stripes))
+        )
+
+    def _route(self, key):
+        """
+        Returns the stripe of a key.
+
+        :param key:         The key
+        :return:
+        """
+
+        try:
+            return hash(key) % len(self._stripes)
+        except TypeError:
+            return 0
+
+    def _call(self, index, method, *args):
+        """
+        Calls a method of a stripe under its lock. A lock that is
+        held by another thread is counted before it is waited for.
+
+        :param index:       The stripe
+        :param method:      The method name
+        :param args:        The arguments
+        :return:            The result of the method
+        """
+
+        lock = self._locks[index]
+        if not lock.acquire(False):
+            lock.acquire()
+            self._contended[index] += 1
+        try:
+            return getattr(self._stripes[index], method)(*args)
+        finally:
+            lock.release()
+
+    def __gather(self, method, *args):
+        """
+        Returns the rows of a method, stripe by stripe.
+
+        :param method:      The method name
+        :param args:        The arguments
+        :return:
+        """
+
+        # Results
+        rows = []
+
+        for index in range(len(self._stripes)):
+            rows.extend(self._call(index, method, *args))
+        return rows
+
+class StripedConversations(StripedTable):
+    """
+    This is a conversation table split in stripes, a conversation
+    goes to the stripe of the hash of its key. The update or insert
+    of a conversation is one call under one lock, two threads never
+    both insert the same conversation.
+
+    extends: StripedTable
+    """
+
+    def update(self, key, time, length, packets=1, first=None):
+        """
+        Counts packets in the row of a conversation.
+
+        :param key:         The conversation key
+        :param time:        The capture time of the last packet
+        :param length:      The bytes of the packets
+        :param packets:     The number of packets
+        :param first:       The capture time of the first packet
+        :return:            False if the conversation is not known
+        """
+        return self._call(
+            self._route(key),
+            'update',
+            key, time, length, packets, first
+        )
+
+    def insert(self, key, row, time, length, packets=1, first=None):
+        """
+        Adds the row of a new conversation.
+
+        :param key:         The conversation key
+        :param row:         The fields of the conversation
+        :param time:        The capture time of the last packet
+        :param length:      The bytes of the packets
+        :param packets:     The number of packets
+        :param first:       The capture time of the first packet
+        :return:
+        """
+        return self._call(
+            self._route(key),
+            'insert',
+            key, row, time, length, packets, first
+        )
+
+    def add(self, key, build, time, length, packets=1, first=None):
+        """
+        Counts packets in the row of a conversation, the row is
+        built and inserted for a new conversation.
+
+        :param key:         The conversation key
+        :param build:       Returns the fields of a new row
+        :param time:        The capture time of the last packet
+        :param length:      The bytes of the packets
+        :param packets:     The number of packets
+        :param first:       The capture time of the first packet
+        :return:            True if the conversation was known
+        """
+        return self._call(
+            self._route(key),
+            'add',
+            key, build, time, length, packets, first
+        )
+
+    def expire(self, now):
+        """
+        Removes the rows idle for more than the TTL in every stripe.
+
+        :param now:         The current capture time
+        :return:            The number of rows removed
+        """
+        return sum(
+            self._call(index, 'expire', now)
+            for index in range(len(self._stripes))
+        )
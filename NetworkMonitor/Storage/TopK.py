@@ -0,0 +1,220 @@
+"""
+
+    :TopK:
+    ==========
+
+    :
+    This is the heavy hitter sketch of the probes. The Space-Saving
+    algorithm keeps a fixed number of counters, a key that is not
+    counted yet takes over the smallest counter and inherits its
+    count as its error. The keys with the largest counts are thus
+    found in one pass with a memory that does not depend on the
+    number of keys seen, the count of a key is over estimated by at
+    most its error.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import heapq
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+# The stale heap entries allowed per counter before a rebuild
+TOPK_HEAP_SLACK     = 4
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+class SpaceSaving(object):
+    """
+    This is a weighted Space-Saving sketch. The counters are kept in
+    a dict and their smallest one is found with a min heap, the heap
+    entries of the counters that moved since are skipped and the
+    heap is rebuilt once it holds too many of them.
+    """
+
+    # The most counters kept
+    _capacity       = 0
+
+    # The counts and errors by key
+    _counts         = None
+    _errors         = None
+
+    # The (count, key) min heap, with stale entries
+    _heap           = None
+
+    # The total weight counted
+    _total          = 0
+
+    def __init__(self, capacity):
+        """
+        This is the constructor for the class.
+
+        :param capacity:    The most counters kept
+        :return:
+        """
+
+        self._capacity = max(int(capacity), 1)
+        self.reset()
+        return
+
+    def update(self, key, weight=1):
+        """
+        Counts a weight for a key.
+
+        :param key:         The key
+        :param weight:      The weight
+        :return:
+        """
+
+        counts = self._counts
+        self._total += weight
+
+        count = counts.get(key)
+        if count is not None:
+            count += weight
+        elif len(counts) < self._capacity:
+            count = weight
+            self._errors[key] = 0
+        else:
+
+            # Take over the smallest counter
+            smallest, evicted = self.__pop_smallest()
+            del counts[evicted]
+            del self._errors[evicted]
+            count = smallest + weight
+            self._errors[key] = smallest
+
+        counts[key] = count
+        heapq.heappush(self._heap, (count, key))
+        if len(self._heap) > TOPK_HEAP_SLACK * self._capacity:
+            self.__rebuild()
+        return
+
+    def top(self, k):
+        """
+        Returns the k keys with the largest counts.
+
+        :param k:           The number of keys
+        :return:            The (key, count, error), largest first
+        """
+        return [
+            (key, count, self._errors[key])
+            for key, count in heapq.nlargest(
+                k,
+                self._counts.items(),
+                key = lambda item: item[1]
+            )
+        ]
+
+    def reset(self):
+        """
+        Empties the counters.
+
+        :return:
+        """
+
+        self._counts = {}
+        self._errors = {}
+        self._heap = []
+        self._total = 0
+        return
+
+    def get_total(self):
+        """
+        Returns the total weight counted.
+
+        :return:
+        """
+        return self._total
+
+    def __len__(self):
+        """
+        Returns the number of counters used.
+
+        :return:
+        """
+        return len(self._counts)
+
+    def __pop_smallest(self):
+        """
+        Pops the smallest counter, the stale heap entries are
+        dropped on the way.
+
+        :return:            The count and the key
+        """
+
+        heap = self._heap
+        counts = self._counts
+        while True:
+            count, key = heapq.heappop(heap)
+            if counts.get(key) == count:
+                return count, key
+
+    def __rebuild(self):
+        """
+        Rebuilds the heap from the counters.
+
+        :return:
+        """
+
+        self._heap = [(count, key) for key, count in self._counts.items()]
+        heapq.heapify(self._heap)
+        return
+
+def merge_top(tops, k, field):
+    """
+    Merges the top lists of several sketches, i.e. of the capture
+    processes of a probe. The counts of a key are added, a key only
+    in some of the lists is under counted.
+
+    :param tops:            The top lists, of dicts
+    :param k:               The number of keys kept
+    :param field:           The count field of the dicts
+    :return:
+    """
+
+    # Container
+    merged = {}
+
+    for top in tops:
+        for row in top:
+            key = tuple(
+                (name, value) for name, value in sorted(row.items())
+                if name not in (field, 'error')
+            )
+            current = merged.get(key)
+            if current is None:
+                merged[key] = dict(row)
+            else:
+                current[field] += row[field]
+                current['error'] += row['error']
+    return heapq.nlargest(
+        k,
+        merged.values(),
+        key = lambda row: row[field]
+    )
@@ -0,0 +1,18 @@
+"""
+
+    :Tests:
+    ==========
+
+    :
+    This is the unit tests of the network monitor.
+
+        python -m pytest NetworkMonitor/Tests
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
@@ -0,0 +1,70 @@
+"""
+
+    :test_shards:
+    ==========
+
+    :
+    This tests the capture process pools of the sharded probes.
+    :
+
+    :copyright: (c) 10/18/2026 by gammaRay.
+    :license: BSD, see LICENSE for more details.
+
+    Author:         gammaRay
+    Version:        :1.0:
+    Date:           10/18/2026
+"""
+
+"""
+=============================================
+Imports
+=============================================
+"""
+
+import unittest
+
+from NetworkMonitor.Probe.Capture.Shards import \
+    ShardPool
+
+"""
+=============================================
+Constants
+=============================================
+"""
+
+# Program Attributes
+__author__  =   "gammaRay"
+__version__ =   "1.0"
+__date__    =   "10/18/2026"
+
+"""
+=============================================
+Source
+=============================================
+"""
+
+class ShardPoolTest(unittest.TestCase):
+    """
+    Tests the fanout groups of the pools.
+    """
+
+    def test_groups(self):
+        """
+        Two pools of the process never share a fanout group, even
+        when their probes shard the same interface.
+
+        :return:
+        """
+
+        pools = [
+            ShardPool(object, {'name' : 'probe', 'iface' : 'eth0'}, 2)
+            for _ in range(2)
+        ]
+        groups = [pool._group for pool in pools]
+        self.assertNotEqual(groups[0], groups[1])
+        for group in groups:
+            self.assertTrue(0 <= group <= 0xffff)
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -51,7 +51,127 @@ LOG_FILE_DIR            = '/var/log/NetworkMonitor/'
 LOG_FILE_NAME           = '/var/log/NetworkMonitor/mon-%s.log'
 
 DEFAULT_SIZE            = 1024
-PACKET_REPORT_MAX       = 200
+
+# The report rounds of the passive network probes, every probe that
+# correlated frames reports every interval (seconds) or once the
+# number of frames has been dispatched, whichever comes first
+REPORT_INTERVAL         = 5
+REPORT_RECORDS          = 10000
+
+# The rows of the reports [full/delta]. The full mode reports all the
+# rows of the tables, the delta mode the rows inserted or updated since
+# the previous report with a full snapshot every REPORT_SNAPSHOT reports
+# (0 for the first report only).
+REPORT_MODE             = 'full'
+REPORT_SNAPSHOT         = 12
+
+# The top talkers of the IP, TCP and UDP probes, the TOP_K source
+# addresses with the most bytes and the most packets of each report
+# interval (0 to not rank them). They are counted in Space-Saving
+# sketches of TOP_COUNTERS counters, the memory is fixed whatever the
+# number of hosts on the segment.
+TOP_K                   = 10
+TOP_COUNTERS            = 1000
+
+# The distinct source and destination addresses, MAC addresses and
+# destination ports of each report interval. They are estimated with
+# HyperLogLog registers, 2^DISTINCT_PRECISION bytes per dimension
+# (4 to 16, 0 to not count them), and the reports carry the registers
+# so that the estimators of several probes or nodes can be merged.
+DISTINCT_PRECISION      = 12
+
+# The device registry shared by the MAC, ARP, IP, TCP and UDP probes of
+# a node, keyed by MAC address. A device holds its last REGISTRY_BINDINGS
+# IP addresses, the last REGISTRY_PORTS ports it was reached on and its
+# first and last seen times. The registry holds at most REGISTRY_CAPACITY
+# devices (0 for no limit) and evicts the least recently seen one.
+REGISTRY_CAPACITY       = 100000
+REGISTRY_BINDINGS       = 16
+REGISTRY_PORTS          = 64
+
+# The scope of the known MAC addresses of the MAC and ARP probes in the
+# device registry [probe/node]. The known MACs of a probe scoped probe
+# are only known to it, those of a node scoped probe are known to every
+# probe of the node.
+KNOWN_SCOPE             = 'probe'
+
+# The access list of the TCP and UDP monitoring probes. The rules of the
+# app configs, or the known ips and ports, are compiled in a prefix trie
+# and port interval bitmaps, the endpoints no rule matches get the
+# ACL_DEFAULT action and the last ACL_CACHE verdicts are cached.
+ACL_DEFAULT             = 'deny'
+ACL_CACHE               = 65536
+
+# The tables of the observing probes [aggregate/record]. The aggregate
+# mode keeps one row per conversation with its first seen, last seen,
+# packets and bytes, a row expires after TTL seconds without a packet.
+# The record mode inserts the records of every packet.
+OBSERVE_MODE            = 'aggregate'
+
+# The most rows of each table that grows with the traffic, the unknown
+# and the observed tables, 0 for no limit. A full table evicts its
+# oldest record, or its least recently seen conversation, and the
+# records older than TTL seconds are expired. The app configs of a
+# probe can set capacity and ttl for all its tables or per table.
+TABLE_CAPACITY          = 100000
+
+# The store of the bounded tables [record/column]. The record store
+# keeps each record as a dict, the column store packs the records in
+# typed arrays: IPv4 and MAC addresses, ports and capture times as
+# integers and the other values interned, a few bytes per field.
+TABLE_STORE             = 'record'
+
+# The lock stripes of the tables that grow with the traffic. A table is
+# split in stripes of its store, each one with its own lock and a share
+# of the capacity, and a row goes to the stripe of the hash of its key.
+# The threads of a probe only wait for each other on the same stripe.
+TABLE_STRIPES           = 1
+
+# The checkpoints of the tables that learn from the traffic, a probe
+# given a checkpoint file saves them every CHECKPOINT_INTERVAL seconds
+# and when it is killed, and restores them when it is set up.
+CHECKPOINT_INTERVAL     = 60
+
+# The default packet decoder of the passive network probes [scapy/raw]
+CAPTURE_DECODE          = 'scapy'
+
+# The batch mode of the passive network probes, the number of
+# frames in a batch (0 to not batch) and the max age of a batch (ms)
+CAPTURE_BATCH           = 0
+CAPTURE_BATCH_INTERVAL  = 10
+
+# The capture backend of the passive network probes [socket/mmap]
+# and the geometry of the TPACKET_V3 ring of the mmap backend.
+# The block retire timeout is in ms.
+CAPTURE_BACKEND         = 'socket'
+CAPTURE_RING_BLOCK_SIZE = 1 << 20
+CAPTURE_RING_BLOCKS     = 64
+CAPTURE_RING_FRAME_SIZE = 2048
+CAPTURE_RING_TIMEOUT    = 60
+
+# The replay mode of the probes pointed at a pcap file [fast/timed]
+CAPTURE_REPLAY          = 'fast'
+
+# The number of capture processes of the passive network probes,
+# more than one shares the iface through a PACKET_FANOUT group
+CAPTURE_WORKERS         = 1
+
+# Publishes the report of each capture process next to the merged
+# reports, tagged with its shard index
+SHARD_REPORTS           = False
+
+# The packet sampling of the passive network probes, one frame in
+# N is dispatched [fixed/adaptive]. The adaptive mode raises N when
+# the probes use more than the budget (busy fraction) of the capture
+# thread or the kernel drops frames, and lowers it when the load drops.
+CAPTURE_SAMPLE          = 1
+CAPTURE_SAMPLE_MODE     = 'fixed'
+CAPTURE_SAMPLE_BUDGET   = 0.8
+
+# The slots of the bounded ring between the capture thread and the
+# correlation worker of each passive network probe, 0 to correlate
+# in the capture thread
+CAPTURE_QUEUE           = 0
 
 
 # Default location for plugins. This can be changed to suit the